@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Docker Toolbox Benchmarks
+Times and memory-profiles generate.py against synthetic catalogs
+"""
+
+import argparse
+import copy
+import gc
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Any, Callable
+
+import yaml
+
+import generate
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+# Time budgets in seconds per 100,000 tools, checked on every run (no baseline needed)
+# for catalogs of at least BUDGET_MIN_SIZE tools, where fixed costs no longer dominate
+BUDGETS = {
+    'validate': 1.0,
+}
+BUDGET_MIN_SIZE = 10000
+
+
+def synthetic_catalog(size: int, templates_file: Path) -> Dict[str, Any]:
+    """Build a catalog of `size` tools modelled on the real tools.yaml.
+
+    Tools are cloned from the real entries, keeping their mix of
+    ephemeral/daemon/server types, aliases, notes and examples. Category
+    runs are scaled up in place, so the catalog keeps the real file's
+    ordering (including categories that appear in more than one run).
+    The resources and services sections are copied too; service groups
+    and dependencies that point at tools trimmed away are dropped, so
+    the catalog validates cleanly.
+    """
+    data, _ = generate.load_catalog(templates_file)
+    templates = data['tools']
+
+    runs = []
+    for tool in templates:
+        if runs and runs[-1][0]['category'] == tool['category']:
+            runs[-1].append(tool)
+        else:
+            runs.append([tool])
+
+    tools = []
+    copies = -(-size // len(templates))
+    for run in runs:
+        for n in range(copies):
+            for template in run:
+                tools.append(_clone_tool(template, n))
+    # Trim evenly across runs rather than dropping whole categories
+    step = len(tools) / size
+    tools = [tools[int(i * step)] for i in range(size)]
+
+    names = {tool['name'] for tool in tools}
+    for tool in tools:
+        if 'depends_on' in tool:
+            tool['depends_on'] = [name for name in tool['depends_on'] if name in names]
+    catalog = {'version': data.get('version', '1.0'), 'categories': data['categories'], 'tools': tools}
+    if 'resources' in data:
+        catalog['resources'] = data['resources']
+    if 'services' in data:
+        services = copy.deepcopy(data['services'])
+        groups = services.get('groups') or {}
+        services['groups'] = {group: [name for name in members if name in names] for group, members in groups.items()}
+        catalog['services'] = services
+    return catalog
+
+
+def _clone_tool(template: Dict[str, Any], n: int) -> Dict[str, Any]:
+    """Copy a tool entry with a unique name and aliases for copy number n"""
+    tool = copy.deepcopy(template)
+    if n == 0:
+        return tool
+    suffix = str(n)
+    tool['name'] = f"{template['name']}-{suffix}"
+    renamed = {alias: f"{alias}{suffix}" for alias in template.get('aliases', [])}
+    if 'aliases' in tool:
+        tool['aliases'] = [renamed[alias] for alias in template['aliases']]
+    if 'alias_commands' in tool:
+        tool['alias_commands'] = {renamed.get(a, a): k for a, k in template['alias_commands'].items()}
+    if 'depends_on' in tool:
+        tool['depends_on'] = [f"{name}-{suffix}" for name in template['depends_on']]
+    for example in tool.get('examples', []):
+        words = example['command'].split(' ', 1)
+        words[0] = renamed.get(words[0], words[0])
+        example['command'] = ' '.join(words)
+    return tool
+
+
+def write_catalog(data: Dict[str, Any], path: Path):
+    """Write a catalog as YAML, in the same block style as tools.yaml"""
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f, sort_keys=False, allow_unicode=True, width=200)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Best-of-`repeat` wall and CPU time, plus tracemalloc peak from a separate run"""
+    wall = cpu = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        func()
+        wall = min(wall, time.perf_counter() - start_wall)
+        cpu = min(cpu, time.process_time() - start_cpu)
+
+    # Memory is traced in its own run: tracemalloc distorts timings
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': round(wall, 6), 'cpu_seconds': round(cpu, 6), 'peak_bytes': peak}
+
+
+def run_time(argv: List[str], repeat: int) -> Dict[str, float]:
+    """Best-of-`repeat` wall time of a subprocess"""
+    wall = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        wall = min(wall, time.perf_counter() - start)
+    return {'seconds': round(wall, 6)}
+
+
+def _heredoc(installer: str, opener: str) -> str:
+    """Body of the heredoc a generated Bash installer opens with `opener`"""
+    start = installer.index('\n', installer.index(opener)) + 1
+    return installer[start:installer.index('\nEOF\n', start - 1) + 1]
+
+
+def bench_shell(gen: generate.ToolboxGenerator, workdir: Path, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Time shell startup with the alias installer's config vs the dispatcher's.
+
+    Each run starts bash and sources just the lines the installer adds to
+    ~/.bashrc; dispatcher_lookup is one `dt` call for an unknown name (a
+    full scan of the lookup table, without running docker).
+    """
+    bash = shutil.which('bash')
+    if bash is None:
+        return {}
+    dispatcher = gen.generate_bash_dispatcher()
+    home = workdir / 'home'
+    (home / '.docker-toolbox').mkdir(parents=True, exist_ok=True)
+    for name in ('dt', 'commands.tsv'):
+        (home / '.docker-toolbox' / name).write_text(_heredoc(dispatcher, f'cat > "$DT_HOME/{name}"'), encoding='utf-8')
+
+    shell_config = 'cat >> "$SHELL_CONFIG"'
+    aliases_rc, dispatcher_rc = workdir / 'aliases.rc', workdir / 'dispatcher.rc'
+    aliases_rc.write_text(_heredoc(gen.generate_bash_installer(), shell_config), encoding='utf-8')
+    dispatcher_rc.write_text(_heredoc(dispatcher, shell_config).replace('$HOME', str(home)), encoding='utf-8')
+
+    source = [bash, '--noprofile', '--norc', '-c', '. "$0"']
+    return {
+        'shell_startup_aliases': run_time(source + [str(aliases_rc)], repeat),
+        'shell_startup_dispatcher': run_time(source + [str(dispatcher_rc)], repeat),
+        'dispatcher_lookup': run_time([bash, str(home / '.docker-toolbox' / 'dt'), '--no-such-tool--'], repeat),
+    }
+
+
+def bench_size(size: int, workdir: Path, templates_file: Path, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Run every benchmark against one synthetic catalog size"""
+    tools_file = workdir / f'tools-{size}.yaml'
+    write_catalog(synthetic_catalog(size, templates_file), tools_file)
+    snapshot_dir = workdir / f'cache-{size}'
+    data, lines = generate.load_catalog(tools_file, snapshot_dir)  # prime the snapshot
+    gen = generate.ToolboxGenerator(str(tools_file), data=data, lines=lines)
+    # Time the real work, not the error path: the synthetic catalog has to be valid
+    errors = gen.validate()
+    assert not errors, f"synthetic catalog of {size} tools does not validate: {errors[:5]}"
+
+    # Large catalogs are slow to parse; one timed pass is plenty
+    parse_repeat = 1 if size >= 10000 else repeat
+    benchmarks = [
+        ('load', lambda: generate.load_catalog(tools_file), parse_repeat),
+        ('load_snapshot', lambda: generate.load_catalog(tools_file, snapshot_dir), repeat),
+        ('validate', gen.validate, repeat),
+        ('conflicts', gen.conflicts, repeat),
+        ('generate_markdown', gen.generate_markdown, repeat),
+        ('generate_typst', gen.generate_typst, repeat),
+        ('generate_bash_installer', gen.generate_bash_installer, repeat),
+        ('generate_powershell_installer', gen.generate_powershell_installer, repeat),
+        ('generate_bash_dispatcher', gen.generate_bash_dispatcher, repeat),
+        ('generate_search_index', gen.generate_search_index, repeat),
+        ('generate_four_passes', lambda: [gen.generate_markdown(), gen.generate_typst(),
+                                          gen.generate_bash_installer(), gen.generate_powershell_installer()], repeat),
+        ('emit_one_pass', lambda: gen.emit(dict.fromkeys(('markdown', 'typst', 'bash', 'powershell'), lambda chunk: None)), repeat),
+    ]
+    search_file = workdir / f'search-{size}.tsv'
+    search_file.write_text(gen.generate_search_index(), encoding='utf-8')
+    index = generate.SearchIndex.load(search_file)
+    benchmarks += [
+        ('search_index_load', lambda: generate.SearchIndex.load(search_file), repeat),
+        ('search_query', lambda: index.search('pythn notebok'), repeat),
+    ]
+
+    results = {}
+    for name, func, runs in benchmarks:
+        results[name] = measure(func, runs)
+        print(f"  {name:<32} {results[name]['seconds'] * 1000:>10.2f} ms  {results[name]['peak_bytes'] / 1048576:>8.2f} MiB")
+    for name, result in bench_shell(gen, workdir / f'shell-{size}', repeat).items():
+        results[name] = result
+        print(f"  {name:<32} {result['seconds'] * 1000:>10.2f} ms")
+    return results
+
+
+def git_commit() -> str:
+    """Current commit hash, or '' outside a git checkout"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, timeout=5)
+        return result.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """List benchmarks that got slower (or hungrier) than baseline by more than threshold"""
+    regressions = []
+    for size, benchmarks in results['results'].items():
+        for name, current in benchmarks.items():
+            previous = baseline.get('results', {}).get(size, {}).get(name)
+            if not previous:
+                continue
+            for metric in ('seconds', 'peak_bytes'):
+                before, after = previous.get(metric), current.get(metric)
+                if before and after and after > before * (1 + threshold):
+                    regressions.append(f"{size} tools / {name}: {metric} {before:g} -> {after:g} (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def over_budget(results: Dict[str, Any]) -> List[str]:
+    """List benchmarks slower than their BUDGETS entry, scaled to the catalog size"""
+    overruns = []
+    for size, benchmarks in results['results'].items():
+        if int(size) < BUDGET_MIN_SIZE:
+            continue
+        for name, budget in BUDGETS.items():
+            seconds = benchmarks.get(name, {}).get('seconds')
+            limit = budget * int(size) / 100000
+            if seconds is not None and seconds > limit:
+                overruns.append(f"{size} tools / {name}: {seconds:.3f}s (budget {limit:.3f}s)")
+    return overruns
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark generate.py against synthetic catalogs')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Catalog sizes to benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (best is kept)')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', metavar='BASELINE', help='Compare against a previous results JSON')
+    parser.add_argument('--threshold', type=float, default=0.20, help='Allowed slowdown vs baseline (0.20 = 20%%)')
+
+    args = parser.parse_args()
+
+    templates_file = Path(__file__).parent / 'tools.yaml'
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'libyaml': hasattr(yaml, 'CSafeLoader'),
+            'repeat': args.repeat,
+        },
+        'results': {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix='dt-bench-') as tmp:
+        for size in args.sizes:
+            print(f"Benchmarking {size} tools...")
+            results['results'][str(size)] = bench_size(size, Path(tmp), templates_file, args.repeat)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+        print(f"\n[OK] Results written to {args.output}")
+
+    overruns = over_budget(results)
+    if overruns:
+        print("\nOver budget:")
+        for overrun in overruns:
+            print(f"  - {overrun}")
+        return 1
+
+    if args.compare:
+        baseline_file = Path(args.compare)
+        if not baseline_file.exists():
+            print(f"[INFO] No baseline at {baseline_file}; run 'just bench-baseline' to create one")
+            return 0
+        baseline = json.loads(baseline_file.read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.threshold)
+        commit = baseline.get('meta', {}).get('commit') or 'baseline'
+        if regressions:
+            print(f"\nRegressions vs {commit} (threshold {args.threshold:.0%}):")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"[OK] No regressions vs {commit} (threshold {args.threshold:.0%})")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+#!/usr/bin/env bash
+#
+# Docker Toolbox - Package Cache Volumes
+# Reports or prunes the package manager cache volumes (dt-cache-*) that
+# generated commands mount. Run by `dt-cache` (dt-manager.sh) and by
+# `dt cache` (dispatcher mode, installed as ~/.docker-toolbox/cache.sh).
+#
+# Usage: dt-cache.sh [prune [DAYS] | prune --all]
+#
+
+usage="Usage: ${DT_CACHE_COMMAND:-dt-cache} [prune [DAYS] | prune --all]"
+
+volumes=$(docker volume ls -q --filter name='^dt-cache-')
+if [ -z "$volumes" ]; then
+    echo "No package caches yet"
+    exit 0
+fi
+
+# One container mounts every cache volume, however many there are
+mounts=()
+for volume in $volumes; do mounts+=(-v "$volume:/cache/$volume"); done
+
+case "$1" in
+    '')
+        echo "Package caches:"
+        echo ""
+        docker run --rm "${mounts[@]}" alpine du -sh $(printf '/cache/%s ' $volumes) |
+            awk '{ sub("^/cache/", "", $2); printf "  %-20s %s\n", $2, $1 }'
+        ;;
+    prune)
+        if [ "$2" = "--all" ]; then
+            docker volume rm $volumes
+            exit
+        fi
+        days=${2:-30}
+        case "$days" in *[!0-9]*|'') echo "$usage" >&2; exit 2 ;; esac
+        docker run --rm "${mounts[@]}" alpine sh -c \
+            "find /cache -type f -atime +$days -mtime +$days -delete -print | wc -l; find /cache -mindepth 2 -type d -empty -delete" |
+            awk -v days="$days" '{ print "Removed " $1 " cached file(s) unused for " days " days" }'
+        ;;
+    *)
+        echo "$usage" >&2
+        exit 2
+        ;;
+esac
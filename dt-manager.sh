@@ -3,15 +3,53 @@
 # Docker Toolbox Manager - Shell Functions
 # Provides management commands for Docker Toolbox aliases
 #
+# Reads the tool index generated by `python generate.py --index`
+# (docker-toolbox-index.tsv: name, category, type, image, aliases,
+# description, then one key=command column per command).
+#
+
+DT_MANAGER_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+export DT_MANAGER_DIR
+
+# Locate the tool index: $DT_INDEX, ~/.docker-toolbox, or next to this script
+_dt_index() {
+    local candidate
+    for candidate in "$DT_INDEX" "$HOME/.docker-toolbox/index.tsv" "$DT_MANAGER_DIR/docker-toolbox-index.tsv"; do
+        if [ -n "$candidate" ] && [ -f "$candidate" ]; then
+            echo "$candidate"
+            return 0
+        fi
+    done
+    echo "Docker Toolbox index not found; generate it with: python generate.py --index" >&2
+    return 1
+}
 
-# List all dt- aliases
+# Print image<TAB>size for every image in the index (size empty when not pulled),
+# joined against a single `docker images` call
+_dt_image_status() {
+    local index
+    index=$(_dt_index) || return 1
+    docker images --format '{{.Repository}}:{{.Tag}}\t{{.Size}}' 2>/dev/null |
+        awk -F'\t' '
+            FILENAME == "-" { size[$1] = $2; next }
+            /^#/ || $4 == "" { next }
+            {
+                image = $4
+                if (image !~ /:[^\/]*$/) image = image ":latest"
+                if (!(image in seen)) { seen[image] = 1; print image "\t" size[image] }
+            }' - "$index"
+}
+
+# List all tools and their aliases
 dt-list() {
+    local index
+    index=$(_dt_index) || return 1
     echo "Installed Docker Toolbox aliases:"
     echo ""
-    alias | grep "^alias dt-" | sed 's/alias /  /' | sed "s/=.*//" | sort
+    awk -F'\t' '!/^#/ { gsub(",", " ", $5); printf "  %-20s %s\n", $1, $5 }' "$index"
     echo ""
     echo "Usage: <alias-name> [args]"
-    echo "Example: dt-python --version"
+    echo "Example: dtpython --version"
 }
 
 # Show info about a specific tool
@@ -22,29 +60,53 @@ dt-info() {
         return 1
     fi
 
-    local tool="dt-$1"
-    local alias_def=$(alias "$tool" 2>/dev/null)
-
-    if [ -z "$alias_def" ]; then
-        echo "Tool '$tool' not found"
+    local index
+    index=$(_dt_index) || return 1
+
+    # Match the tool name, or any of its aliases with or without the dt prefix
+    local row
+    row=$(awk -F'\t' -v q="$1" '
+        /^#/ { next }
+        $1 == q { print; exit }
+        {
+            n = split($5, aliases, ",")
+            for (i = 1; i <= n; i++) {
+                if (aliases[i] == q || aliases[i] == "dt" q) { print; exit }
+            }
+        }' "$index")
+
+    if [ -z "$row" ]; then
+        echo "Tool '$1' not found"
         echo "Run 'dt-list' to see available tools"
         return 1
     fi
 
-    echo "Tool: $tool"
-    echo ""
-    echo "Definition:"
-    echo "$alias_def" | sed 's/alias [^=]*=//' | sed "s/^'/  /" | sed "s/'$//"
-    echo ""
-
-    # Extract Docker image from the alias
-    local image=$(echo "$alias_def" | grep -oP 'docker run[^'"'"']*?\K[a-z0-9/_.-]+:[a-z0-9._-]+|docker run[^'"'"']*?\K[a-z0-9/_-]+(?=\s)' | head -1)
+    echo "$row" | awk -F'\t' '{
+        print "Tool: " $1
+        print "Category: " $2
+        print "Type: " $3
+        gsub(",", " ", $5)
+        print "Aliases: " $5
+        print ""
+        print $6
+        print ""
+        print "Commands:"
+        for (i = 7; i <= NF; i++) {
+            eq = index($i, "=")
+            printf "  %s:\n    %s\n", substr($i, 1, eq - 1), substr($i, eq + 1)
+        }
+        print ""
+    }'
+
+    local image
+    image=$(echo "$row" | cut -f4)
     if [ -n "$image" ]; then
         echo "Docker Image: $image"
 
-        # Check if image is pulled
-        if docker images "$image" --format "{{.Repository}}:{{.Tag}}" 2>/dev/null | grep -q "$image"; then
-            local size=$(docker images "$image" --format "{{.Size}}" 2>/dev/null)
+        # Check if image is pulled (one docker call)
+        local size
+        size=$(docker images "$image" --format "{{.Size}}" 2>/dev/null | head -1)
+        if [ -n "$size" ]; then
             echo "Status: Pulled (Size: $size)"
         else
             echo "Status: Not pulled yet (will download on first use)"
@@ -52,7 +114,7 @@ dt-info() {
     fi
 }
 
-# Search for tools in config file
+# Search for tools by name, alias, category or description
 dt-search() {
     if [ -z "$1" ]; then
         echo "Usage: dt-search <keyword>"
@@ -60,9 +122,20 @@ dt-search() {
         return 1
     fi
 
-    echo "Searching for '$1' in Docker Toolbox aliases:"
+    local index
+    index=$(_dt_index) || return 1
+
+    echo "Searching for '$1' in Docker Toolbox tools:"
     echo ""
-    alias | grep "^alias dt-" | grep -i "$1" | sed 's/alias /  /' | sort
+    awk -F'\t' -v q="$1" '
+        BEGIN { q = tolower(q) }
+        /^#/ { next }
+        index(tolower($1 "\t" $2 "\t" $5 "\t" $6), q) {
+            gsub(",", " ", $5)
+            printf "  %-20s %-24s %s\n", $1, $5, $6
+            found = 1
+        }
+        END { if (!found) print "  No matches" }' "$index"
 }
 
 # Update Docker images for installed tools
@@ -70,10 +143,16 @@ dt-update() {
     echo "Updating Docker images for installed tools..."
     echo ""
 
-    local images=$(alias | grep "^alias dt-" | grep -oP 'docker run[^'"'"']*?\K[a-z0-9/_.-]+:[a-z0-9._-]+|docker run[^'"'"']*?\K[a-z0-9/_-]+(?=\s)' | sort -u)
+    # Only images already pulled, unless --all is given
+    local images
+    if [ "$1" = "--all" ]; then
+        images=$(_dt_image_status | cut -f1)
+    else
+        images=$(_dt_image_status | awk -F'\t' '$2 != "" { print $1 }')
+    fi
 
     if [ -z "$images" ]; then
-        echo "No Docker Toolbox images found"
+        echo "No Docker Toolbox images found (use 'dt-update --all' to pull every tool image)"
         return 0
     fi
 
@@ -97,14 +176,15 @@ dt-update() {
     echo "Update complete!"
 }
 
-# Show installed Docker images for dt- tools
+# Show installed Docker images for Docker Toolbox tools
 dt-images() {
     echo "Docker images used by Docker Toolbox:"
     echo ""
 
-    local images=$(alias | grep "^alias dt-" | grep -oP 'docker run[^'"'"']*?\K[a-z0-9/_.-]+:[a-z0-9._-]+|docker run[^'"'"']*?\K[a-z0-9/_-]+(?=\s)' | sort -u)
+    local status
+    status=$(_dt_image_status) || return 1
 
-    if [ -z "$images" ]; then
+    if [ -z "$status" ]; then
         echo "No Docker Toolbox images found"
         return 0
     fi
@@ -112,14 +192,15 @@ dt-images() {
     echo "Image                                    Status       Size"
     echo "─────────────────────────────────────────────────────────────"
 
-    while IFS= read -r image; do
-        if docker images "$image" --format "{{.Repository}}:{{.Tag}}" 2>/dev/null | grep -q "$image"; then
-            local size=$(docker images "$image" --format "{{.Size}}" 2>/dev/null)
-            printf "%-40s %-12s %s\n" "$image" "Pulled" "$size"
-        else
-            printf "%-40s %-12s %s\n" "$image" "Not pulled" "-"
-        fi
-    done <<< "$images"
+    echo "$status" | awk -F'\t' '{
+        if ($2 != "") printf "%-40s %-12s %s\n", $1, "Pulled", $2
+        else printf "%-40s %-12s %s\n", $1, "Not pulled", "-"
+    }'
+}
+
+# Report or prune the package manager cache volumes (dt-cache-*) that generated commands mount
+dt-cache() {
+    bash "$DT_MANAGER_DIR/dt-cache.sh" "$@"
 }
 
 # Show help
@@ -127,24 +208,29 @@ dt-help() {
     cat << 'EOF'
 Docker Toolbox Manager Commands:
 
-  dt-list              List all installed Docker Toolbox aliases
+  dt-list              List all Docker Toolbox tools and their aliases
   dt-info <tool>       Show detailed info about a specific tool
-  dt-search <keyword>  Search for tools containing keyword
-  dt-images            Show Docker images used by installed tools
-  dt-update            Pull latest versions of all tool images
+  dt-search <keyword>  Search tools by name, alias, category or description
+  dt-images            Show Docker images used by the tools
+  dt-update [--all]    Pull latest versions of pulled tool images (--all: every image)
+  dt-cache [prune [DAYS]]  Show package cache sizes, or remove cached files unused for DAYS (default 30; --all: every cache)
   dt-help              Show this help message
 
 Examples:
   dt-list                    # List all tools
-  dt-info python             # Show info about dt-python
+  dt-info python             # Show info about python (or: dt-info dtipython)
   dt-search jupyter          # Search for jupyter tools
   dt-images                  # Show image status
-  dt-update                  # Update all images
+  dt-update                  # Update pulled images
+  dt-cache prune 14          # Drop pip/npm/apk downloads unused for two weeks
 
 Tool Usage:
-  dt-<tool> [args]           # Use any installed tool
-  dt-python --version        # Example: check Python version
-  dt-node app.js             # Example: run Node.js script
+  dt<tool> [args]            # Use any installed tool
+  dtpython --version         # Example: check Python version
+  dtnode app.js              # Example: run Node.js script
+
+These commands read the tool index (docker-toolbox-index.tsv), generated
+with `python generate.py --index`. Set DT_INDEX to use another copy.
 
 Documentation:
   https://github.com/yourusername/docker-toolbox
@@ -152,4 +238,4 @@ EOF
 }
 
 # Export functions
-export -f dt-list dt-info dt-search dt-update dt-images dt-help
+export -f _dt_index _dt_image_status dt-list dt-info dt-search dt-update dt-images dt-cache dt-help
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Docker Toolbox Manager
+Reports and updates the images and containers of the tools in tools.yaml,
+talking to the Docker Engine API over its unix socket instead of the docker CLI
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import sys
+import time
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlencode
+
+import generate
+
+DOCKER_SOCKET = '/var/run/docker.sock'
+
+
+def docker_socket() -> str:
+    """The Engine API socket: $DOCKER_HOST when it is a unix:// URL, else /var/run/docker.sock"""
+    host = os.environ.get('DOCKER_HOST', '')
+    return host[len('unix://'):] if host.startswith('unix://') else DOCKER_SOCKET
+
+
+def image_ref(image: str) -> str:
+    """Normalise an image reference the way the Engine lists it: an untagged name means :latest"""
+    if '@' in image or ':' in image.rsplit('/', 1)[-1]:
+        return image
+    return f"{image}:latest"
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP/1.1 connection over a unix socket (kept alive between requests by http.client)"""
+
+    def __init__(self, socket_path: str, timeout: float = 60):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class DockerError(Exception):
+    """An Engine API request failed (the daemon's message, or why it could not be reached)"""
+
+
+class DockerClient:
+    """Minimal Docker Engine API client over one persistent unix-socket connection.
+
+    Every request reuses the same keep-alive connection; if the daemon has
+    closed it in the meantime, the request is retried once on a new one.
+    Requests give up after `timeout` seconds without data, except pulls,
+    which stream progress for as long as the download takes and use
+    `pull_timeout` (None: no limit).
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 60, pull_timeout: Optional[float] = None):
+        self.socket_path = socket_path or docker_socket()
+        self.timeout = timeout
+        self.pull_timeout = pull_timeout
+        self.conn = UnixHTTPConnection(self.socket_path, timeout)
+        self.requests = 0
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'DockerClient':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def set_timeout(self, timeout: Optional[float]):
+        """Change the read timeout for the following requests, on the open connection too"""
+        self.conn.timeout = timeout
+        if self.conn.sock is not None:
+            self.conn.sock.settimeout(timeout)
+
+    def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None) -> Tuple[int, bytes]:
+        """Send one request and read the whole response; returns (status, body)"""
+        url = f"{path}?{urlencode(params)}" if params else path
+        for attempt in (1, 2):
+            try:
+                self.conn.request(method, url, headers={'Host': 'docker'})
+                response = self.conn.getresponse()
+                body = response.read()
+                self.requests += 1
+                return response.status, body
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                self.conn.close()
+                if attempt == 2:
+                    raise DockerError(f"Docker closed the connection: {e}") from e
+            except (FileNotFoundError, ConnectionRefusedError, PermissionError) as e:
+                self.conn.close()
+                raise DockerError(f"Cannot reach Docker at {self.socket_path}: {e.strerror or e}") from e
+            except socket.timeout as e:
+                # The response may still arrive later, so the connection cannot be reused
+                self.conn.close()
+                raise DockerError(f"Docker did not answer {method} {path} within {self.conn.timeout:g}s") from e
+            except http.client.HTTPException as e:
+                self.conn.close()
+                raise DockerError(f"Docker at {self.socket_path} sent an invalid response to {method} {path}") from e
+            except OSError as e:
+                self.conn.close()
+                raise DockerError(f"Docker at {self.socket_path} failed on {method} {path}: {e.strerror or e}") from e
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a JSON resource, raising DockerError on an error status"""
+        status, body = self.request('GET', path, params)
+        data = self.decode(body, path) if body else None
+        if status >= 400:
+            raise DockerError((data or {}).get('message', f"HTTP {status}") if isinstance(data, dict) else f"HTTP {status}")
+        return data
+
+    def decode(self, body: bytes, path: str) -> Any:
+        """One JSON document of a response, raising DockerError when it is not JSON"""
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise DockerError(f"Docker at {self.socket_path} sent an invalid response to {path}: {e}") from e
+
+    def images(self) -> List[Dict[str, Any]]:
+        """Every local image, in one request"""
+        return self.get('/images/json')
+
+    def containers(self) -> List[Dict[str, Any]]:
+        """Every container, running or not, in one request"""
+        return self.get('/containers/json', {'all': 1})
+
+    def info(self) -> Dict[str, Any]:
+        """Daemon-wide information (version, storage driver, counts)"""
+        return self.get('/info')
+
+    def pull(self, image: str) -> str:
+        """Pull an image; returns the last status line, raising DockerError on failure.
+
+        The Engine streams progress as JSON objects; the body is read to the
+        end so the connection can be reused for the next pull.
+        """
+        ref = image_ref(image)
+        params = {'fromImage': ref} if '@' in ref else dict(zip(('fromImage', 'tag'), ref.rsplit(':', 1)))
+        self.set_timeout(self.pull_timeout)
+        try:
+            status, body = self.request('POST', '/images/create', params)
+        finally:
+            self.set_timeout(self.timeout)
+        messages = [self.decode(line, '/images/create') for line in body.splitlines() if line.strip()]
+        if status >= 400:
+            raise DockerError(messages[-1].get('message', f"HTTP {status}") if messages else f"HTTP {status}")
+        errors = [message['error'] for message in messages if 'error' in message]
+        if errors:
+            raise DockerError(errors[-1])
+        return messages[-1].get('status', '') if messages else ''
+
+
+def catalog_images(gen: generate.ToolboxGenerator) -> Dict[str, List[str]]:
+    """Every image the catalog runs (tool images and the images in its commands) -> tool names"""
+    images = {}
+    for ref, tools in gen.image_usage().items():
+        users = images.setdefault(image_ref(ref), [])
+        users.extend(tool for tool in tools if tool not in users)
+    return images
+
+
+def local_images(client: DockerClient) -> Dict[str, Dict[str, Any]]:
+    """Local images by every tag they carry, from one /images/json request"""
+    return {tag: image for image in client.images() for tag in image.get('RepoTags') or []}
+
+
+def human_size(size: int) -> str:
+    """Bytes as the docker CLI shows them (1.2GB, 45.3MB)"""
+    for unit in ('B', 'kB', 'MB', 'GB'):
+        if size < 1000 or unit == 'GB':
+            return f"{size:.1f}{unit}" if unit != 'B' else f"{size}B"
+        size /= 1000
+
+
+def cmd_images(client: DockerClient, gen: generate.ToolboxGenerator, args: argparse.Namespace) -> int:
+    """Show every catalog image and whether it is pulled"""
+    local = local_images(client)
+    pulled = total = 0
+    print(f"{'Image':<48} {'Status':<11} {'Size':>8}  Tools")
+    for ref, tools in catalog_images(gen).items():
+        image = local.get(ref)
+        if image is not None:
+            pulled += 1
+            total += image.get('Size', 0)
+        elif args.pulled:
+            continue
+        status, size = ('Pulled', human_size(image.get('Size', 0))) if image else ('Not pulled', '-')
+        print(f"{ref:<48} {status:<11} {size:>8}  {', '.join(tools)}")
+    print(f"\n{pulled} image(s) pulled, {human_size(total)} on disk")
+    return 0
+
+
+def cmd_info(client: DockerClient, gen: generate.ToolboxGenerator, args: argparse.Namespace) -> int:
+    """Show a tool (by name or alias) with its image and container status"""
+    query = args.tool
+    tool = next((t for t in gen.catalog if t.name == query), None)
+    if tool is None:
+        entry = gen.alias_index.get(query) or gen.alias_index.get(f"dt{query}")
+        tool = next((t for t in gen.catalog if entry is not None and t.name == entry.tool), None)
+    if tool is None:
+        print(f"Tool '{query}' not found (see: python dt_manager.py images)", file=sys.stderr)
+        return 1
+
+    print(f"Tool: {tool.name}")
+    print(f"Category: {tool.category}")
+    print(f"Type: {tool.type}")
+    print(f"Aliases: {' '.join(entry.alias for entry in tool.aliases)}")
+    print(f"\n{tool.description}\n")
+    print("Commands:")
+    for key, command in tool.commands.items():
+        print(f"  {key}:\n    {command.text}")
+
+    local = local_images(client)
+    refs = dict.fromkeys(image_ref(r) for r in [tool.image] + [c.run.image for c in tool.commands.values() if c.run] if r)
+    print()
+    for ref in refs:
+        image = local.get(ref)
+        print(f"Image: {ref} ({'pulled, ' + human_size(image.get('Size', 0)) if image else 'not pulled yet'})")
+    names = {f"/{spec.container}" for spec in map(generate.service_spec, [tool]) if spec} | {f"/{tool.name}"}
+    for container in client.containers():
+        if image_ref(container.get('Image', '')) in refs or names.intersection(container.get('Names') or []):
+            print(f"Container: {container['Names'][0].lstrip('/')} ({container.get('Status') or container.get('State')})")
+    return 0
+
+
+def cmd_status(client: DockerClient, gen: generate.ToolboxGenerator, args: argparse.Namespace) -> int:
+    """Show the containers running (or stopped) from catalog images, from one /containers/json request"""
+    images = catalog_images(gen)
+    found = 0
+    for container in client.containers():
+        tools = images.get(image_ref(container.get('Image', '')))
+        if tools is None or (not args.all and container.get('State') != 'running'):
+            continue
+        found += 1
+        name = (container.get('Names') or ['/?'])[0].lstrip('/')
+        print(f"  {name:<28} {container.get('State', ''):<10} {container.get('Status', ''):<28} {', '.join(tools)}")
+    if not found:
+        print("No Docker Toolbox containers are running" if not args.all else "No Docker Toolbox containers")
+    return 0
+
+
+def cmd_update(client: DockerClient, gen: generate.ToolboxGenerator, args: argparse.Namespace) -> int:
+    """Pull the latest version of pulled catalog images (or all of them), one connection for every pull"""
+    local = local_images(client)
+    refs = [ref for ref in catalog_images(gen) if args.all or ref in local]
+    if not refs:
+        print("No Docker Toolbox images found (use --all to pull every tool image)")
+        return 0
+    print("Images to update:")
+    for ref in refs:
+        print(f"  {ref}")
+    if not args.yes:
+        answer = input("\nPull latest versions? [y/N]: ")
+        if answer.strip().lower() not in ('y', 'yes'):
+            print("Update cancelled")
+            return 0
+
+    print()
+    failed = []
+    for ref in refs:
+        start = time.perf_counter()
+        try:
+            status = client.pull(ref)
+            print(f"  [OK] {ref} ({time.perf_counter() - start:.1f}s): {status}")
+        except DockerError as e:
+            failed.append(ref)
+            print(f"  [FAILED] {ref}: {e}")
+    print(f"\n[OK] Updated {len(refs) - len(failed)}/{len(refs)} image(s)")
+    return 1 if failed else 0
+
+
+def cmd_engine(client: DockerClient, gen: generate.ToolboxGenerator, args: argparse.Namespace) -> int:
+    """Show the daemon's version and resource counts"""
+    info = client.info()
+    for label, key in (('Server version', 'ServerVersion'), ('Storage driver', 'Driver'), ('Images', 'Images'),
+                       ('Containers', 'Containers'), ('Running', 'ContainersRunning'), ('CPUs', 'NCPU')):
+        print(f"  {label:<16} {info.get(key, '-')}")
+    if 'MemTotal' in info:
+        print(f"  {'Memory':<16} {human_size(info['MemTotal'])}")
+    return 0
+
+
+COMMANDS = {
+    'images': cmd_images,
+    'info': cmd_info,
+    'status': cmd_status,
+    'update': cmd_update,
+    'engine': cmd_engine,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage Docker Toolbox images and containers through the Docker Engine API')
+    parser.add_argument('--socket', metavar='PATH', help=f'Engine API socket (default: $DOCKER_HOST or {DOCKER_SOCKET})')
+    subcommands = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+
+    images = subcommands.add_parser('images', help='Show every tool image and whether it is pulled')
+    images.add_argument('--pulled', action='store_true', help='Only show pulled images')
+    info = subcommands.add_parser('info', help='Show a tool with its image and container status')
+    info.add_argument('tool', help='Tool name or alias (with or without the dt prefix)')
+    status = subcommands.add_parser('status', help='Show containers running from tool images')
+    status.add_argument('--all', action='store_true', help='Include stopped containers')
+    update = subcommands.add_parser('update', help='Pull the latest version of pulled tool images')
+    update.add_argument('--all', action='store_true', help='Pull every tool image, not just the pulled ones')
+    update.add_argument('--yes', '-y', action='store_true', help="Don't ask for confirmation")
+    subcommands.add_parser('engine', help="Show the Docker daemon's version and resource counts")
+
+    args = parser.parse_args()
+
+    gen = generate.load_generator()
+    if gen is None:
+        return 1
+    try:
+        with DockerClient(args.socket) as client:
+            return COMMANDS[args.command](client, gen, args)
+    except DockerError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,23 +4,1835 @@ Docker Toolbox Generator
 Generates documentation and installer scripts from tools.yaml
 """
 
-import yaml
 import argparse
+import bisect
+import contextlib
+import functools
+import hashlib
+import heapq
+import json
+import math
+import os
+import pickle
+import re
+import shlex
 import sys
+import time
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+CACHE_DIR = '.dtcache'
+SEARCH_INDEX = 'docker-toolbox-search.tsv'
+
+# Bump when the snapshot layout changes so stale snapshots are ignored
+SNAPSHOT_VERSION = 3
+
+# Stale catalog files are parsed on a process pool once they add up to this much YAML
+PARALLEL_PARSE_CHARS = 256 * 1024
+
+# Default file of each streamed output format, relative to --output-dir (Typst goes to docgen/)
+OUTPUT_FILES = {
+    'markdown': 'docker-dev-tools.md',
+    'powershell': 'install-interactive.ps1',
+    'bash': 'install.sh',
+    'powershell_dispatcher': 'install-dispatcher.ps1',
+    'bash_dispatcher': 'install-dispatcher.sh',
+    'index': 'docker-toolbox-index.tsv',
+    'warm': 'dt-warm',
+}
+
+# Formats whose traversal also builds the search and tool indexes (see IndexBuilder): the
+# dispatcher installer embeds them, and --index writes the search index and JSON next to its TSV
+INDEXED_FORMATS = frozenset({'bash_dispatcher', 'index'})
+
+# Standalone `dt cache` script, installed by the dispatcher installer and run by dt-manager.sh
+CACHE_SCRIPT = 'dt-cache.sh'
+
+# Tool fields each output format reads, so --watch can skip unaffected outputs
+# (`type`, `resources` and `package_cache` change what is added to commands, so they count as command edits)
+FORMAT_FIELDS = {
+    'markdown': frozenset({'name', 'category', 'type', 'description', 'commands', 'resources', 'package_cache', 'aliases',
+                           'alias_commands', 'bake', 'notes'}),
+    'powershell': frozenset({'name', 'category', 'description', 'aliases'}),
+    'bash': frozenset({'name', 'category', 'type', 'commands', 'resources', 'package_cache', 'aliases', 'alias_commands',
+                       'bake'}),
+    'bash_dispatcher': frozenset({'name', 'category', 'type', 'image', 'description', 'commands', 'resources',
+                                  'package_cache', 'aliases', 'alias_commands', 'bake', 'notes', 'examples'}),
+    'powershell_dispatcher': frozenset({'name', 'type', 'commands', 'resources', 'package_cache', 'aliases', 'alias_commands',
+                                        'bake'}),
+    'warm': frozenset({'name', 'type', 'commands', 'resources', 'package_cache', 'aliases', 'alias_commands', 'bake', 'warm'}),
+    'index': frozenset({'name', 'category', 'type', 'image', 'description', 'commands', 'resources', 'package_cache', 'aliases',
+                        'alias_commands', 'bake', 'notes', 'examples'}),
+    'typst': frozenset({'name', 'category', 'type', 'description', 'image', 'commands', 'resources', 'package_cache', 'aliases',
+                        'notes', 'examples'}),
+}
+
+# Tool types, each of which can have default resource limits
+TOOL_TYPES = ('ephemeral', 'daemon', 'server')
+
+# Resource limits a `resources` profile may set: docker run option, valid values and a hint for errors
+RESOURCE_LIMITS = {
+    'cpus': ('--cpus', re.compile(r'^(\d+(\.\d*)?|\.\d+)$'), 'a number of CPUs such as 2 or 0.5'),
+    'memory': ('--memory', re.compile(r'^[1-9]\d*[bkmg]?$', re.IGNORECASE), 'a size such as 512m or 2g'),
+    'memory_swap': ('--memory-swap', re.compile(r'^(-1|[1-9]\d*[bkmg]?)$', re.IGNORECASE), 'a size such as 4g, or -1 for unlimited'),
+    'pids_limit': ('--pids-limit', re.compile(r'^(-1|[1-9]\d*)$'), 'a positive number of processes, or -1 for unlimited'),
+    'shm_size': ('--shm-size', re.compile(r'^[1-9]\d*[bkmg]?$', re.IGNORECASE), 'a size such as 64m or 1g'),
+    'blkio_weight': ('--blkio-weight', re.compile(r'^([1-9]\d|[1-9]\d\d|1000)$'), 'a block I/O weight from 10 to 1000'),
+}
+
+# Command keys an alias may end with (e.g. dtpgstart -> start), in priority order
+ALIAS_SUFFIXES = ('start', 'stop', 'logs', 'cli', 'exec', 'run', 'serve', 'watch', 'check',
+                  'write', 'build', 'new', 'simple', 'test', 'playbook', 'identify', 'mogrify')
+
+
+# Setup steps that can be baked into a derived image instead of running on every invocation
+BAKE_STEPS = ('apk add ', 'apt-get install ', 'pip install ', 'npm install -g ', 'wget ', 'curl ')
+
+# docker run <options> <image> sh -c "<setup> && <command>"
+SHELL_COMMAND = re.compile(r'^(?P<run>docker run\b.*?) (?P<image>\S+) sh -c "(?P<script>[^"]*)"$')
+QUIET_REDIRECT = re.compile(r'\s*>\s*/dev/null(?:\s+2>&1)?')
+# Shell syntax that keeps a baked command wrapped in sh -c
+SHELL_SYNTAX = re.compile(r'[|&;<>()`\\]|\$(?!args\b)')
+
+
+class AliasEntry(NamedTuple):
+    """An alias resolved to its command, pre-rendered for each shell.
+
+    For baked commands (see bake_spec) `bash` and `powershell` run the
+    dt-<tool> image when it exists locally and fall back to the original
+    command otherwise; `baked` is then the image name.
+    """
+    alias: str
+    tool: str
+    command_key: str
+    bash: str
+    powershell: str
+    baked: str = ''
+
+    @property
+    def bash_definition(self) -> str:
+        """The alias line, or a function for baked commands (aliases cannot branch on arguments)"""
+        if self.baked:
+            # `function name` rather than `name()`: an older alias of the same name is not expanded
+            return f"function {self.alias} {{ {self.bash}; }}"
+        return f"alias {self.alias}='{self.bash}'"
+
+
+# Marks a lazily computed attribute that has not been worked out yet (None is a valid value)
+_UNSET = object()
+
+
+class Command:
+    """One of a tool's commands.
+
+    `source` is the command as the catalog writes it. What the outputs
+    show (`text`) adds the tool's resource limits and package cache
+    volumes, which are applied once to the parsed command on first use
+    and the text derived from that parse, so loading a catalog
+    tokenizes nothing and --validate or --search never pay for it.
+    """
+    __slots__ = ('key', 'source', 'limits', 'caches', '_source_run', '_parsed', '_text', '_bash', '_run')
+
+    def __init__(self, key: str, source: Any, limits: Optional[Dict[str, Any]] = None, caches: bool = True):
+        self.key = sys.intern(str(key))
+        self.source = str(source).strip()
+        self.limits = limits or {}
+        self.caches = caches
+        self._source_run = self._parsed = self._text = self._bash = self._run = _UNSET
+
+    @property
+    def source_run(self) -> Optional['DockerRun']:
+        """`source` split by parse_docker_run (None for anything but a single docker run)"""
+        if self._source_run is _UNSET:
+            self._source_run = parse_docker_run(self.source)
+        return self._source_run
+
+    @property
+    def parsed(self) -> Optional['DockerRun']:
+        """The command as run, with its cache volumes and limits added (None for anything but a single docker run)"""
+        if self._parsed is _UNSET:
+            run = self.source_run
+            if run is not None and self.caches:
+                run = add_package_caches(run)
+            self._parsed = add_limits(run, self.limits) if run is not None else None
+        return self._parsed
+
+    @property
+    def text(self) -> str:
+        if self._text is _UNSET:
+            if not self.limits and not (self.caches and PACKAGE_CACHE_WORDS.search(self.source)):
+                # Nothing can be added, so there is no need to parse the command
+                self._text = self.source
+            else:
+                self._text = self._render(self.parsed)
+        return self._text
+
+    @property
+    def limited(self) -> str:
+        """The command with its limits but no cache volumes (baked images install their packages at build time)"""
+        run = self.source_run
+        return self._render(add_limits(run, self.limits) if run is not None else None)
+
+    def _render(self, run: Optional['DockerRun']) -> str:
+        """The text of a rewrite of the source command (the source itself when nothing changed)"""
+        if run is None:
+            # Not a single docker run (a redirect, say) but the limits still belong after `docker run`
+            return insert_limits(self.source, self.limits)
+        return self.source if run is self.source_run else render_docker_run(run)
+
+    @property
+    def bash(self) -> str:
+        # Bash passes the arguments as "$@" where the catalog writes $args
+        if self._bash is _UNSET:
+            self._bash = self.text.replace('$args', '"$@"')
+        return self._bash
+
+    @property
+    def run(self) -> Optional['RunSpec']:
+        """The parsed docker run command, or None for anything else (built from `parsed` on first use)"""
+        if self._run is _UNSET:
+            run = self.parsed
+            self._run = docker_run_spec(run) if run is not None else None
+        return self._run
+
+
+def _interned(value: Any) -> Any:
+    """Intern strings repeated across tools (categories, types, images); pass anything else through"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Tool:
+    """A catalog tool, built once at load time and shared by every renderer.
+
+    Strings that repeat across tools are interned; everything that costs
+    more than reading the YAML entry is worked out on first use, so
+    commands that only validate or search the catalog never build it.
+    `raw` is the YAML entry, which still keys the fragment cache and
+    --watch diffs. `limits` are the resolved resource limits (see
+    resource_limits) from the catalog's `resources` section, added to
+    every docker run command along with any package cache volumes
+    (unless the entry has `package_cache: false`). `aliases` holds the
+    resolved per-shell alias commands, looked up through the generator's
+    alias index. Optional fields are None when the entry does not have
+    them.
+    """
+    __slots__ = ('raw', 'name', 'category', 'type', 'image', 'description', 'notes', 'examples',
+                 'alias_names', 'alias_commands', 'warm', '_resources', '_resolve_aliases',
+                 '_limits', '_commands', '_bake', '_aliases')
+
+    def __init__(self, raw: Dict[str, Any], resources: Any = None,
+                 resolve_aliases: Optional[Callable[['Tool'], List[AliasEntry]]] = None):
+        self.raw = raw
+        self.name = raw.get('name')
+        self.category = _interned(raw.get('category'))
+        self.type = _interned(raw.get('type', ''))
+        self.image = _interned(raw.get('image', ''))
+        self.description = raw.get('description', '')
+        self.notes = str(raw['notes']).strip() if 'notes' in raw else None
+        self.examples = raw.get('examples')
+        self.alias_names = raw.get('aliases')
+        alias_commands = raw.get('alias_commands')
+        self.alias_commands = alias_commands if isinstance(alias_commands, dict) else {}
+        self.warm = raw.get('warm')
+        self._resources = resources
+        self._resolve_aliases = resolve_aliases
+        self._limits = self._commands = self._bake = self._aliases = _UNSET
+
+    @property
+    def limits(self) -> Dict[str, Any]:
+        if self._limits is _UNSET:
+            self._limits = resource_limits(self.raw, self._resources)
+        return self._limits
+
+    @property
+    def commands(self) -> Dict[str, Command]:
+        if self._commands is _UNSET:
+            commands = self.raw.get('commands') or {}
+            caches = self.raw.get('package_cache') is not False
+            self._commands = {str(key): Command(key, text, self.limits, caches)
+                              for key, text in commands.items()} if isinstance(commands, dict) else {}
+        return self._commands
+
+    @property
+    def bake(self) -> Optional['BakeSpec']:
+        if self._bake is _UNSET:
+            limited = {key: command.limited for key, command in self.commands.items()}
+            self._bake = bake_spec({**self.raw, 'commands': limited})
+        return self._bake
+
+    @property
+    def aliases(self) -> List[AliasEntry]:
+        if self._aliases is _UNSET:
+            self._aliases = self._resolve_aliases(self) if self._resolve_aliases is not None else []
+        return self._aliases
+
+
+def _resource_spec(spec: Any, profiles: Dict[str, Any], base: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve one resources spec on top of `base` (see resource_limits)"""
+    if isinstance(spec, str):
+        profile = profiles.get(spec)
+        return dict(profile) if isinstance(profile, dict) else {}
+    if not isinstance(spec, dict):
+        return {}
+    limits = _resource_spec(spec['profile'], profiles, {}) if 'profile' in spec else dict(base)
+    for field, value in spec.items():
+        if field == 'profile':
+            continue
+        if value is None:
+            limits.pop(field, None)
+        else:
+            limits[field] = value
+    return limits
+
+
+def resource_limits(tool: Dict[str, Any], resources: Any) -> Dict[str, Any]:
+    """Work out a tool's resource limits from the catalog's `resources` section.
+
+    The default for the tool's type applies unless the tool has its own
+    `resources`: a profile name, a mapping of limits (starting from
+    its `profile:` if given, else from the type default; a null value
+    drops a limit), or false for no limits. Malformed entries are
+    left to validate().
+    """
+    if not isinstance(resources, dict):
+        resources = {}
+    profiles = resources.get('profiles') if isinstance(resources.get('profiles'), dict) else {}
+    defaults = resources.get('defaults') if isinstance(resources.get('defaults'), dict) else {}
+    limits = _resource_spec(defaults.get(tool.get('type')), profiles, {})
+    if 'resources' in tool:
+        limits = _resource_spec(tool['resources'], profiles, limits)
+    return {field: limits[field] for field in RESOURCE_LIMITS if field in limits}
+
+
+def resource_errors(spec: Any, profiles: Dict[str, Any]) -> List[str]:
+    """Check a resources spec: a known profile name, a mapping of well-formed limits, or false"""
+    if spec is False:
+        return []
+    if isinstance(spec, str):
+        return [] if spec in profiles else [f"Unknown resource profile '{spec}'"]
+    if not isinstance(spec, dict):
+        return ["'resources' should be a profile name, a mapping of limits or false"]
+    errors = []
+    for field, value in spec.items():
+        if field == 'profile':
+            if not isinstance(value, str) or value not in profiles:
+                errors.append(f"Unknown resource profile '{value}'")
+        elif field not in RESOURCE_LIMITS:
+            errors.append(f"Unknown resource limit '{field}' (expected one of: {', '.join(RESOURCE_LIMITS)})")
+        elif value is not None and (isinstance(value, bool) or not RESOURCE_LIMITS[field][1].match(str(value))):
+            errors.append(f"Invalid {field} {value!r}: expected {RESOURCE_LIMITS[field][2]}")
+        elif field == 'cpus' and value is not None and float(value) <= 0:
+            errors.append(f"Invalid cpus {value!r}: expected {RESOURCE_LIMITS[field][2]}")
+    return errors
+
+
+def render_docker_run(run: 'DockerRun') -> str:
+    """Join a parsed docker run command back into one line (words keep their quotes)"""
+    return ' '.join(['docker', 'run', *run.options, run.image, *run.args])
+
+
+def add_package_caches(run: 'DockerRun') -> 'DockerRun':
+    """Mount the shared cache volume of each package manager a docker run command calls (see PACKAGE_CACHES).
+
+    Works on the command's parse_docker_run result and returns it
+    unchanged (the same object) when there is nothing to add. Package
+    managers are recognised as the first word of the command run in the
+    container or of any step of its `sh -c` script. Caches the command
+    already mounts (at the cache path or a parent of it) are left alone,
+    and `apk add --no-cache` becomes `apk add -U` so apk keeps the
+    packages it downloads.
+    """
+    if not run.args:
+        return run
+    script = _unquote(run.args[2]) if run.args[:2] == ['sh', '-c'] and len(run.args) == 3 else ' '.join(run.args)
+    programs = {step.split()[0] for step in re.split(r'&&|\|\||[;|]', script) if step.strip()}
+    if programs.isdisjoint(PACKAGE_CACHE_PROGRAMS):
+        return run
+    targets = [mount.target.rstrip('/') for mount in docker_run_spec(run).volumes]
+    mounts = []
+    args = run.args
+    for names, volume, path in PACKAGE_CACHES:
+        if programs.intersection(names) and not any(path == target or path.startswith(target + '/') for target in targets):
+            mounts += ['-v', f"{volume}:{path}"]
+            if volume == 'dt-cache-apk':
+                args = [APK_NO_CACHE.sub('apk add -U', word) for word in args]
+                for i in range(len(args) - 2):
+                    if args[i:i + 3] == ['apk', 'add', '--no-cache']:
+                        args[i + 2] = '-U'
+    if not mounts:
+        return run
+    return run._replace(options=mounts + run.options, args=args)
+
+
+def limit_options(words: List[str], limits: Dict[str, Any]) -> List[str]:
+    """The resource limit options to add to a docker run command with these option words (any it sets stay)"""
+    present = {word.split('=', 1)[0] for word in words}
+    if '-m' in present:
+        present.add('--memory')
+    return [word for field, value in limits.items() if RESOURCE_LIMITS[field][0] not in present
+            for word in (RESOURCE_LIMITS[field][0], str(value))]
+
+
+def add_limits(run: 'DockerRun', limits: Dict[str, Any]) -> 'DockerRun':
+    """Add resource limit options to a parsed docker run command (the same object when there are none to add)"""
+    options = limit_options(run.options, limits) if limits else []
+    return run._replace(options=options + run.options) if options else run
+
+
+def insert_limits(command: str, limits: Dict[str, Any]) -> str:
+    """add_limits for a docker run command parse_docker_run cannot split (one with a redirect, say)"""
+    if not limits or not command.startswith('docker run '):
+        return command
+    options = limit_options(command.split(), limits)
+    return f"docker run {' '.join(options)}{command[len('docker run'):]}" if options else command
+
+
+class BakeSpec(NamedTuple):
+    """A derived image with a tool's per-run setup steps pre-installed"""
+    tool: str
+    image: str
+    base: str
+    steps: List[str]
+    commands: Dict[str, str]
+
+
+def bake_spec(tool: Dict[str, Any]) -> Optional[BakeSpec]:
+    """Detect commands that install packages on every run (see BAKE_STEPS).
+
+    Matches `docker run ... <image> sh -c "<setup> && <command>"` and
+    returns the dt-<tool> image that bakes the setup steps in, with each
+    matching command rewritten to run it (None if nothing matches).
+    Baked commands of one tool must share a base image; `bake: false`
+    on the tool opts out.
+    """
+    commands = tool.get('commands')
+    if tool.get('bake') is False or not isinstance(commands, dict) or not isinstance(tool.get('name'), str):
+        return None
+    image = 'dt-' + re.sub(r'[^a-z0-9_.-]+', '-', tool['name'].lower())
+    base = None
+    steps = []
+    baked = {}
+    for key, cmd in commands.items():
+        cmd = str(cmd).strip()
+        match = SHELL_COMMAND.match(cmd) if ' sh -c "' in cmd else None
+        if match is None or base not in (None, match['image']):
+            continue
+        parts = match['script'].split(' && ')
+        setup = []
+        while len(parts) > 1 and parts[0].startswith(BAKE_STEPS):
+            setup.append(QUIET_REDIRECT.sub('', parts.pop(0)))
+        if not setup:
+            continue
+        base = match['image']
+        steps.extend(step for step in setup if step not in steps)
+        rest = ' && '.join(parts)
+        run = f'sh -c "{rest}"' if SHELL_SYNTAX.search(rest) else rest
+        baked[key] = f"{match['run']} {image} {run}"
+    if not baked:
+        return None
+    return BakeSpec(tool['name'], image, base, steps, baked)
+
+
+# Package managers whose downloads persist in a shared named volume: command names, volume, cache path
+PACKAGE_CACHES = (
+    (('pip', 'pip3'), 'dt-cache-pip', '/root/.cache/pip'),
+    (('npm', 'npx'), 'dt-cache-npm', '/root/.npm'),
+    (('yarn',), 'dt-cache-yarn', '/usr/local/share/.cache/yarn'),
+    (('apk',), 'dt-cache-apk', '/etc/apk/cache'),
+    (('go',), 'dt-cache-go', '/go/pkg/mod'),
+    (('cargo',), 'dt-cache-cargo', '/usr/local/cargo/registry'),
+    (('gem', 'bundle'), 'dt-cache-gem', '/usr/local/bundle/cache'),
+)
+PACKAGE_CACHE_VOLUMES = frozenset(volume for _, volume, _ in PACKAGE_CACHES)
+PACKAGE_CACHE_PROGRAMS = frozenset(name for names, _, _ in PACKAGE_CACHES for name in names)
+# Any mention of those commands (commands without one cannot need a cache volume)
+PACKAGE_CACHE_WORDS = re.compile(r'\b(?:' + '|'.join(sorted(PACKAGE_CACHE_PROGRAMS)) + r')\b')
+# apk's flag not to keep downloads, as a whole word (the end of a quoted script counts)
+APK_NO_CACHE = re.compile(r'\bapk add --no-cache(?=[\s"\']|$)')
+
+# docker run options that take a value as the next word (unless given as --opt=value)
+DOCKER_RUN_VALUE_OPTIONS = frozenset({
+    '-v', '--volume', '-w', '--workdir', '-e', '--env', '--env-file', '-p', '--publish', '--name',
+    '-u', '--user', '--network', '--net', '--entrypoint', '-l', '--label', '--mount', '--platform',
+    '--pid', '--ipc', '-h', '--hostname', '--add-host', '--device', '--cap-add', '--cap-drop',
+    '--security-opt', '--shm-size', '-m', '--memory', '--cpus', '--ulimit', '--restart', '--tmpfs', '--gpus',
+    '--memory-swap', '--pids-limit', '--blkio-weight',
+})
+
+# Shell operators that make a command more than a single docker run
+SHELL_OPERATORS = frozenset({'|', '||', '&', '&&', ';', '>', '>>', '<', '2>&1'})
+
+
+# Shell words as non-POSIX, whitespace-split shlex finds them: a quoted string up to its
+# closing quote, or a run of non-blank characters (a lone quote: one left unclosed)
+SHELL_WORD = re.compile(r'''"[^"]*"|'[^']*'|[^ \t\r\n"'][^ \t\r\n]*|["']''')
+
+
+# Parsed commands run_spec keeps; --watch also clears it on every reload
+RUN_SPEC_CACHE_SIZE = 4096
+
+
+class DockerRun(NamedTuple):
+    """A `docker run` command split into option words, image and the words after it"""
+    options: List[str]
+    image: str
+    args: List[str]
+
+
+def parse_docker_run(command: str) -> Optional[DockerRun]:
+    """Split a `docker run` command into options, image and arguments.
+
+    Words keep their original quoting and variables (${PWD}, $args).
+    Returns None for anything that is not a single docker run.
+    """
+    words = SHELL_WORD.findall(command)
+    # A lone quote word is an unclosed quote
+    if words[:2] != ['docker', 'run'] or SHELL_OPERATORS.intersection(words) or '"' in words or "'" in words:
+        return None
+    i = 2
+    while i < len(words) and words[i].startswith('-'):
+        i += 2 if words[i] in DOCKER_RUN_VALUE_OPTIONS else 1
+    if i >= len(words):
+        return None
+    return DockerRun(words[2:i], words[i], words[i + 1:])
+
+
+class PortBinding(NamedTuple):
+    """A published port: host address and port (empty when Docker picks one), container port and protocol"""
+    host_ip: str
+    host_port: str
+    container_port: str
+    protocol: str
+
+
+class VolumeMount(NamedTuple):
+    """A -v/--mount source and target; `named` when the source is a Docker volume rather than a host path"""
+    source: str
+    target: str
+    mode: str
+    named: bool
+
+
+class RunSpec(NamedTuple):
+    """A `docker run` command parsed into its parts (see run_spec)"""
+    image: str
+    ports: Tuple[PortBinding, ...]
+    volumes: Tuple[VolumeMount, ...]
+    names: Tuple[str, ...]
+    env: Tuple[Tuple[str, str], ...]
+    flags: Tuple[str, ...]
+    args: Tuple[str, ...]
+
+
+def _unquote(word: str) -> str:
+    """Strip one pair of matching outer quotes from a shell word"""
+    if len(word) > 1 and word[0] == word[-1] and word[0] in '"\'':
+        return word[1:-1]
+    return word
+
+
+def _port_binding(value: str) -> PortBinding:
+    """Parse a -p value: [[ip:]host:]container[/protocol]"""
+    spec, _, protocol = value.partition('/')
+    parts = spec.rsplit(':', 2)
+    if len(parts) == 1:
+        return PortBinding('', '', parts[0], protocol or 'tcp')
+    if len(parts) == 2:
+        return PortBinding('', parts[0], parts[1], protocol or 'tcp')
+    return PortBinding(parts[0], parts[1], parts[2], protocol or 'tcp')
+
+
+def _volume_mount(value: str, mount: bool = False) -> VolumeMount:
+    """Parse a -v value (source:target[:mode]) or a --mount key=value list"""
+    if mount:
+        fields = dict(field.partition('=')[::2] for field in value.split(','))
+        source = fields.get('source') or fields.get('src', '')
+        target = fields.get('target') or fields.get('destination') or fields.get('dst', '')
+        return VolumeMount(source, target, 'ro' if 'readonly' in fields or 'ro' in fields else '',
+                           fields.get('type', 'volume') == 'volume' and bool(source))
+    parts = value.split(':')
+    if len(parts) == 1:
+        return VolumeMount('', parts[0], '', False)  # anonymous volume
+    source, target, mode = parts[0], parts[1], ':'.join(parts[2:])
+    return VolumeMount(source, target, mode, bool(source) and not source.startswith(('/', '.', '~', '$')))
+
+
+def _port_range(host_port: str) -> List[str]:
+    """Expand a host port or range (8000-8002) into single ports"""
+    start, _, end = host_port.partition('-')
+    if end and start.isdigit() and end.isdigit():
+        return [str(port) for port in range(int(start), int(end) + 1)]
+    return [host_port]
+
+
+@functools.lru_cache(maxsize=RUN_SPEC_CACHE_SIZE)
+def run_spec(command: str) -> Optional[RunSpec]:
+    """Parse a `docker run` command into image, ports, volumes, names, env and other flags.
+
+    Built on parse_docker_run, so it accepts the same commands; values
+    lose their outer quotes but keep variables (${PWD}, $args). Results
+    are cached per command string (the most recent RUN_SPEC_CACHE_SIZE),
+    so every caller shares one parse. Catalog commands come already
+    parsed (see Command.run).
+    """
+    run = parse_docker_run(command)
+    return docker_run_spec(run) if run is not None else None
+
+
+def docker_run_spec(run: DockerRun) -> RunSpec:
+    """Build the RunSpec of an already split docker run command (see run_spec)"""
+    ports, volumes, names, env, flags = [], [], [], [], []
+    words = iter(run.options)
+    for word in words:
+        option, has_value, value = word.partition('=')
+        if not has_value and option in DOCKER_RUN_VALUE_OPTIONS:
+            value = next(words, '')
+        elif not option.startswith('--'):
+            option, value = word, ''  # combined short flags such as -it
+        value = _unquote(value)
+        if option in ('-p', '--publish'):
+            ports.append(_port_binding(value))
+        elif option in ('-v', '--volume'):
+            volumes.append(_volume_mount(value))
+        elif option == '--mount':
+            volumes.append(_volume_mount(value, mount=True))
+        elif option == '--name':
+            names.append(value)
+        elif option in ('-e', '--env'):
+            key, _, env_value = value.partition('=')
+            env.append((key, env_value))
+        else:
+            flags.append(word if not value else f'{option}={value}')
+    return RunSpec(run.image, tuple(ports), tuple(volumes), tuple(names), tuple(env), tuple(flags), tuple(run.args))
+
+
+class Conflict(NamedTuple):
+    """A host port, container name or named volume claimed by more than one tool.
+
+    `users` lists (tool name, command keys) in catalog order.
+    """
+    kind: str
+    key: str
+    users: List[Tuple[str, List[str]]]
+
+    @property
+    def message(self) -> str:
+        """One-line description, e.g. 'host port 3000/tcp is used by webtop (default), grafana (default)'"""
+        label = {'port': 'host port', 'name': 'container name', 'volume': 'named volume'}[self.kind]
+        return f"{label} {self.key} is used by {_describe_users(self.users)}"
+
+
+def _describe_users(users: Iterable[Tuple[str, List[str]]]) -> str:
+    """Tool names with their command keys, e.g. 'webtop (default, xfce), grafana (default)'"""
+    return ', '.join(f"{tool} ({', '.join(keys)})" for tool, keys in users)
+
+
+# Command keys tried, in order, for the docker run that starts a service in the background
+SERVICE_COMMANDS = ('serve', 'start', 'default')
+
+# Keys of a tool's `ready:` probe
+READY_FIELDS = ('port', 'http', 'log', 'timeout')
+
+
+class ServiceSpec(NamedTuple):
+    """A daemon or server tool the supervisor can run in the background.
+
+    `command` starts it detached in a container named `container`; it is
+    ready once `port` accepts connections, `http` (a path on that port)
+    answers without a server error and `log` appears in its logs, for
+    whichever of these are set.
+    """
+    name: str
+    container: str
+    command: str
+    depends_on: Tuple[str, ...]
+    port: Optional[int]
+    http: Optional[str]
+    log: Optional[str]
+    timeout: float
+
+
+def service_command(tool: 'Tool') -> Optional[str]:
+    """The key of the docker run command that starts a daemon/server tool as a service (None if it has none)"""
+    # Read from the YAML entry: validate() checks services without building the tool's commands
+    commands = tool.raw.get('commands')
+    if tool.type not in ('daemon', 'server') or not isinstance(commands, dict):
+        return None
+    return next((key for key in SERVICE_COMMANDS
+                 if key in commands and parse_docker_run(str(commands[key]).strip()) is not None), None)
+
+
+def service_spec(tool: 'Tool') -> Optional[ServiceSpec]:
+    """Build the supervisor's view of a daemon/server tool (None for other tools).
+
+    The service runs the first docker run among SERVICE_COMMANDS with
+    -d instead of -i/-t and no $args. The container keeps the command's
+    --name, or is named after the tool so its start/stop/logs aliases
+    find it. Without a `ready:` probe the tool's `port` (or first
+    published host port) is probed.
+    """
+    key = service_command(tool)
+    if key is None:
+        return None
+    command = tool.commands[key]
+    run, spec = command.parsed, command.run
+    options = [word for word in run.options
+               if word not in ('-i', '-t', '-it', '-ti', '--interactive', '--tty', '-d', '--detach')]
+    container = spec.names[0] if spec.names else tool.name
+    names = [] if spec.names else ['--name', container]
+    args = [word for word in run.args if word != '$args']
+    ready = tool.raw.get('ready') if isinstance(tool.raw.get('ready'), dict) else {}
+    published = next((int(port.host_port) for port in spec.ports if port.host_port.isdigit()), None)
+    port = ready.get('port', tool.raw.get('port', published))
+    depends_on = tool.raw.get('depends_on') or []
+    return ServiceSpec(
+        name=tool.name,
+        container=container,
+        command=' '.join(['docker', 'run', '-d'] + names + options + [run.image] + args),
+        depends_on=tuple(depends_on) if isinstance(depends_on, list) else (),
+        port=port if isinstance(port, int) else None,
+        http=ready.get('http'),
+        log=ready.get('log'),
+        timeout=float(ready.get('timeout', 60)),
+    )
+
+
+def service_order(depends_on: Dict[str, Iterable[str]], names: Iterable[str]) -> List[str]:
+    """The named services and everything they depend on, dependencies first.
+
+    `depends_on` maps every service to the services it depends on.
+    Raises ValueError for an unknown service or a dependency cycle.
+    """
+    order = []
+    state = {}
+
+    def visit(name: str, path: List[str]):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Circular service dependency: {' -> '.join(path[path.index(name):] + [name])}")
+        if name not in depends_on:
+            raise ValueError(f"Unknown service '{name}'" + (f" (a dependency of {path[-1]})" if path else ''))
+        state[name] = 'visiting'
+        for dependency in depends_on[name]:
+            visit(dependency, path + [name])
+        state[name] = 'done'
+        order.append(name)
+
+    for name in names:
+        visit(name, [])
+    return order
+
+
+class ImageRef(NamedTuple):
+    """An image reference split into repository, tag and digest (tag and digest may be empty)"""
+    repo: str
+    tag: str
+    digest: str
+
+    @property
+    def pinning(self) -> str:
+        """digest, pinned (a tag with a version number), floating (a named tag such as stable) or unpinned (none/latest)"""
+        if self.digest:
+            return 'digest'
+        if not self.tag or self.tag == 'latest':
+            return 'unpinned'
+        return 'pinned' if re.search(r'\d', self.tag) else 'floating'
+
+
+def parse_image(ref: str) -> ImageRef:
+    """Split name[:tag][@digest]; a registry port (localhost:5000/x) is not a tag"""
+    name, _, digest = ref.partition('@')
+    repo, _, tag = name.rpartition(':')
+    if not repo or '/' in tag:
+        repo, tag = name, ''
+    return ImageRef(repo, tag, digest)
+
+
+class ImagePlan(NamedTuple):
+    """What `generate.py images plan` found and proposes (see ToolboxGenerator.image_plan).
+
+    `bases` maps repository -> reference -> tools; `rewrites` maps image
+    references to their proposed replacement; `proposals` explains each
+    proposal, including ones that need a tag from --pin before they can
+    be applied; `baked` maps each base image to the dt-<tool> images
+    built on it.
+    """
+    bases: Dict[str, Dict[str, List[str]]]
+    rewrites: Dict[str, str]
+    proposals: List[str]
+    baked: Dict[str, List[str]]
+
+
+def rewrite_images(text: str, rewrites: Dict[str, str]) -> str:
+    """Replace image references in `image:` fields and docker run lines of a catalog file, keeping its formatting"""
+    if not rewrites:
+        return text
+    pattern = re.compile(r'(?<![\w./:@-])(' + '|'.join(map(re.escape, sorted(rewrites, key=len, reverse=True))) + r')(?![\w./:@-])')
+    lines = text.splitlines(keepends=True)
+    for i, line in enumerate(lines):
+        if line.lstrip().startswith('image:') or 'docker run ' in line:
+            lines[i] = pattern.sub(lambda match: rewrites[match.group(1)], line)
+    return ''.join(lines)
+
+
+class WarmSpec(NamedTuple):
+    """How to run a command in a long-lived container through docker exec"""
+    image: str
+    exec_flags: str
+    setup: str
+    options: List[str]
+    command: str
+
+
+def warm_spec(command: str) -> Optional[WarmSpec]:
+    """Work out how to serve a docker run command from a warm container.
+
+    The container is started with the command's options (minus --rm and
+    -i/-t, which move to docker exec) and kept alive; per-run setup
+    steps (see BAKE_STEPS) run once when it starts. `command` is the
+    bash words passed to the image's entrypoint (or run as the command
+    when it has none), with $args as "$@". Detached, named,
+    port-publishing and entrypoint-overriding commands are not warmable.
+    """
+    run = parse_docker_run(command)
+    if run is None:
+        return None
+    options = []
+    flags = set()
+    words = iter(run.options)
+    for word in words:
+        option = word.split('=', 1)[0]
+        if option in ('-d', '--detach', '-p', '--publish', '--name', '--entrypoint'):
+            return None
+        if word == '--rm':
+            continue
+        if word in ('-i', '--interactive', '-it', '-ti'):
+            flags.add('i')
+        if word in ('-t', '--tty', '-it', '-ti'):
+            flags.add('t')
+        if word in ('-i', '--interactive', '-t', '--tty', '-it', '-ti'):
+            continue
+        options.append(word)
+        if word in DOCKER_RUN_VALUE_OPTIONS:
+            options.append(next(words, ''))
+
+    exec_flags = ''.join(sorted(flags))
+    args = run.args
+    setup = ''
+    if len(args) == 3 and args[:2] == ['sh', '-c'] and len(args[2]) > 1 and args[2][0] == args[2][-1] == '"':
+        parts = args[2][1:-1].split(' && ')
+        steps = []
+        while len(parts) > 1 and parts[0].startswith(BAKE_STEPS):
+            steps.append(QUIET_REDIRECT.sub('', parts.pop(0)))
+        if steps:
+            setup = ' && '.join(steps)
+            rest = ' && '.join(parts)
+            if SHELL_SYNTAX.search(rest):
+                script = rest.replace('$args', '"$@"').replace("'", "'\\''")
+                return WarmSpec(run.image, exec_flags, setup, options, f"sh -c '{script}' sh \"$@\"")
+            args = rest.split()
+
+    return WarmSpec(run.image, exec_flags, setup, options, ' '.join(args).replace('$args', '"$@"'))
+
+
+# Search index: weight of a term by the field it appears in, and words not worth indexing
+SEARCH_WEIGHTS = {'name': 10, 'alias': 8, 'command': 3, 'description': 3, 'notes': 1, 'examples': 1}
+SEARCH_STOPWORDS = frozenset({'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+                              'of', 'on', 'or', 'the', 'this', 'to', 'with', 'you', 'your'})
+SEARCH_TOKEN = re.compile(r'[a-z0-9]+')
+SEARCH_ALPHABET = 'abcdefghijklmnopqrstuvwxyz0123456789'
+
+
+def search_terms(text: str) -> List[str]:
+    """Split text into lower-case search terms, dropping stopwords and single characters"""
+    return [term for term in SEARCH_TOKEN.findall(text.lower()) if len(term) > 1 and term not in SEARCH_STOPWORDS]
+
+
+def one_edit(term: str) -> Iterator[str]:
+    """Every string one insertion, deletion or substitution away from term"""
+    for i in range(len(term) + 1):
+        head, tail = term[:i], term[i:]
+        if tail:
+            yield head + tail[1:]
+        for c in SEARCH_ALPHABET:
+            yield head + c + tail
+            if tail and c != tail[0]:
+                yield head + c + tail[1:]
+
+
+class SearchHit(NamedTuple):
+    """A ranked search result"""
+    score: float
+    name: str
+    aliases: str
+    description: str
+
+
+class SearchIndex:
+    """Inverted index over the catalog, read from docker-toolbox-search.tsv.
+
+    The file has one row per tool (@id, name, aliases, description), in
+    id order, then one row per term (term, id:weight,...), sorted by
+    term. Nothing is parsed up front: `data` is the file's bytes (a
+    memory map when loaded from a file) and rows are found by bisecting
+    it, so only the rows a query touches are read. Each query term
+    matches index terms exactly, as a prefix, or (from 4 characters)
+    within one edit; a tool scores the best match per query term,
+    weighted by field and by how rare the term is.
+    """
+
+    EXACT, PREFIX, FUZZY = 1.0, 0.7, 0.5
+
+    def __init__(self, data: Any):
+        self.data = data.encode('utf-8') if isinstance(data, str) else data
+        size = len(self.data)
+        # Header comments, then tool rows, then term rows
+        self.tools_start = self._bisect(0, size, lambda field: field[:1] == b'#')
+        self.terms_start = self._bisect(self.tools_start, size, lambda field: field[:1] in (b'#', b'@'))
+        last = self.data.rfind(b'\n@', 0, self.terms_start)
+        last = last + 1 if last >= 0 else self.tools_start
+        self.count = int(self._row(last)[0][1:]) + 1 if self.terms_start > self.tools_start else 0
+
+    @classmethod
+    def load(cls, path: Path) -> 'SearchIndex':
+        """Map an index written by ToolboxGenerator.generate_search_index"""
+        import mmap
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b'')
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _row(self, start: int) -> Tuple[bytes, int, int]:
+        """The row starting at `start`: its first field, where the rest starts and where the row ends"""
+        data = self.data
+        end = data.find(b'\n', start)
+        if end < 0:
+            end = len(data)
+        tab = data.find(b'\t', start, end)
+        return (data[start:tab], tab + 1, end) if tab >= 0 else (data[start:end], end, end)
+
+    def _bisect(self, lo: int, hi: int, before: Callable[[bytes], bool]) -> int:
+        """The start of the first row in [lo, hi) whose first field is not `before` (rows are in that order)"""
+        data = self.data
+        while lo < hi:
+            start = data.rfind(b'\n', lo, (lo + hi) // 2) + 1 or lo
+            field, _, end = self._row(start)
+            if before(field):
+                lo = min(end + 1, hi)
+            else:
+                hi = start
+        return lo
+
+    def tool(self, doc: int) -> List[str]:
+        """A tool's name, aliases and description.
+
+        Tool ids run from 0 in row order, so an interpolation search finds
+        the row in a few probes however many tools there are.
+        """
+        data = self.data
+        lo, hi, lo_id, hi_id = self.tools_start, self.terms_start, 0, self.count
+        while lo < hi:
+            guess = lo + (hi - lo) * (doc - lo_id) // max(hi_id - lo_id, 1)
+            start = data.rfind(b'\n', lo, guess) + 1 or lo
+            field, rest, end = self._row(start)
+            row_id = int(field[1:])
+            if row_id == doc:
+                return data[rest:end].decode('utf-8').split('\t')
+            if row_id < doc:
+                lo, lo_id = end + 1, row_id + 1
+            else:
+                hi, hi_id = start, row_id
+        raise KeyError(doc)
+
+    def _term_rows(self, prefix: bytes, lo: int, hi: int) -> Tuple[int, int]:
+        """The span of term rows within [lo, hi) whose term starts with `prefix`"""
+        start = self._bisect(lo, hi, lambda field: field < prefix)
+        return start, self._bisect(start, hi, lambda field: field.startswith(prefix))
+
+    def _lookup(self, terms: List[bytes], lo: int, hi: int, found: Dict[bytes, bytes]):
+        """Add the postings of each of the sorted `terms` indexed within [lo, hi) to `found`.
+
+        The terms are bisected together: each row read splits both the
+        rows and the terms left to look for, so a batch of terms costs far
+        fewer reads than looking each one up.
+        """
+        if not terms or lo >= hi:
+            return
+        start = self.data.rfind(b'\n', lo, (lo + hi) // 2) + 1 or lo
+        field, rest, end = self._row(start)
+        i = bisect.bisect_left(terms, field)
+        j = i + 1 if i < len(terms) and terms[i] == field else i
+        if j > i:
+            found[field] = self.data[rest:end]
+        self._lookup(terms[:i], lo, start, found)
+        self._lookup(terms[j:], end + 1, hi, found)
+
+    def matches(self, query_term: str) -> Dict[str, Tuple[float, bytes]]:
+        """Index terms matching one query term, with their match factor and postings"""
+        found = {}
+        key = query_term.encode('utf-8')
+        start, stop = self._term_rows(key, self.terms_start, len(self.data))
+        while start < stop:
+            field, rest, end = self._row(start)
+            found[field.decode('utf-8')] = (self.EXACT if field == key else self.PREFIX, self.data[rest:end])
+            start = end + 1
+        if len(query_term) >= 4:
+            fuzzy: Dict[bytes, bytes] = {}
+            self._lookup(sorted({term.encode('utf-8') for term in one_edit(query_term)}), self.terms_start, len(self.data), fuzzy)
+            for term, postings in fuzzy.items():
+                found.setdefault(term.decode('utf-8'), (self.FUZZY, postings))
+        return found
+
+    def search(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """Rank tools against a free-text query, best first"""
+        scores: Dict[int, float] = {}
+        for query_term in dict.fromkeys(search_terms(query)):
+            best: Dict[int, float] = {}
+            for factor, postings in self.matches(query_term).values():
+                postings = postings.split(b',')
+                rarity = math.log(1 + self.count / len(postings))
+                for posting in postings:
+                    doc, _, weight = posting.partition(b':')
+                    score = factor * int(weight) * rarity
+                    if score > best.get(int(doc), 0):
+                        best[int(doc)] = score
+            for doc, score in best.items():
+                scores[doc] = scores.get(doc, 0) + score
+        # Ties are broken by name, so only tools scoring at least the limit-th best are read
+        cutoff = heapq.nlargest(limit, scores.values())[-1] if scores and limit > 0 else math.inf
+        tools = {doc: self.tool(doc) for doc, score in sorted(scores.items()) if score >= cutoff}
+        ranked = sorted(tools, key=lambda doc: (-scores[doc], tools[doc][0]))
+        return [SearchHit(round(scores[doc], 2), *tools[doc]) for doc in ranked[:limit]]
+
+
+def parse_yaml(text: str) -> Tuple[Any, Dict[str, List[Dict[str, int]]]]:
+    """Parse YAML with libyaml's CSafeLoader when available.
+
+    Returns the data and the 1-based source lines of every tool and
+    category entry (see _entry_lines), taken from the same parse.
+    """
+    import yaml  # deferred: only needed when the catalog snapshot is stale
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)(text)
+    try:
+        node = loader.get_single_node()
+        data = loader.construct_document(node) if node is not None else None
+    finally:
+        loader.dispose()
+
+    lines = {}
+    if isinstance(node, yaml.MappingNode):
+        for key, value in node.value:
+            if key.value in ('tools', 'categories') and isinstance(value, yaml.SequenceNode):
+                lines[key.value] = [_entry_lines(item) for item in value.value]
+    return data, lines
+
+
+def _entry_lines(node: Any) -> Dict[str, int]:
+    """Map a catalog entry's fields to 1-based line numbers.
+
+    '' is the entry itself, 'field' a top-level key, and 'field.N' /
+    'field.key' the items of a list or mapping field.
+    """
+    lines = {'': node.start_mark.line + 1}
+    if not isinstance(node.value, list):
+        return lines
+    for key, value in node.value:
+        if not isinstance(key.value, str):
+            continue
+        lines[key.value] = key.start_mark.line + 1
+        if isinstance(value.value, list):
+            for n, item in enumerate(value.value):
+                if isinstance(item, tuple):
+                    item_key, item = item
+                    lines[f'{key.value}.{item_key.value}'] = item_key.start_mark.line + 1
+                else:
+                    lines[f'{key.value}.{n}'] = item.start_mark.line + 1
+    return lines
+
+
+def load_catalog(tools_file: Path, cache_dir: Optional[Path] = None, categories: Optional[Iterable[str]] = None,
+                 jobs: Optional[int] = None) -> Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]]]:
+    """Load a catalog root (tools.yaml) and the files it includes.
+
+    A root may list other YAML files, as paths or globs relative to it,
+    under `include:`. Their categories and tools are appended after the
+    root's own, in include order, and the line numbers of their entries
+    carry a 'file' key naming the file they came from. Every file has
+    its own snapshot (see _read_snapshot); the included files that need
+    parsing are parsed in parallel on up to `jobs` processes (default:
+    one per CPU). With `categories`, an included file whose snapshot
+    shows it holds none of them is left out. Returns (data, source line
+    numbers) as produced by parse_yaml.
+    """
+    tools_file = Path(tools_file)
+    data, lines = _load_files([tools_file], cache_dir, jobs)[0]
+    patterns = data.get('include') if isinstance(data, dict) else None
+    if not patterns:
+        return data, lines
+
+    data = dict(data)
+    lines = {key: list(entries) for key, entries in lines.items()}
+    wanted = set(categories) if categories else None
+    includes = resolve_includes(tools_file, patterns)
+    for path, (part, part_lines) in zip(includes, _load_files(includes, cache_dir, jobs, wanted)):
+        if part is None:
+            continue  # none of the wanted categories
+        if not isinstance(part, dict):
+            raise ValueError(f"{path}: an included catalog file should be a mapping with 'tools' and/or 'categories'")
+        if 'include' in part:
+            raise ValueError(f"{path}: included catalog files cannot include other files")
+        name = path.relative_to(tools_file.parent).as_posix() if path.is_relative_to(tools_file.parent) else str(path)
+        for key in ('categories', 'tools'):
+            entries = part.get(key) or []
+            entry_lines = part_lines.get(key, [])
+            data[key] = list(data.get(key) or []) + list(entries)
+            lines[key] = lines.get(key, []) + [{**where, 'file': name} for where in entry_lines]
+    return data, lines
+
+
+def select_categories(data: Dict[str, Any], lines: Dict[str, List[Dict[str, int]]],
+                      categories: Iterable[str]) -> Tuple[Dict[str, Any], Dict[str, List[Dict[str, int]]]]:
+    """Narrow a loaded catalog to the given categories (--category).
+
+    Tools and categories outside them are dropped along with their line
+    records. Service groups and dependencies naming a dropped tool are
+    dropped too, since they cannot be checked without it.
+    """
+    wanted = set(categories)
+    tool_lines, category_lines = lines.get('tools', []), lines.get('categories', [])
+    tools, kept_lines = [], []
+    for i, tool in enumerate(data.get('tools') or []):
+        if isinstance(tool, dict) and tool.get('category') in wanted:
+            tools.append(tool)
+            kept_lines.append(tool_lines[i] if i < len(tool_lines) else {})
+    names = {tool.get('name') for tool in tools}
+    tools = [{**tool, 'depends_on': [name for name in tool['depends_on'] if name in names]}
+             if isinstance(tool.get('depends_on'), list) else tool for tool in tools]
+    cats = [(cat, category_lines[i] if i < len(category_lines) else {})
+            for i, cat in enumerate(data.get('categories') or []) if isinstance(cat, dict) and cat.get('id') in wanted]
+
+    data = {**data, 'tools': tools, 'categories': [cat for cat, _ in cats]}
+    lines = {**lines, 'tools': kept_lines, 'categories': [where for _, where in cats]}
+    services = data.get('services')
+    if isinstance(services, dict) and isinstance(services.get('groups'), dict):
+        groups = {group: [name for name in members if name in names] if isinstance(members, list) else members
+                  for group, members in services['groups'].items()}
+        data['services'] = {**services, 'groups': groups}
+    return data, lines
+
+
+def load_categories(tools_file: Path, cache_dir: Optional[Path],
+                    categories: Optional[List[str]]) -> Tuple[Dict[str, Any], Dict[str, List[Dict[str, int]]]]:
+    """load_catalog, narrowed to `categories` when given (ValueError for a category the catalog lacks)"""
+    data, lines = load_catalog(tools_file, cache_dir, categories)
+    if not categories:
+        return data, lines
+    known = {cat.get('id') for cat in data.get('categories') or [] if isinstance(cat, dict)}
+    unknown = [cat for cat in categories if cat not in known]
+    if unknown:
+        raise ValueError(f"unknown category {', '.join(map(repr, unknown))} (expected one of: {', '.join(sorted(map(str, known)))})")
+    return select_categories(data, lines, categories)
+
+
+def resolve_includes(tools_file: Path, patterns: Any) -> List[Path]:
+    """Expand a catalog root's `include:` paths and globs, in order and without duplicates"""
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    files = []
+    for pattern in patterns:
+        if any(c in str(pattern) for c in '*?['):
+            files.extend(sorted(tools_file.parent.glob(str(pattern))))
+        else:
+            files.append(tools_file.parent / str(pattern))
+    return list(dict.fromkeys(files))
+
+
+def catalog_files(tools_file: Path, data: Dict[str, Any]) -> List[Path]:
+    """The root catalog file plus every file it includes"""
+    patterns = data.get('include') if isinstance(data, dict) else None
+    return [Path(tools_file)] + (resolve_includes(Path(tools_file), patterns) if patterns else [])
+
+
+def _load_files(paths: List[Path], cache_dir: Optional[Path], jobs: Optional[int] = None,
+                wanted: Optional[set] = None) -> List[Tuple[Any, Dict[str, List[Dict[str, int]]]]]:
+    """Load catalog files from their snapshots, parsing the stale ones in parallel.
+
+    Returns (data, lines) per path, in order; with `wanted`, a file whose
+    current snapshot holds none of those categories comes back as
+    (None, {}) without its data being used.
+    """
+    results: List[Any] = [None] * len(paths)
+    pending = []
+    for i, path in enumerate(paths):
+        if cache_dir is None:
+            pending.append((i, None))
+            continue
+        parsed, record = _read_snapshot(path, Path(cache_dir))
+        if parsed is not None and wanted is not None and not parsed[2] & wanted:
+            results[i] = (None, {})
+        elif parsed is not None:
+            results[i] = parsed[:2]
+            if record is not None:
+                _write_snapshot(path, Path(cache_dir), record)
+        else:
+            pending.append((i, record))
+
+    texts = [record.pop('text') if record else paths[i].read_text(encoding='utf-8') for i, record in pending]
+    # A worker pool only pays for itself on a lot of YAML
+    workers = min(len(pending), jobs or os.cpu_count() or 1)
+    if workers > 1 and sum(map(len, texts)) >= PARALLEL_PARSE_CHARS:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed_all = list(pool.map(parse_yaml, texts))
+    else:
+        parsed_all = [parse_yaml(text) for text in texts]
+
+    for (i, record), (data, lines) in zip(pending, parsed_all):
+        results[i] = (data, lines)
+        if record is not None:
+            record.update(data=data, lines=lines, categories=_catalog_categories(data))
+            _write_snapshot(paths[i], Path(cache_dir), record)
+    return results
+
+
+def _catalog_categories(data: Any) -> set:
+    """Category ids a catalog file declares or files tools under"""
+    if not isinstance(data, dict):
+        return set()
+    ids = {cat.get('id') for cat in data.get('categories') or [] if isinstance(cat, dict)}
+    return ids | {tool.get('category') for tool in data.get('tools') or [] if isinstance(tool, dict)}
+
+
+def _snapshot_file(path: Path, cache_dir: Path) -> Path:
+    """Where a catalog file's snapshot lives, unique per resolved path"""
+    key = hashlib.sha256(str(path.resolve()).encode('utf-8')).hexdigest()[:8]
+    return cache_dir / f'catalog-{path.stem}-{key}.pickle'
+
+
+def _read_snapshot(path: Path, cache_dir: Path) -> Tuple[Optional[Tuple[Any, Dict[str, List[Dict[str, int]]], set]],
+                                                         Optional[Dict[str, Any]]]:
+    """Look a catalog file up in its pickled snapshot.
+
+    The snapshot is keyed on the file's size, mtime and SHA-256. A matching
+    size and mtime skips reading the file; otherwise a matching hash still
+    avoids parsing, and only a real content change needs a re-parse.
+    Returns ((data, lines, categories) or None, record): a record to pass
+    to _write_snapshot (once parsed, when there is no data yet), or None
+    when the snapshot is already current. A record without data carries
+    the file's text in 'text'.
+    """
+    stat = path.stat()
+    try:
+        with open(_snapshot_file(path, cache_dir), 'rb') as f:
+            snapshot = pickle.load(f)
+        if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('path') != str(path.resolve()):
+            snapshot = None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        snapshot = None
+
+    if snapshot and snapshot['size'] == stat.st_size and snapshot['mtime_ns'] == stat.st_mtime_ns:
+        return (snapshot['data'], snapshot['lines'], snapshot['categories']), None
+
+    raw = path.read_bytes()
+    record = {
+        'version': SNAPSHOT_VERSION,
+        'path': str(path.resolve()),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': hashlib.sha256(raw).hexdigest(),
+    }
+    if snapshot and snapshot['sha256'] == record['sha256']:
+        record.update(data=snapshot['data'], lines=snapshot['lines'], categories=snapshot['categories'])
+        return (snapshot['data'], snapshot['lines'], snapshot['categories']), record
+    record['text'] = raw.decode('utf-8')
+    return None, record
+
+
+def _write_snapshot(path: Path, cache_dir: Path, record: Dict[str, Any]):
+    """Save a catalog file's snapshot atomically"""
+    snapshot_file = _snapshot_file(path, cache_dir)
+    try:
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = snapshot_file.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump(record, f, pickle.HIGHEST_PROTOCOL)
+        tmp.replace(snapshot_file)
+    except OSError:
+        pass  # a read-only checkout still works, just without the snapshot
+
+
+def _lines(lines: List[str]) -> str:
+    """Render a block of output lines as newline-terminated text"""
+    if not lines:
+        return ''
+    return '\n'.join(lines) + '\n'
+
+
+def _join_fragments(parts: List[str]) -> str:
+    """Join newline-terminated fragments into a document without a trailing newline"""
+    return ''.join(parts)[:-1]
+
+
+def _drop_final_newline(chunks: Iterable[str]) -> Iterator[str]:
+    """Pass non-empty chunks through, dropping the document's final newline"""
+    pending = ''
+    for chunk in chunks:
+        if chunk:
+            if pending:
+                yield pending
+            pending = chunk
+    if pending:
+        yield pending[:-1]
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content to path only if its bytes differ; return True if written"""
+    return write_stream(path, [content])
+
+
+def write_stream(path: Path, chunks: Iterable[str]) -> bool:
+    """Stream chunks to path, rewriting it only if the bytes differ.
+
+    Chunks are compared against the existing file as they arrive, so an
+    unchanged output is never written at all. On the first difference the
+    matching prefix is copied from disk into a temporary file, the rest is
+    streamed after it, and the temporary file replaces the original. Only
+    one chunk is held in memory at a time. Returns True if written.
+    """
+    writer = StreamWriter(path)
+    try:
+        for chunk in chunks:
+            writer.write(chunk)
+    except BaseException:
+        writer.discard()
+        raise
+    return writer.close()
+
+
+class StreamWriter:
+    """Push-style write_stream: feed chunks to write(), then close() returns True if written.
+
+    Lets one traversal (see ToolboxGenerator.emit) write several files
+    at once, each compared against its existing contents as it goes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.tmp = self.path.with_name(f'.{self.path.name}.tmp')
+        try:
+            self.existing = open(self.path, 'rb')
+        except FileNotFoundError:
+            self.existing = None
+        self.matched = 0
+        self.out = None
+
+    def write(self, chunk: str):
+        """Compare a chunk with the existing file, switching to a rewrite on the first difference"""
+        data = chunk.encode('utf-8')
+        if self.out is None:
+            if self.existing is not None and self.existing.read(len(data)) == data:
+                self.matched += len(data)
+                return
+            self.out = _open_rewrite(self.tmp, self.existing, self.matched)
+        self.out.write(data)
+
+    def close(self) -> bool:
+        """Finish the file; returns True if it was rewritten"""
+        try:
+            if self.out is None:
+                if self.existing is not None and not self.existing.read(1):
+                    return False
+                self.out = _open_rewrite(self.tmp, self.existing, self.matched)
+            self.out.close()
+            if self.existing is not None:
+                self.existing.close()
+            self.tmp.replace(self.path)
+            return True
+        finally:
+            self.discard()
+
+    def discard(self):
+        """Abandon a partial rewrite, leaving the original file untouched"""
+        if self.out is not None and not self.out.closed:
+            self.out.close()
+            self.tmp.unlink(missing_ok=True)
+        if self.existing is not None:
+            self.existing.close()
+
+
+def _open_rewrite(tmp: Path, existing: Optional[Any], matched: int):
+    """Open tmp for writing, pre-filled with the first `matched` bytes of existing"""
+    out = open(tmp, 'wb', buffering=1 << 16)
+    if existing is not None and matched:
+        existing.seek(0)
+        remaining = matched
+        while remaining:
+            block = existing.read(min(1 << 16, remaining))
+            out.write(block)
+            remaining -= len(block)
+    return out
+
+
+def write_stdout(chunks: Iterable[str]):
+    """Stream chunks to stdout as they are produced"""
+    try:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+    except BrokenPipeError:
+        # Downstream consumer (e.g. `head`) closed the pipe early; silence
+        # the flush Python attempts at interpreter exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+
+class FragmentCache:
+    """On-disk cache of rendered per-tool output fragments.
+
+    Fragments are keyed by a hash of the tool entry, its category, its
+    resolved resource limits and the generator source, so editing either
+    the catalog or generate.py
+    invalidates exactly the affected fragments.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.path = cache_dir / 'fragments.pickle'
+        self.fingerprint = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+        self.hits = 0
+        self.misses = 0
+        self._used: Dict[str, Dict[str, str]] = {}
+        try:
+            with open(self.path, 'rb') as f:
+                stored = pickle.load(f)
+            self._store = stored['formats'] if stored.get('fingerprint') == self.fingerprint else {}
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError, AttributeError):
+            self._store = {}
+
+    def key(self, tool: Dict[str, Any], category: Optional[Dict[str, Any]], limits: Optional[Dict[str, Any]] = None) -> str:
+        """Content hash of a tool entry, its category and its resource limits"""
+        payload = json.dumps([tool, category, limits or {}], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def take_used(self, fmt: str) -> Dict[str, str]:
+        """Remove and return the fragments used for fmt since the last call"""
+        return self._used.pop(fmt, {})
+
+    def merge(self, fmt: str, used: Dict[str, str]):
+        """Record fragments rendered elsewhere (e.g. by a worker process) as used"""
+        self._used.setdefault(fmt, {}).update(used)
+
+    def fragment(self, fmt: str, key: str, render: Callable[[], str]) -> str:
+        """Return the cached fragment for key, rendering it on a miss"""
+        used = self._used.setdefault(fmt, {})
+        text = self._store.get(fmt, {}).get(key)
+        if text is None:
+            text = render()
+            self.misses += 1
+        else:
+            self.hits += 1
+        used[key] = text
+        return text
+
+    def save(self):
+        """Persist fragments used in this run, dropping stale ones per format"""
+        if not self._used:
+            return
+        formats = dict(self._store)
+        formats.update(self._used)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump({'fingerprint': self.fingerprint, 'formats': formats}, f, pickle.HIGHEST_PROTOCOL)
+        tmp.replace(self.path)
+        # Keep serving the saved fragments to later builds in this process (--watch)
+        self._store = formats
+        self._used = {}
+
+
+class Profiler:
+    """Per-phase wall time, CPU time and memory peak for --profile.
+
+    Phases are timed with `with profiler.phase(name):`; tool fragments are
+    timed individually through record_tool(), which ToolboxGenerator calls
+    for every fragment it renders in this process. A disabled profiler
+    turns every hook into a no-op.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases: List[Dict[str, Any]] = []
+        self.tools: Dict[Tuple[str, str], float] = {}
+        self.categories: Dict[Tuple[str, str], float] = {}
+        if enabled:
+            import tracemalloc
+            self._tracemalloc = tracemalloc
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def phase(self, name: str, exclude: Optional[str] = None):
+        """Time a phase of the run.
+
+        `exclude` names a timed() phase nested inside this one whose time is
+        subtracted, e.g. to separate file writes from the rendering that
+        feeds them.
+        """
+        if not self.enabled:
+            yield
+            return
+        self._tracemalloc.reset_peak()
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            _, peak = self._tracemalloc.get_traced_memory()
+            wall = time.perf_counter() - start_wall
+            cpu = time.process_time() - start_cpu
+            nested = [p for p in self.phases if p['phase'] == exclude]
+            if nested:
+                wall -= nested[-1]['wall_seconds']
+                cpu -= nested[-1]['cpu_seconds']
+            self.phases.append({'phase': name, 'wall_seconds': wall, 'cpu_seconds': cpu, 'peak_bytes': peak})
+
+    def timed(self, name: str, chunks: Iterable[str]) -> Iterator[str]:
+        """Pass chunks through, recording the time spent producing them as its own phase"""
+        if not self.enabled:
+            yield from chunks
+            return
+        wall = cpu = 0.0
+        iterator = iter(chunks)
+        while True:
+            start_wall, start_cpu = time.perf_counter(), time.process_time()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                wall += time.perf_counter() - start_wall
+                cpu += time.process_time() - start_cpu
+            yield chunk
+        self.phases.append({'phase': name, 'wall_seconds': wall, 'cpu_seconds': cpu, 'peak_bytes': None})
+
+    def record_tool(self, fmt: str, tool: 'Tool', seconds: float):
+        """Record the render time of one tool fragment"""
+        name = str(tool.name)
+        self.tools[(fmt, name)] = self.tools.get((fmt, name), 0.0) + seconds
+        category = str(tool.category)
+        self.categories[(fmt, category)] = self.categories.get((fmt, category), 0.0) + seconds
+
+    def to_json(self, slowest: int = 20) -> Dict[str, Any]:
+        """Machine-readable profile"""
+        tools = sorted(self.tools.items(), key=lambda item: item[1], reverse=True)[:slowest]
+        return {
+            'phases': self.phases,
+            'categories': [
+                {'format': fmt, 'category': category, 'seconds': seconds}
+                for (fmt, category), seconds in sorted(self.categories.items())
+            ],
+            'slowest_tools': [
+                {'format': fmt, 'tool': name, 'seconds': seconds}
+                for (fmt, name), seconds in tools
+            ],
+        }
+
+    def report(self, log: Callable[..., None] = print, slowest: int = 10):
+        """Print the profile as human-readable tables"""
+        log("\nProfile (wall / CPU / peak traced memory):")
+        log(f"  {'Phase':<40} {'Wall ms':>10} {'CPU ms':>10} {'Peak MiB':>10}")
+        for phase in self.phases:
+            peak = '-' if phase['peak_bytes'] is None else f"{phase['peak_bytes'] / 1048576:.2f}"
+            log(f"  {phase['phase']:<40} {phase['wall_seconds'] * 1000:>10.2f} {phase['cpu_seconds'] * 1000:>10.2f} {peak:>10}")
+
+        if self.categories:
+            log("\nRender time by category:")
+            for (fmt, category), seconds in sorted(self.categories.items()):
+                log(f"  {fmt:<12} {category:<28} {seconds * 1000:>10.2f} ms")
+
+        if self.tools:
+            log(f"\nSlowest {slowest} tools:")
+            for (fmt, name), seconds in sorted(self.tools.items(), key=lambda item: item[1], reverse=True)[:slowest]:
+                log(f"  {fmt:<12} {name:<28} {seconds * 1000:>10.3f} ms")
+
+
+class IndexBuilder:
+    """The search index, the TSV tool index and the JSON index records, built tool by tool.
+
+    ToolboxGenerator.traverse feeds it every tool of a full walk when
+    one of the formats walked needs them (see INDEXED_FORMATS), so the
+    dispatcher installer and --index get them without walking the
+    catalog again. `tsv` and `records` choose whether to keep the TSV
+    rows and JSON records; the search index is always built.
+    """
+
+    def __init__(self, gen: 'ToolboxGenerator', tsv: bool = False, records: bool = False):
+        self.gen = gen
+        self.count = 0
+        self.search_rows: List[str] = []
+        self.postings: Dict[str, List[str]] = {}
+        self.tsv: Optional[List[str]] = [] if tsv else None
+        self.records: Optional[List[Dict[str, Any]]] = [] if records else None
+
+    def add(self, tool: Tool):
+        """Index the next tool of the catalog"""
+        gen, doc = self.gen, self.count
+        self.count += 1
+        aliases = ','.join(entry.alias for entry in tool.aliases)
+        description = ' '.join(str(tool.description).split())
+        self.search_rows.append(f"@{doc}\t{tool.name}\t{aliases}\t{description}")
+        weights: Dict[str, int] = {}
+        for field, text in gen.search_fields(tool).items():
+            weight = SEARCH_WEIGHTS[field]
+            for term in set(search_terms(text)):
+                weights[term] = weights.get(term, 0) + weight
+        for term, weight in weights.items():
+            self.postings.setdefault(term, []).append(f"{doc}:{weight}")
+        if self.tsv is not None:
+            self.tsv.append(gen._fragment('index', tool, gen._index_tool))
+        if self.records is not None:
+            self.records.append(gen.tool_index(tool))
+
+    def search_index(self) -> str:
+        """The inverted search index read by SearchIndex and `dt search` (see generate_search_index)"""
+        output = [
+            '# Docker Toolbox search index (Generated from tools.yaml)',
+            '# @id\tname\taliases\tdescription, then term\tid:weight,... sorted by term',
+            f"# stopwords: {' '.join(sorted(SEARCH_STOPWORDS))}",
+        ]
+        output += self.search_rows
+        for term in sorted(self.postings):
+            output.append(f"{term}\t{','.join(self.postings[term])}")
+        return '\n'.join(output)
+
+    def index(self) -> str:
+        """The TSV tool index, as generate_index renders it"""
+        gen = self.gen
+        return ''.join(_drop_final_newline([_lines(gen._index_head()), *self.tsv, _lines(gen._index_tail())]))
+
+    def index_json(self) -> str:
+        """The JSON tool index (see generate_index_json)"""
+        return json.dumps({
+            'version': self.gen.data.get('version', '1.0'),
+            'categories': [{'id': cat_id, 'name': cat.get('name', '')} for cat_id, cat in self.gen.categories.items()],
+            'tools': self.records,
+        }, indent=2, ensure_ascii=False)
+
 
 class ToolboxGenerator:
-    def __init__(self, tools_file: str):
-        """Load and parse tools.yaml"""
-        with open(tools_file, 'r', encoding='utf-8') as f:
-            self.data = yaml.safe_load(f)
+    def __init__(self, tools_file: Optional[str], cache: Optional[FragmentCache] = None,
+                 data: Optional[Dict[str, Any]] = None, lines: Optional[Dict[str, List[Dict[str, int]]]] = None):
+        """Load and parse tools.yaml (or use already-parsed catalog data)"""
+        if data is None:
+            data, lines = load_catalog(Path(tools_file))
+        self.data = data
+        self.lines = lines or {}
+        self.source = Path(tools_file).name if tools_file else 'tools.yaml'
 
         self.tools = self.data.get('tools', [])
-        self.categories = {cat['id']: cat for cat in self.data.get('categories', [])}
+        self.categories = {cat.get('id'): cat for cat in self.data.get('categories', []) if isinstance(cat, dict)}
+        self.cache = cache
+        self.profiler: Optional[Profiler] = None
+        self._indexes: Optional[IndexBuilder] = None
+
+        # The tool model every renderer works from (malformed entries are left to validate())
+        resources = self.data.get('resources')
+        self.catalog = [Tool(tool, resources, self.tool_aliases) for tool in self.tools if isinstance(tool, dict)]
+        self._alias_index: Optional[Dict[str, AliasEntry]] = None
+
+    @property
+    def alias_index(self) -> Dict[str, AliasEntry]:
+        """Every alias of the catalog with the command it runs (built on first use)"""
+        if self._alias_index is None:
+            self._alias_index = self._build_alias_index()
+        return self._alias_index
+
+    def _build_alias_index(self) -> Dict[str, AliasEntry]:
+        """Resolve every alias to its command once, keyed by alias name.
+
+        An explicit `alias_commands: {alias: command-key}` mapping on a tool
+        overrides the suffix heuristic in _map_alias_to_command. Aliases
+        whose tool has no usable command are left out of the index.
+        """
+        index = {}
+        for tool in self.catalog:
+            for entry in self._resolve_aliases(tool):
+                index.setdefault(entry.alias, entry)
+        return index
+
+    def _resolve_aliases(self, tool: Tool) -> List[AliasEntry]:
+        """Resolve a tool's aliases to commands and render them per shell"""
+        commands = tool.commands
+        spec = tool.bake
+        entries = []
+        for alias in tool.alias_names or []:
+            if not isinstance(alias, str):
+                continue  # reported by validate()
+            cmd_key = tool.alias_commands.get(alias) or self._map_alias_to_command(alias, commands)
+            if cmd_key not in commands:
+                if 'default' not in commands:
+                    continue
+                cmd_key = 'default'
+            command = commands[cmd_key]
+            baked = spec.commands.get(cmd_key) if spec else None
+            if baked is None:
+                entries.append(AliasEntry(alias, tool.name, command.key, command.bash, command.text))
+                continue
+            bash_baked = baked.replace('$args', '"$@"')
+            bash = f"if docker image inspect {spec.image} >/dev/null 2>&1; then {bash_baked}; else {command.bash}; fi"
+            powershell = (f"docker image inspect {spec.image} *> $null; "
+                          f"if ($LASTEXITCODE -eq 0) {{ {baked} }} else {{ {command.text} }}")
+            entries.append(AliasEntry(alias, tool.name, command.key, bash, powershell, spec.image))
+        return entries
+
+    def tool_aliases(self, tool: Tool) -> List[AliasEntry]:
+        """Return a tool's resolved aliases from the index, in declaration order"""
+        entries = []
+        for alias in tool.alias_names or []:
+            entry = self.alias_index.get(alias) if isinstance(alias, str) else None
+            if entry is None:
+                continue
+            if entry.tool != tool.name:
+                # Alias claimed by another tool earlier in the catalog
+                return self._resolve_aliases(tool)
+            entries.append(entry)
+        return entries
+
+    def _category_runs(self, start: int = 0, stop: Optional[int] = None) -> List[Tuple[str, List[Dict[str, Any]], bool]]:
+        """Group self.catalog[start:stop] into contiguous same-category runs.
+
+        Each run is (category id, tools, starts_category). A run starts a
+        category unless it continues one from before `start`, so rendering
+        consecutive slices and concatenating them matches a single pass.
+        """
+        runs = []
+        previous = self.catalog[start - 1].category if start > 0 else None
+        for tool in self.catalog[start:stop]:
+            cat_id = tool.category
+            if runs and runs[-1][0] == cat_id:
+                runs[-1][1].append(tool)
+            else:
+                runs.append((cat_id, [tool], bool(runs) or cat_id != previous))
+        return runs
+
+    def chunk_ranges(self, chunks: int) -> List[Tuple[int, int]]:
+        """Split self.catalog into up to `chunks` index ranges, preferring category boundaries"""
+        total = len(self.catalog)
+        size = max(1, -(-total // max(1, chunks)))
+        ranges = []
+        start = 0
+        for i in range(1, total):
+            length = i - start
+            boundary = self.catalog[i].category != self.catalog[i - 1].category
+            if length >= size or (boundary and length >= size // 2 and len(ranges) < chunks - 1):
+                ranges.append((start, i))
+                start = i
+        if start < total:
+            ranges.append((start, total))
+        return ranges
+
+    def stream(self, fmt: str) -> Iterator[str]:
+        """Yield a complete document for one output format, chunk by chunk.
+
+        Chunks are the document head, each category header and tool
+        fragment, and the tail (see traverse); the document's final
+        newline is dropped to match the historical '\\n'.join output.
+        """
+        return _drop_final_newline(chunk for _, chunk in self.traverse([fmt]))
+
+    def emit(self, sinks: Dict[str, Callable[[str], None]]):
+        """Render several formats in a single traversal of the catalog (see traverse).
+
+        Each format's chunks reach sinks[fmt] in document order, exactly
+        as stream(fmt) would yield them.
+        """
+        pending = dict.fromkeys(sinks, '')
+        for fmt, chunk in self.traverse(list(sinks)):
+            if chunk:
+                if pending[fmt]:
+                    sinks[fmt](pending[fmt])
+                pending[fmt] = chunk
+        for fmt, chunk in pending.items():
+            if chunk:
+                sinks[fmt](chunk[:-1])
+
+    def traverse(self, formats: List[str], runs: Optional[List[Tuple[str, List[Tool], bool]]] = None) -> Iterator[Tuple[str, str]]:
+        """Walk the catalog once for one or more formats, yielding (format, chunk) pairs.
+
+        Every output is rendered by this one walk. The heads go first;
+        then, walking the category runs once, each category header and
+        each tool is handed to every format in turn, so each tool's model
+        is shared by all of them; the tails go last. Chunks are
+        newline-terminated. A full walk that renders one of
+        INDEXED_FORMATS also feeds every tool to an IndexBuilder, which the
+        tails and the other index outputs reuse (see indexes). Given
+        `runs` (a slice of _category_runs), only that part of the body is
+        rendered, for the parallel renderer.
+        """
+        renderers = [(fmt, getattr(self, f'_{fmt}_category'), getattr(self, f'_{fmt}_tool')) for fmt in formats]
+        whole = runs is None
+        indexes = None
+        if whole:
+            if INDEXED_FORMATS.intersection(formats):
+                indexes = self._indexes = IndexBuilder(self, tsv='bash_dispatcher' in formats, records='index' in formats)
+            for fmt in formats:
+                yield fmt, _lines(getattr(self, f'_{fmt}_head')())
+            runs = self._category_runs()
+        for cat_id, tools, starts_category in runs:
+            if starts_category:
+                for fmt, category, _ in renderers:
+                    yield fmt, _lines(category(cat_id))
+            for tool in tools:
+                if indexes is not None:
+                    indexes.add(tool)
+                for fmt, _, render in renderers:
+                    yield fmt, self._fragment(fmt, tool, render)
+        if whole:
+            for fmt in formats:
+                yield fmt, _lines(getattr(self, f'_{fmt}_tail')())
+
+    def indexes(self, tsv: bool = False, records: bool = False) -> IndexBuilder:
+        """The catalog's search and tool indexes, from the last full traversal when it built them.
+
+        Without one (or when it did not keep the TSV rows or JSON records
+        asked for) the catalog is walked for them here.
+        """
+        indexes = self._indexes
+        if (indexes is None or indexes.count != len(self.catalog) or (tsv and indexes.tsv is None)
+                or (records and indexes.records is None)):
+            indexes = self._indexes = IndexBuilder(self, tsv, records)
+            for tool in self.catalog:
+                indexes.add(tool)
+        return indexes
+
+    def _generate(self, fmt: str) -> str:
+        """Render a complete document for one output format"""
+        return ''.join(self.stream(fmt))
+
+    def render_body(self, fmt: str, runs: List[Tuple[str, List[Tool], bool]]) -> str:
+        """Render category headers and tool fragments for a slice of category runs"""
+        return ''.join(chunk for _, chunk in self.traverse([fmt], runs))
+
+    def _fragment(self, fmt: str, tool: Tool, render: Callable[[Tool], List[str]]) -> str:
+        """Render one tool's lines for a format, reusing the fragment cache when enabled"""
+        if self.profiler is not None:
+            start = time.perf_counter()
+        if self.cache is None:
+            text = _lines(render(tool))
+        else:
+            key = self.cache.key(tool.raw, self.categories.get(tool.category), tool.limits)
+            text = self.cache.fragment(fmt, key, lambda: _lines(render(tool)))
+        if self.profiler is not None:
+            self.profiler.record_tool(fmt, tool, time.perf_counter() - start)
+        return text
 
     def generate_markdown(self) -> str:
         """Generate docker-dev-tools.md documentation"""
+        return self._generate('markdown')
+
+    def iter_markdown(self) -> Iterator[str]:
+        """Stream docker-dev-tools.md chunk by chunk"""
+        return self.stream('markdown')
+
+    def _markdown_head(self) -> List[str]:
+        """Render the markdown title and table of contents"""
         output = []
 
         # Header
@@ -31,11 +1843,11 @@ class ToolboxGenerator:
         # Table of Contents
         output.append("## Table of Contents\n")
         category_tools = {}
-        for tool in self.tools:
-            cat_id = tool['category']
+        for tool in self.catalog:
+            cat_id = tool.category
             if cat_id not in category_tools:
                 category_tools[cat_id] = []
-            category_tools[cat_id].append(tool['name'])
+            category_tools[cat_id].append(tool.name)
 
         for cat_id, cat_info in self.categories.items():
             if cat_id in category_tools:
@@ -44,79 +1856,70 @@ class ToolboxGenerator:
 
         output.append("\n---\n")
 
-        # Tools by category
-        current_category = None
-        for tool in self.tools:
-            cat_id = tool['category']
+        return output
 
-            # Add category header if new category
-            if cat_id != current_category:
-                current_category = cat_id
-                cat_info = self.categories[cat_id]
-                output.append(f"\n## {cat_info['name']}\n")
+    def _markdown_category(self, cat_id: str) -> List[str]:
+        """Render a markdown category header"""
+        return [f"\n## {self.categories[cat_id]['name']}\n"]
 
-            # Tool header
-            output.append(f"\n### {tool['name'].capitalize()}")
-            output.append(f"{tool['description']}\n")
+    def _markdown_tail(self) -> List[str]:
+        """The markdown document ends with the last tool section"""
+        return []
 
-            # Commands
-            output.append("```bash")
-            commands = tool.get('commands', {})
+    def _markdown_tool(self, tool: Tool) -> List[str]:
+        """Render the markdown section for a single tool"""
+        output = []
 
-            if 'default' in commands:
-                output.append(f"# Basic usage")
-                output.append(commands['default'].strip())
+        # Tool header
+        output.append(f"\n### {tool.name.capitalize()}")
+        output.append(f"{tool.description}\n")
+
+        # Commands
+        output.append("```bash")
+        commands = tool.commands
+
+        if 'default' in commands:
+            output.append(f"# Basic usage")
+            output.append(commands['default'].text)
+            output.append("")
+
+        for cmd_name, command in commands.items():
+            if cmd_name != 'default':
+                output.append(f"# {cmd_name.capitalize()}")
+                output.append(command.text)
                 output.append("")
 
-            for cmd_name, cmd_value in commands.items():
-                if cmd_name != 'default':
-                    output.append(f"# {cmd_name.capitalize()}")
-                    output.append(cmd_value.strip())
-                    output.append("")
+        output.append("```\n")
 
-            output.append("```\n")
+        # Aliases
+        if tool.alias_names is not None and commands:
+            output.append("**Aliases:**")
+            output.append("```bash")
+            output.append("# Linux/macOS")
 
-            # Aliases
-            if 'aliases' in tool and commands:
-                output.append("**Aliases:**")
-                output.append("```bash")
-                output.append("# Linux/macOS")
-
-                # Generate Bash aliases
-                for alias in tool['aliases']:
-                    # Map alias to command
-                    cmd_key = self._map_alias_to_command(alias, commands)
-                    if cmd_key and cmd_key in commands:
-                        cmd = commands[cmd_key].strip().replace('$args', '"$@"')
-                        output.append(f"alias {alias}='{cmd}'")
-                    elif 'default' in commands:
-                        cmd = commands['default'].strip().replace('$args', '"$@"')
-                        output.append(f"alias {alias}='{cmd}'")
+            # Generate Bash aliases
+            entries = tool.aliases
+            for entry in entries:
+                output.append(entry.bash_definition)
 
-                output.append("")
-                output.append("# PowerShell")
+            output.append("")
+            output.append("# PowerShell")
 
-                # Generate PowerShell functions
-                for alias in tool['aliases']:
-                    cmd_key = self._map_alias_to_command(alias, commands)
-                    if cmd_key and cmd_key in commands:
-                        cmd = commands[cmd_key].strip()
-                        output.append(f"function {alias} {{ {cmd} }}")
-                    elif 'default' in commands:
-                        cmd = commands['default'].strip()
-                        output.append(f"function {alias} {{ {cmd} }}")
+            # Generate PowerShell functions
+            for entry in entries:
+                output.append(f"function {entry.alias} {{ {entry.powershell} }}")
 
-                output.append("```\n")
+            output.append("```\n")
 
-            # Notes
-            if 'notes' in tool:
-                output.append(f"**Note:** {tool['notes'].strip()}\n")
+        # Notes
+        if tool.notes is not None:
+            output.append(f"**Note:** {tool.notes}\n")
 
-            output.append("---\n")
+        output.append("---\n")
 
-        return '\n'.join(output)
+        return output
 
-    def _map_alias_to_command(self, alias: str, commands: Dict[str, str]) -> str:
+    def _map_alias_to_command(self, alias: str, commands: Dict[str, Any]) -> str:
         """Map an alias name to its corresponding command key"""
         # Remove 'dt' prefix
         name = alias.replace('dt', '', 1).lower()
@@ -126,7 +1929,7 @@ class ToolboxGenerator:
             return name
 
         # Check for common patterns
-        for pattern in ['start', 'stop', 'logs', 'cli', 'exec', 'run', 'serve', 'watch', 'check', 'write', 'build', 'new', 'simple', 'test', 'playbook', 'identify', 'mogrify']:
+        for pattern in ALIAS_SUFFIXES:
             if name.endswith(pattern) and pattern in commands:
                 return pattern
 
@@ -134,6 +1937,14 @@ class ToolboxGenerator:
 
     def generate_powershell_installer(self) -> str:
         """Generate install-interactive.ps1"""
+        return self._generate('powershell')
+
+    def iter_powershell_installer(self) -> Iterator[str]:
+        """Stream install-interactive.ps1 chunk by chunk"""
+        return self.stream('powershell')
+
+    def _powershell_head(self) -> List[str]:
+        """Render the installer header and the start of the $AllTools array"""
         output = []
 
         # Header
@@ -149,18 +1960,15 @@ class ToolboxGenerator:
         output.append("# Tool definitions (auto-generated from tools.yaml)")
         output.append("$AllTools = @(")
 
-        for tool in self.tools:
-            cat_name = self.categories[tool['category']]['name']
+        return output
 
-            # Main tool entry
-            output.append(f"    @{{ Category = '{cat_name}'; Name = '{tool['name']}'; Description = '{tool['description']}' }}")
-
-            # Add aliases as separate entries (for start/stop/logs commands)
-            for alias in tool.get('aliases', [])[1:]:  # Skip first alias (main command)
-                alias_name = alias.replace('dt', '')
-                desc = f"{tool['name'].capitalize()} - {alias_name}"
-                output.append(f"    @{{ Category = '{cat_name}'; Name = '{alias_name}'; Description = '{desc}' }}")
+    def _powershell_category(self, cat_id: str) -> List[str]:
+        """PowerShell entries carry their category inline, so no header is emitted"""
+        return []
 
+    def _powershell_tail(self) -> List[str]:
+        """Render the end of the $AllTools array and the installer logic"""
+        output = []
         output.append(")\n")
 
         # Rest of installer script (simplified)
@@ -181,16 +1989,54 @@ Write-Host "Installation script continues..."
 Write-Host "See full implementation in original install-interactive.ps1"
 """)
 
-        return '\n'.join(output)
+        return output
+
+    def _powershell_tool(self, tool: Tool) -> List[str]:
+        """Render the $AllTools entries for a single tool"""
+        output = []
+        cat_name = self.categories[tool.category]['name']
+
+        # Main tool entry
+        output.append(f"    @{{ Category = '{cat_name}'; Name = '{tool.name}'; Description = '{tool.description}' }}")
+
+        # Add aliases as separate entries (for start/stop/logs commands)
+        for alias in (tool.alias_names or [])[1:]:  # Skip first alias (main command)
+            alias_name = alias.replace('dt', '')
+            desc = f"{tool.name.capitalize()} - {alias_name}"
+            output.append(f"    @{{ Category = '{cat_name}'; Name = '{alias_name}'; Description = '{desc}' }}")
+
+        return output
 
     def generate_bash_installer(self) -> str:
         """Generate install.sh for Bash"""
+        return self._generate('bash')
+
+    def iter_bash_installer(self) -> Iterator[str]:
+        """Stream install.sh chunk by chunk"""
+        return self.stream('bash')
+
+    def _bash_head(self) -> List[str]:
+        """Render the installer preamble up to the start of the alias block"""
+        output = self._bash_preamble('Bash Installer', 'Adds Docker Toolbox aliases to ~/.bashrc or ~/.zshrc')
+
+        # Generate aliases
+        output.append('# Docker Toolbox aliases (auto-generated from tools.yaml)')
+        output.append('cat >> "$SHELL_CONFIG" << \'EOF\'')
+        output.append('')
+        output.append('# Docker Toolbox aliases')
+        output.append('# Generated by https://github.com/yourusername/docker-toolbox')
+        output.append('')
+
+        return output
+
+    def _bash_preamble(self, title: str, summary: str) -> List[str]:
+        """Render the shared installer header, colors, banner and shell config detection"""
         output = []
 
         # Header
         output.append("#!/usr/bin/env bash")
-        output.append("# Docker Toolbox - Bash Installer (Generated from tools.yaml)")
-        output.append("# Adds Docker Toolbox aliases to ~/.bashrc or ~/.zshrc\n")
+        output.append(f"# Docker Toolbox - {title} (Generated from tools.yaml)")
+        output.append(f"# {summary}\n")
 
         output.append('set -e\n')
 
@@ -203,7 +2049,7 @@ Write-Host "See full implementation in original install-interactive.ps1"
         output.append('NC="\\033[0m" # No Color\n')
 
         # Banner
-        output.append('echo -e "${BLUE}Docker Toolbox - Bash Installer${NC}"')
+        output.append(f'echo -e "${{BLUE}}Docker Toolbox - {title}${{NC}}"')
         output.append('echo -e "${BLUE}Generated from tools.yaml${NC}"')
         output.append('echo ""\n')
 
@@ -221,38 +2067,15 @@ Write-Host "See full implementation in original install-interactive.ps1"
         output.append('echo -e "${GREEN}[OK] Using config file: $SHELL_CONFIG${NC}"')
         output.append('echo ""\n')
 
-        # Generate aliases
-        output.append('# Docker Toolbox aliases (auto-generated from tools.yaml)')
-        output.append('cat >> "$SHELL_CONFIG" << \'EOF\'')
-        output.append('')
-        output.append('# Docker Toolbox aliases')
-        output.append('# Generated by https://github.com/yourusername/docker-toolbox')
-        output.append('')
+        return output
 
-        # Group tools by category
-        current_category = None
-        for tool in self.tools:
-            cat_id = tool['category']
-            commands = tool.get('commands', {})
-
-            if cat_id != current_category:
-                current_category = cat_id
-                cat_name = self.categories[cat_id]['name']
-                output.append(f'# {cat_name}')
-
-            # Generate aliases for this tool
-            for alias in tool.get('aliases', []):
-                cmd_key = self._map_alias_to_command(alias, commands)
-                if cmd_key and cmd_key in commands:
-                    cmd = commands[cmd_key].strip().replace('$args', '"$@"')
-                elif 'default' in commands:
-                    cmd = commands['default'].strip().replace('$args', '"$@"')
-                else:
-                    continue
-                output.append(f"alias {alias}='{cmd}'")
-
-            output.append('')
+    def _bash_category(self, cat_id: str) -> List[str]:
+        """Render a Bash category comment"""
+        return [f"# {self.categories[cat_id]['name']}"]
 
+    def _bash_tail(self) -> List[str]:
+        """Render the end of the alias block and closing messages"""
+        output = []
         output.append('# End Docker Toolbox aliases')
         output.append('EOF')
         output.append('')
@@ -263,10 +2086,618 @@ Write-Host "See full implementation in original install-interactive.ps1"
         output.append('echo "Or restart your terminal."')
         output.append('echo ""')
 
-        return '\n'.join(output)
+        return output
+
+    def _bash_tool(self, tool: Tool) -> List[str]:
+        """Render the alias lines for a single tool"""
+        output = []
+
+        # Generate aliases for this tool
+        for entry in tool.aliases:
+            output.append(entry.bash_definition)
+
+        output.append('')
+        return output
+
+    def dispatch_names(self, tool: Tool) -> List[Tuple[str, AliasEntry]]:
+        """Lookup table names for a tool: each alias without its 'dt' prefix, plus the tool name itself.
+
+        The tool name runs the tool's first alias. Names are matched in
+        catalog order, so the first tool to claim a name wins.
+        """
+        entries = tool.aliases
+        names = [(entry.alias[2:] if entry.alias.startswith('dt') else entry.alias, entry) for entry in entries]
+        if entries and tool.name not in dict(names):
+            names.append((tool.name, entries[0]))
+        return names
+
+    def generate_bash_dispatcher(self) -> str:
+        """Generate the Bash installer in dispatcher mode"""
+        return self._generate('bash_dispatcher')
+
+    def iter_bash_dispatcher(self) -> Iterator[str]:
+        """Stream the Bash dispatcher installer chunk by chunk"""
+        return self.stream('bash_dispatcher')
+
+    def _bash_dispatcher_head(self) -> List[str]:
+        """Render the installer preamble, the dt script and the start of the lookup table.
+
+        Instead of one alias per tool in ~/.bashrc, dispatcher mode installs
+        a single `dt` command to ~/.docker-toolbox that looks tools up in
+        commands.tsv when run, so shell startup does not grow with the catalog.
+        """
+        output = self._bash_preamble('Bash Dispatcher Installer',
+                                     'Installs a single `dt` command and its lookup table to ~/.docker-toolbox')
+
+        output.append('DT_HOME="$HOME/.docker-toolbox"')
+        output.append('mkdir -p "$DT_HOME"\n')
+
+        # Dispatcher script
+        output.append('# dt dispatcher: dt <tool> [args...]')
+        output.append('cat > "$DT_HOME/dt" << \'EOF\'')
+        output.append("""#!/usr/bin/env bash
+# Docker Toolbox dispatcher (Generated from tools.yaml)
+# Runs `dt <tool> [args...]` by looking the tool up in commands.tsv (name<TAB>tool<TAB>command)
+TABLE="${0%/*}/commands.tsv"
+
+case "$1" in
+    ''|-h|--help)
+        echo "Usage: dt <tool> [args...]"
+        echo "       dt --list"
+        echo "       dt search <words...>"
+        echo "       dt cache [prune [DAYS] | prune --all]"
+        exit 0
+        ;;
+    --list)
+        awk -F'\\t' '{ printf "  %-24s %s\\n", $1, $2 }' "$TABLE"
+        exit 0
+        ;;
+    search|--search)
+        # Ranked, typo-tolerant search over search.tsv, scored like `generate.py search`:
+        # exact, prefix or (4+ characters) one-edit term matches, weighted by field and rarity
+        shift
+        if [ $# -eq 0 ]; then
+            echo "Usage: dt search <words...>" >&2
+            exit 2
+        fi
+        awk -F'\\t' -v query="$*" '
+            function edit1(a, b,   la, lb, i, t) {
+                la = length(a); lb = length(b)
+                if (la > lb) { t = a; a = b; b = t; t = la; la = lb; lb = t }
+                if (lb - la > 1) return 0
+                for (i = 1; i <= la && substr(a, i, 1) == substr(b, i, 1); i++) ;
+                return la == lb ? substr(a, i + 1) == substr(b, i + 1) : substr(a, i) == substr(b, i + 1)
+            }
+            /^# stopwords: / { n = split(substr($0, 14), list, " "); for (i = 1; i <= n; i++) stop[list[i]] = 1; next }
+            /^#/ { next }
+            /^@/ { id = substr($1, 2); row[id] = $2 "\\t" $3 "\\t" $4; docs++; next }
+            !parsed {
+                n = split(tolower(query), raw, /[^a-z0-9]+/)
+                for (i = 1; i <= n; i++) if (length(raw[i]) > 1 && !(raw[i] in stop) && !(raw[i] in seen)) { seen[raw[i]] = 1; words[++nwords] = raw[i] }
+                parsed = 1
+            }
+            {
+                for (w = 1; w <= nwords; w++) {
+                    word = words[w]
+                    if ($1 == word) factor = 1
+                    else if (index($1, word) == 1) factor = 0.7
+                    else if (length(word) >= 4 && edit1(word, $1)) factor = 0.5
+                    else continue
+                    np = split($2, postings, ",")
+                    rarity = log(1 + docs / np)
+                    for (p = 1; p <= np; p++) {
+                        split(postings[p], posting, ":")
+                        score = factor * posting[2] * rarity
+                        if (score > best[w, posting[1]]) best[w, posting[1]] = score
+                    }
+                }
+            }
+            END {
+                for (key in best) { split(key, k, SUBSEP); total[k[2]] += best[key] }
+                for (id in total) printf "%.6f\\t%s\\n", total[id], row[id]
+            }' "${0%/*}/search.tsv" | sort -t "$(printf '\\t')" -k1,1gr -k2,2 | head -n "${DT_SEARCH_LIMIT:-10}" |
+            awk -F'\\t' '{ gsub(",", " ", $3); printf "  %-20s %-28s %s\\n", $2, $3, $4; found = 1 }
+                         END { if (!found) { print "No tools match"; exit 1 } }'
+        exit
+        ;;
+    cache|--cache)
+        # Package manager cache volumes (dt-cache-*): size report, or prune files unused for DAYS (default 30)
+        shift
+        DT_CACHE_COMMAND='dt cache' exec bash "${0%/*}/cache.sh" "$@"
+        ;;
+    --complete)
+        # Called by `complete -C`: $2 is the command, $3 the word being completed, $4 the word before it
+        [ "$4" = "$2" ] && awk -F'\\t' -v word="$3" 'index($1, word) == 1 { print $1 }' "$TABLE"
+        exit 0
+        ;;
+esac
+
+name=$1
+shift
+command=$(awk -F'\\t' -v name="$name" '$1 == name { print $3; exit }' "$TABLE")
+if [ -z "$command" ]; then
+    echo "dt: unknown tool '$name' (see: dt --list)" >&2
+    exit 127
+fi
+eval "$command"
+EOF
+chmod +x "$DT_HOME/dt"
+""")
+
+        # Package cache report/prune, shared with dt-manager.sh's dt-cache
+        output.append('# dt cache: package manager cache volumes')
+        output.append('cat > "$DT_HOME/cache.sh" << \'EOF\'')
+        output.append((Path(__file__).parent / CACHE_SCRIPT).read_text(encoding='utf-8').rstrip('\n'))
+        output.append('EOF\n')
+
+        # Lookup table
+        output.append('# Lookup table: name<TAB>tool<TAB>command (auto-generated from tools.yaml)')
+        output.append('cat > "$DT_HOME/commands.tsv" << \'EOF\'')
+
+        return output
+
+    def _bash_dispatcher_category(self, cat_id: str) -> List[str]:
+        """The lookup table has no category rows"""
+        return []
+
+    def _bash_dispatcher_tail(self) -> List[str]:
+        """Render the end of the lookup table, the search and tool indexes and the constant shell config lines"""
+        output = []
+        output.append('EOF\n')
+
+        # Both indexes come from the walk that rendered the lookup table (see traverse)
+        indexes = self.indexes(tsv=True)
+
+        # Search index for `dt search`
+        output.append('# Search index for dt search (auto-generated from tools.yaml)')
+        output.append('cat > "$DT_HOME/search.tsv" << \'EOF\'')
+        output.append(indexes.search_index())
+        output.append('EOF\n')
+
+        # Tool index for the dt-manager.sh commands (dt-list, dt-info, ...), found there by _dt_index
+        output.append('# Tool index for dt-manager.sh (auto-generated from tools.yaml)')
+        output.append('cat > "$DT_HOME/index.tsv" << \'EOF\'')
+        output.append(indexes.index())
+        output.append('EOF\n')
+
+        # Shell config: the same four lines however many tools there are
+        output.append('if ! grep -q "# Docker Toolbox dispatcher" "$SHELL_CONFIG" 2>/dev/null; then')
+        output.append('    cat >> "$SHELL_CONFIG" << \'EOF\'')
+        output.append('')
+        output.append('# Docker Toolbox dispatcher')
+        output.append('export PATH="$HOME/.docker-toolbox:$PATH"')
+        output.append('[ -n "$ZSH_VERSION" ] && autoload -Uz bashcompinit && bashcompinit')
+        output.append("complete -o default -C 'dt --complete' dt")
+        output.append('EOF')
+        output.append('fi\n')
+
+        output.append('echo -e "${GREEN}[OK] Installed dt to $DT_HOME${NC}"')
+        output.append('echo ""')
+        output.append('echo "To start using dt (e.g. dt rg TODO, dt search linter, dt --list), run:"')
+        output.append('echo -e "  ${YELLOW}source $SHELL_CONFIG${NC}"')
+        output.append('echo "Or restart your terminal."')
+        output.append('echo ""')
+
+        return output
+
+    def _bash_dispatcher_tool(self, tool: Tool) -> List[str]:
+        """Render the lookup table rows for a single tool"""
+        return [f"{name}\t{tool.name}\t{entry.bash}" for name, entry in self.dispatch_names(tool)]
+
+    def generate_powershell_dispatcher(self) -> str:
+        """Generate the PowerShell installer in dispatcher mode"""
+        return self._generate('powershell_dispatcher')
+
+    def iter_powershell_dispatcher(self) -> Iterator[str]:
+        """Stream the PowerShell dispatcher installer chunk by chunk"""
+        return self.stream('powershell_dispatcher')
+
+    def _powershell_dispatcher_head(self) -> List[str]:
+        """Render the installer header, the dt.ps1 script and the start of the lookup table"""
+        output = []
+
+        # Header
+        output.append("#Requires -Version 5.1")
+        output.append("<#")
+        output.append(".SYNOPSIS")
+        output.append("    Docker Toolbox - Dispatcher Installer (Generated from tools.yaml)")
+        output.append(".DESCRIPTION")
+        output.append("    Installs a single dt command and its lookup table to ~/.docker-toolbox")
+        output.append("#>\n")
+
+        output.append("$DtHome = Join-Path $HOME '.docker-toolbox'")
+        output.append("New-Item -ItemType Directory -Force -Path $DtHome | Out-Null\n")
+
+        # Dispatcher script
+        output.append("# dt dispatcher: dt <tool> [args...]")
+        output.append("Set-Content -Path (Join-Path $DtHome 'dt.ps1') -Encoding UTF8 -Value @'")
+        output.append("""# Docker Toolbox dispatcher (Generated from tools.yaml)
+# Runs `dt <tool> [args...]` by looking the tool up in commands.tsv (name<TAB>tool<TAB>command)
+$Table = Join-Path $PSScriptRoot 'commands.tsv'
+
+if (-not $args -or $args[0] -in '-h', '--help') {
+    Write-Host "Usage: dt <tool> [args...]"
+    Write-Host "       dt --list"
+    return
+}
+if ($args[0] -eq '--list') {
+    Get-Content $Table | ForEach-Object { $f = $_.Split("`t"); '  {0,-24} {1}' -f $f[0], $f[1] }
+    return
+}
+
+$Name = $args[0]
+$Rest = @($args | Select-Object -Skip 1)
+$Row = Get-Content $Table | Where-Object { $_.StartsWith("$Name`t") } | Select-Object -First 1
+if (-not $Row) {
+    Write-Error "dt: unknown tool '$Name' (see: dt --list)"
+    exit 127
+}
+& ([scriptblock]::Create($Row.Split("`t")[2])) @Rest
+'@
+""")
+
+        # Lookup table
+        output.append("# Lookup table: name<TAB>tool<TAB>command (auto-generated from tools.yaml)")
+        output.append("Set-Content -Path (Join-Path $DtHome 'commands.tsv') -Encoding UTF8 -Value @'")
+
+        return output
+
+    def _powershell_dispatcher_category(self, cat_id: str) -> List[str]:
+        """The lookup table has no category rows"""
+        return []
+
+    def _powershell_dispatcher_tail(self) -> List[str]:
+        """Render the end of the lookup table and the constant profile lines"""
+        output = []
+        output.append("'@\n")
+
+        # Profile: the same lines however many tools there are
+        output.append("""if (-not (Test-Path $PROFILE)) {
+    New-Item -ItemType File -Force -Path $PROFILE | Out-Null
+}
+if (-not (Select-String -Path $PROFILE -Pattern '# Docker Toolbox dispatcher' -SimpleMatch -Quiet)) {
+    Add-Content -Path $PROFILE -Value @'
+
+# Docker Toolbox dispatcher
+Set-Alias dt (Join-Path $HOME '.docker-toolbox\\dt.ps1')
+Register-ArgumentCompleter -Native -CommandName dt, dt.ps1 -ScriptBlock {
+    param($wordToComplete, $commandAst, $cursorPosition)
+    if ($commandAst.CommandElements.Count -gt 2 -or ($commandAst.CommandElements.Count -eq 2 -and -not $wordToComplete)) { return }
+    Get-Content (Join-Path $HOME '.docker-toolbox\\commands.tsv') | ForEach-Object { $_.Split("`t")[0] } | Where-Object { $_ -like "$wordToComplete*" }
+}
+'@
+}
+
+Write-Host "[OK] Installed dt to $DtHome" -ForegroundColor Green
+Write-Host "Restart PowerShell (or run: . $PROFILE), then try: dt rg TODO, dt --list"
+""")
+
+        return output
+
+    def _powershell_dispatcher_tool(self, tool: Tool) -> List[str]:
+        """Render the lookup table rows for a single tool"""
+        return [f"{name}\t{tool.name}\t{entry.powershell}" for name, entry in self.dispatch_names(tool)]
+
+    def tool_index(self, tool: Tool) -> Dict[str, Any]:
+        """A tool's index record: category, image, type, aliases and commands"""
+        return {
+            'name': tool.name,
+            'category': tool.category,
+            'type': tool.type,
+            'image': tool.image,
+            'description': tool.description,
+            'aliases': [entry.alias for entry in tool.aliases],
+            'alias_commands': {entry.alias: entry.command_key for entry in tool.aliases},
+            'commands': {key: command.text for key, command in tool.commands.items()},
+            'baked_image': tool.bake.image if tool.bake else None,
+        }
+
+    def generate_index_json(self) -> str:
+        """Generate the machine-readable tool index as JSON"""
+        return self.indexes(records=True).index_json()
+
+    def search_fields(self, tool: Tool) -> Dict[str, str]:
+        """The text of each searchable field of a tool"""
+        aliases = [entry.alias for entry in tool.aliases]
+        examples = tool.examples or []
+        return {
+            'name': tool.name,
+            'alias': ' '.join(aliases + [alias[2:] for alias in aliases if alias.startswith('dt')]),
+            'command': ' '.join(tool.commands),
+            'description': str(tool.description),
+            'notes': tool.notes or '',
+            'examples': ' '.join(f"{example.get('description', '')} {example.get('command', '')}" for example in examples),
+        }
+
+    def generate_search_index(self) -> str:
+        """Generate the inverted search index read by SearchIndex and `dt search`.
+
+        A term's weight for a tool is the sum of SEARCH_WEIGHTS for the
+        distinct fields it appears in, so a long note repeating a word
+        does not outrank the tool's name.
+        """
+        return self.indexes().search_index()
+
+    def generate_index(self) -> str:
+        """Generate the machine-readable tool index as TSV"""
+        return self._generate('index')
+
+    def iter_index(self) -> Iterator[str]:
+        """Stream the TSV tool index chunk by chunk"""
+        return self.stream('index')
+
+    def _index_head(self) -> List[str]:
+        """Render the TSV index header comment"""
+        return [
+            '# Docker Toolbox tool index (Generated from tools.yaml)',
+            '# name\tcategory\ttype\timage\taliases\tdescription\tcommand-key=command...',
+        ]
+
+    def _index_category(self, cat_id: str) -> List[str]:
+        """Index rows carry their category inline, so no header is emitted"""
+        return []
+
+    def _index_tail(self) -> List[str]:
+        """The TSV index has no footer"""
+        return []
+
+    def _index_tool(self, tool: Tool) -> List[str]:
+        """Render the TSV index row for a single tool (one column per command)"""
+        record = self.tool_index(tool)
+        columns = [record['name'], record['category'], record['type'], record['image'],
+                   ','.join(record['aliases']), record['description']]
+        columns += [f"{key}={cmd}" for key, cmd in record['commands'].items()]
+        return ['\t'.join(' '.join(str(column).split()) for column in columns)]
+
+    def generate_warm(self) -> str:
+        """Generate the dt-warm container pool script"""
+        return self._generate('warm')
+
+    def iter_warm(self) -> Iterator[str]:
+        """Stream the dt-warm script chunk by chunk"""
+        return self.stream('warm')
+
+    def _warm_head(self) -> List[str]:
+        """Render the dt-warm runtime, up to the start of its tool table.
+
+        dt-warm keeps one long-lived container per alias and set of run
+        options (so per working directory for ${PWD} mounts) and runs each
+        call through docker exec. Rows after the table marker are read by
+        the script itself: alias, tool, image, exec flags, setup, run
+        options and command, then the original command as a fallback.
+        """
+        return ["""#!/usr/bin/env bash
+# Docker Toolbox - warm container pool (Generated from tools.yaml)
+# Runs ephemeral tools through `docker exec` in long-lived containers
+# instead of creating and removing a container with `docker run --rm`.
+#
+# Usage: dt-warm <alias> [args...]   Run a tool in its warm container
+#        dt-warm --init              Print wrapper functions: eval "$(dt-warm --init)"
+#        dt-warm --status            List warm containers and when they were last used
+#        dt-warm --gc                Evict idle containers now
+#        dt-warm --stop              Remove every warm container
+#
+# Settings:
+#   DT_WARM_IDLE   Seconds a container may sit idle before eviction (default: 600)
+#   DT_WARM_MAX    Most warm containers at once; least recently used go first (default: 8)
+#   DT_WARM_STATE  State directory (default: $TMPDIR/dt-warm-$UID)
+#   DT_DOCKER      docker binary to use (default: docker)
+
+DOCKER="${DT_DOCKER:-docker}"
+IDLE="${DT_WARM_IDLE:-600}"
+MAX="${DT_WARM_MAX:-8}"
+STATE="${DT_WARM_STATE:-${TMPDIR:-/tmp}/dt-warm-$(id -u)}"
+LABEL=dev.docker-toolbox.warm
+SELF="${BASH_SOURCE[0]}"
+TABLE=": << '__WARM_TOOLS__'"
+
+mkdir -p "$STATE"
+
+# The fallback commands call `docker`; route them through $DOCKER too
+[ "$DOCKER" = docker ] || docker() { "$DOCKER" "$@"; }
+
+# Print the table row for an alias
+_dt_warm_row() {
+    awk -F'\\t' -v alias="$1" -v start="$TABLE" 'table && $1 == alias { print; exit } $0 == start { table = 1 }' "$SELF"
+}
+
+_dt_warm_mtime() {
+    stat -c %Y "$1" 2>/dev/null || stat -f %m "$1" 2>/dev/null || echo 0
+}
+
+# Remove containers idle for more than $IDLE seconds, then the least
+# recently used until there is room for $1 more; drop state for
+# containers that are gone (e.g. after a daemon restart) and remove
+# labelled containers that have no state
+_dt_warm_evict() {
+    local room=${1:-0} now name running count
+    now=$(date +%s)
+    running=" $("$DOCKER" ps --filter "label=$LABEL" --format '{{.Names}}' 2>/dev/null | tr '\\n' ' ') "
+    for name in $running; do
+        [ -f "$STATE/$name" ] || "$DOCKER" rm -f "$name" >/dev/null 2>&1
+    done
+    for name in $(ls "$STATE" | grep '^dt-warm-'); do
+        if [[ "$running" != *" $name "* ]]; then
+            rm -f "$STATE/$name"
+        elif (( now - $(_dt_warm_mtime "$STATE/$name") > IDLE )); then
+            "$DOCKER" rm -f "$name" >/dev/null 2>&1
+            rm -f "$STATE/$name"
+        fi
+    done
+    count=$(ls "$STATE" | grep -c '^dt-warm-')
+    if (( count + room > MAX )); then
+        for name in $(ls -tr "$STATE" | grep '^dt-warm-' | head -n $(( count + room - MAX ))); do
+            "$DOCKER" rm -f "$name" >/dev/null 2>&1
+            rm -f "$STATE/$name"
+        done
+    fi
+}
+
+# Background loop that evicts idle containers until none are left
+_dt_warm_reaper() {
+    local pidfile="$STATE/.reaper"
+    if [ -f "$pidfile" ] && kill -0 "$(cat "$pidfile")" 2>/dev/null; then
+        return
+    fi
+    (
+        while sleep $(( IDLE < 60 ? IDLE : 60 )); do
+            _dt_warm_evict
+            ls "$STATE" | grep -q '^dt-warm-' || break
+        done
+        rm -f "$pidfile"
+    ) </dev/null >/dev/null 2>&1 &
+    echo $! > "$pidfile"
+}
+
+# Start a warm container: _dt_warm_start <name> <alias> <image> <setup> [run options...]
+# The state file records the image's entrypoint and default command
+_dt_warm_start() {
+    local name=$1 alias=$2 image=$3 setup=$4
+    shift 4
+    _dt_warm_evict 1
+    "$DOCKER" rm -f "$name" >/dev/null 2>&1
+    "$DOCKER" run -d --name "$name" --label "$LABEL=$alias" "$@" --entrypoint tail "$image" -f /dev/null >/dev/null 2>&1 || return 1
+    if [ -n "$setup" ] && ! "$DOCKER" exec "$name" sh -c "$setup" >/dev/null 2>&1; then
+        "$DOCKER" rm -f "$name" >/dev/null 2>&1
+        return 1
+    fi
+    "$DOCKER" image inspect --format '{{join .Config.Entrypoint " "}}{{"\\n"}}{{join .Config.Cmd " "}}' "$image" > "$STATE/$name" 2>/dev/null
+    _dt_warm_reaper
+}
+
+case "$1" in
+    ''|-h|--help)
+        sed -n '2,/^$/s/^# \\{0,1\\}//p' "$SELF"
+        exit 0
+        ;;
+    --init)
+        dir=$(cd "$(dirname "$SELF")" && pwd)
+        awk -F'\\t' -v self="$dir/${SELF##*/}" -v start="$TABLE" '
+            $0 == "__WARM_TOOLS__" { exit }
+            table { printf "unalias %s 2>/dev/null; function %s { \\"%s\\" %s \\"$@\\"; }\\n", $1, $1, self, $1 }
+            $0 == start { table = 1 }' "$SELF"
+        exit 0
+        ;;
+    --status)
+        now=$(date +%s)
+        printf '%-48s %s\\n' "Container" "Idle"
+        for name in $(ls -t "$STATE" | grep '^dt-warm-'); do
+            printf '%-48s %ss\\n' "$name" $(( now - $(_dt_warm_mtime "$STATE/$name") ))
+        done
+        exit 0
+        ;;
+    --gc)
+        _dt_warm_evict
+        exit 0
+        ;;
+    --stop)
+        for name in $("$DOCKER" ps -a --filter "label=$LABEL" --format '{{.Names}}' 2>/dev/null); do
+            "$DOCKER" rm -f "$name" >/dev/null 2>&1
+        done
+        rm -f "$STATE"/dt-warm-* "$STATE"/.cold-*
+        exit 0
+        ;;
+esac
+
+alias=$1
+shift
+row=$(_dt_warm_row "$alias")
+if [ -z "$row" ]; then
+    echo "dt-warm: no warm mode for '$alias'" >&2
+    exit 127
+fi
+IFS=$'\\t' read -r _ tool image flags setup options command fallback <<< "$row"
+[ "$flags" = - ] && flags=
+[ "$setup" = - ] && setup=
+[ "$options" = - ] && options=
+[ "$command" = - ] && command=
+
+# Images that cannot be kept warm (no `tail`, failed setup) use the original command
+if [ -f "$STATE/.cold-$alias" ]; then
+    eval "$fallback"
+    exit
+fi
+
+eval "run_options=($options)"
+eval "args=($command)"
+args+=("$@")
+name="dt-warm-$alias-$(printf '%s\\n' "$image" "${run_options[@]}" | cksum | cut -d' ' -f1)"
+
+if [ ! -f "$STATE/$name" ] && ! _dt_warm_start "$name" "$alias" "$image" "$setup" "${run_options[@]}"; then
+    touch "$STATE/.cold-$alias"
+    eval "$fallback"
+    exit
+fi
+touch "$STATE/$name"
+
+# Entrypoint + arguments, or the default command when there are none
+{ read -r entrypoint; read -r default; } < "$STATE/$name"
+read -r -a entrypoint <<< "$entrypoint"
+read -r -a default <<< "$default"
+[ ${#args[@]} -eq 0 ] && args=("${default[@]}")
+
+exec_flags=()
+[[ "$flags" == *i* ]] && exec_flags+=(-i)
+[[ "$flags" == *t* ]] && [ -t 0 ] && [ -t 1 ] && exec_flags+=(-t)
+exec "$DOCKER" exec "${exec_flags[@]}" "$name" "${entrypoint[@]}" "${args[@]}"
+
+# Tool table: alias, tool, image, exec flags, setup, run options, command, original command with "$@"
+: << '__WARM_TOOLS__'"""]
+
+    def _warm_category(self, cat_id: str) -> List[str]:
+        """The tool table has no category rows"""
+        return []
+
+    def _warm_tail(self) -> List[str]:
+        """Render the end of the tool table"""
+        return ['__WARM_TOOLS__']
+
+    def _warm_tool(self, tool: Tool) -> List[str]:
+        """Render the table rows for a tool's warmable aliases (ephemeral tools only)"""
+        if tool.type != 'ephemeral' or tool.warm is False:
+            return []
+        rows = []
+        for entry in tool.aliases:
+            spec = warm_spec(tool.commands[entry.command_key].text)
+            if spec is None:
+                continue
+            # Baked commands pass "$@" themselves; an alias gets the arguments appended
+            fallback = entry.bash if entry.baked else f'{entry.bash} "$@"'
+            fields = [entry.alias, tool.name, spec.image, spec.exec_flags, spec.setup,
+                      ' '.join(spec.options), spec.command, fallback]
+            rows.append('\t'.join(field or '-' for field in fields))
+        return rows
 
     def generate_typst(self) -> str:
         """Generate beautiful Typst documentation"""
+        return self._generate('typst')
+
+    def iter_typst(self) -> Iterator[str]:
+        """Stream the Typst document chunk by chunk"""
+        return self.stream('typst')
+
+    def typst_chapters(self) -> List[Tuple[str, str]]:
+        """Split the tools reference into one Typst chapter per category run.
+
+        Returns (file name, content) pairs in document order. A category
+        that appears in several runs gets a file per run (<id>.typ,
+        <id>-2.typ, ...), so names stay stable as other categories change.
+        """
+        chapters = []
+        runs_seen: Dict[str, int] = {}
+        for cat_id, tools, _ in self._category_runs():
+            runs_seen[cat_id] = runs_seen.get(cat_id, 0) + 1
+            name = f'{cat_id}.typ' if runs_seen[cat_id] == 1 else f'{cat_id}-{runs_seen[cat_id]}.typ'
+            chapters.append((name, self.render_body('typst', [(cat_id, tools, True)])))
+        return chapters
+
+    def generate_typst_root(self, chapters: List[str]) -> str:
+        """Render the root Typst document, including each chapter file in order"""
+        includes = [f'#include "chapters/{name}"' for name in chapters]
+        return _join_fragments([_lines(self._typst_head()), _lines(includes), _lines(self._typst_tail())])
+
+    def _typst_head(self) -> List[str]:
+        """Render the Typst preamble, title page and overview chapters"""
         output = []
 
         # Document header with metadata
@@ -324,7 +2755,7 @@ Write-Host "See full implementation in original install-interactive.ps1"
         output.append('  #text(size: 18pt)[Complete Reference Guide]')
         output.append('  #v(1cm)')
         output.append('  #text(size: 14pt)[')
-        output.append(f'    {len(self.tools)} Development Tools via Docker')
+        output.append(f'    {len(self.catalog)} Development Tools via Docker')
         output.append('  ]')
         output.append('  #v(0.5cm)')
         output.append('  #text(size: 12pt, style: "italic")[')
@@ -369,8 +2800,8 @@ Write-Host "See full implementation in original install-interactive.ps1"
 
         # Count tools per category
         category_counts = {}
-        for tool in self.tools:
-            cat_id = tool['category']
+        for tool in self.catalog:
+            cat_id = tool.category
             category_counts[cat_id] = category_counts.get(cat_id, 0) + 1
 
         output.append('#table(')
@@ -393,85 +2824,21 @@ Write-Host "See full implementation in original install-interactive.ps1"
         output.append('= Tools Reference')
         output.append('')
 
-        current_category = None
-        for tool in self.tools:
-            cat_id = tool['category']
-            commands = tool.get('commands', {})
+        return output
 
-            # Add category header if new category
-            if cat_id != current_category:
-                current_category = cat_id
-                cat_info = self.categories[cat_id]
-                if current_category != self.tools[0]['category']:
-                    output.append('#pagebreak()')
-                    output.append('')
-                output.append(f"== {cat_info['name']}")
-                output.append('')
-
-            # Tool header
-            tool_name = tool['name'].title()
-            output.append(f"=== {tool_name}")
-            output.append('')
-            output.append(f"_{tool['description']}_")
-            output.append('')
-
-            # Docker image info
-            output.append(f"*Docker Image:* `{tool['image']}`")
+    def _typst_category(self, cat_id: str) -> List[str]:
+        """Render a Typst category heading, breaking the page between categories"""
+        output = []
+        if cat_id != self.catalog[0].category:
+            output.append('#pagebreak()')
             output.append('')
+        output.append(f"== {self.categories[cat_id]['name']}")
+        output.append('')
+        return output
 
-            # Commands section
-            if commands:
-                output.append('*Usage:*')
-                output.append('')
-
-                # Default command
-                if 'default' in commands:
-                    output.append('```bash')
-                    output.append('# Basic usage')
-                    output.append(commands['default'].strip())
-                    output.append('```')
-                    output.append('')
-
-                # Additional commands
-                other_cmds = {k: v for k, v in commands.items() if k != 'default'}
-                if other_cmds:
-                    for cmd_name, cmd_value in other_cmds.items():
-                        output.append('```bash')
-                        output.append(f'# {cmd_name.capitalize()}')
-                        output.append(cmd_value.strip())
-                        output.append('```')
-                        output.append('')
-
-            # Aliases section
-            if 'aliases' in tool and tool['aliases']:
-                output.append('*Aliases:*')
-                output.append('')
-                output.append('Bash/Zsh: ' + ', '.join(f'`{a}`' for a in tool['aliases'][:3]))
-                output.append('')
-
-            # Notes section
-            if 'notes' in tool:
-                output.append('#block(')
-                output.append('  fill: rgb("#fffacd"),')
-                output.append('  inset: 8pt,')
-                output.append('  radius: 4pt,')
-                output.append(')[')
-                output.append('  *Note:* ' + tool['notes'].strip().replace('\n', ' '))
-                output.append(']')
-                output.append('')
-
-            # Examples section
-            if 'examples' in tool:
-                output.append('*Examples:*')
-                output.append('')
-                for example in tool['examples']:
-                    output.append(f"- _{example['description']}_")
-                    output.append('  ```bash')
-                    output.append('  ' + example['command'])
-                    output.append('  ```')
-                output.append('')
-
-            output.append('')
+    def _typst_tail(self) -> List[str]:
+        """Render the appendix"""
+        output = []
 
         # Appendix
         output.append('#pagebreak()')
@@ -502,31 +2869,1164 @@ Write-Host "See full implementation in original install-interactive.ps1"
         output.append('MIT License - Free to use, modify, and distribute.')
         output.append('')
 
-        return '\n'.join(output)
+        return output
+
+    def _typst_tool(self, tool: Tool) -> List[str]:
+        """Render the Typst reference section for a single tool"""
+        output = []
+        commands = tool.commands
+
+        # Tool header
+        tool_name = tool.name.title()
+        output.append(f"=== {tool_name}")
+        output.append('')
+        output.append(f"_{tool.description}_")
+        output.append('')
+
+        # Docker image info
+        output.append(f"*Docker Image:* `{tool.image}`")
+        output.append('')
+
+        # Commands section
+        if commands:
+            output.append('*Usage:*')
+            output.append('')
+
+            # Default command
+            if 'default' in commands:
+                output.append('```bash')
+                output.append('# Basic usage')
+                output.append(commands['default'].text)
+                output.append('```')
+                output.append('')
+
+            # Additional commands
+            other_cmds = {k: v for k, v in commands.items() if k != 'default'}
+            if other_cmds:
+                for cmd_name, command in other_cmds.items():
+                    output.append('```bash')
+                    output.append(f'# {cmd_name.capitalize()}')
+                    output.append(command.text)
+                    output.append('```')
+                    output.append('')
+
+        # Aliases section
+        if tool.alias_names:
+            output.append('*Aliases:*')
+            output.append('')
+            output.append('Bash/Zsh: ' + ', '.join(f'`{a}`' for a in tool.alias_names[:3]))
+            output.append('')
+
+        # Notes section
+        if tool.notes is not None:
+            output.append('#block(')
+            output.append('  fill: rgb("#fffacd"),')
+            output.append('  inset: 8pt,')
+            output.append('  radius: 4pt,')
+            output.append(')[')
+            output.append('  *Note:* ' + tool.notes.replace('\n', ' '))
+            output.append(']')
+            output.append('')
+
+        # Examples section
+        if tool.examples is not None:
+            output.append('*Examples:*')
+            output.append('')
+            for example in tool.examples:
+                output.append(f"- _{example['description']}_")
+                output.append('  ```bash')
+                output.append('  ' + example['command'])
+                output.append('  ```')
+            output.append('')
+
+        output.append('')
+
+        return output
+
+    def bake_specs(self) -> List[BakeSpec]:
+        """Every tool with commands that can run on a pre-baked image"""
+        return [tool.bake for tool in self.catalog if tool.bake is not None]
+
+    def image_usage(self) -> Dict[str, List[str]]:
+        """Every image reference the catalog uses (tool images and docker run images) -> tool names"""
+        usage = {}
+        for tool in self.catalog:
+            refs = [tool.image] + [command.run.image for command in tool.commands.values() if command.run is not None]
+            for ref in dict.fromkeys(ref for ref in refs if ref):
+                usage.setdefault(ref, []).append(tool.name)
+        return usage
 
-    def validate(self) -> List[str]:
-        """Validate tools.yaml structure"""
+    def image_plan(self, pins: Optional[Dict[str, str]] = None, digests: Optional[Dict[str, str]] = None) -> ImagePlan:
+        """Group the catalog's images by repository and propose consolidations.
+
+        References of one repository used by several tools under different
+        tags are moved to the most used pinned tag. Unpinned (no tag or
+        latest) and floating references are moved to the tag given in
+        `pins` ({repository: tag}) or, failing that, pinned to the digest
+        of the locally pulled image in `digests` ({reference: digest});
+        without either the proposal is listed but not applied.
+        """
+        pins = pins or {}
+        digests = digests or {}
+        bases: Dict[str, Dict[str, List[str]]] = {}
+        for ref, tools in self.image_usage().items():
+            bases.setdefault(parse_image(ref).repo, {})[ref] = tools
+
+        rewrites = {}
+        proposals = []
+        unpinned = []
+        for repo, refs in bases.items():
+            tools = list(dict.fromkeys(tool for users in refs.values() for tool in users))
+            if repo in pins:
+                target = f"{repo}:{pins[repo]}"
+                moved = [ref for ref in refs if ref != target and parse_image(ref).pinning != 'digest']
+                rewrites.update(dict.fromkeys(moved, target))
+                if moved:
+                    proposals.append(f"Pin {', '.join(moved)} to {target} ({len(tools)} tool(s): {', '.join(tools)})")
+                continue
+            pinned = sorted((ref for ref in refs if parse_image(ref).pinning in ('pinned', 'digest')),
+                            key=lambda ref: -len(refs[ref]))
+            if len(tools) > 1 and len(refs) > 1 and pinned:
+                moved = [ref for ref in refs if ref != pinned[0]]
+                rewrites.update(dict.fromkeys(moved, pinned[0]))
+                proposals.append(f"Share {pinned[0]} instead of {', '.join(moved)} ({', '.join(tools)})")
+                continue
+            for ref, users in refs.items():
+                image = parse_image(ref)
+                if image.pinning not in ('unpinned', 'floating'):
+                    continue
+                if ref in digests:
+                    rewrites[ref] = f"{ref}@{digests[ref]}"
+                    proposals.append(f"Pin {ref} to the pulled digest {digests[ref]} ({', '.join(users)})")
+                else:
+                    unpinned.append(ref)
+        if unpinned:
+            proposals.append(f"{len(unpinned)} reference(s) have no version or use a moving tag ({', '.join(unpinned)}); "
+                             f"pin them with --pin REPO=TAG, or to the pulled digests with --engine")
+
+        baked: Dict[str, List[str]] = {}
+        for spec in self.bake_specs():
+            baked.setdefault(spec.base, []).append(spec.image)
+        for base, images in baked.items():
+            if len(images) > 1 and parse_image(rewrites.get(base, base)).pinning in ('unpinned', 'floating'):
+                proposals.append(f"{len(images)} baked images build on {base} ({', '.join(images)}); "
+                                 f"pinning it keeps their shared base layer from drifting between builds")
+        return ImagePlan(bases, rewrites, proposals, baked)
+
+    def generate_bake(self) -> Dict[str, str]:
+        """Render the Dockerfiles and build plan for the pre-baked images.
+
+        Tools on the same base image become stages of one multi-stage
+        Dockerfile.<base>, so the base is pulled once; build.sh builds
+        each stage as its dt-<tool> image. Returns {file name: content}.
+        """
+        by_base: Dict[str, List[BakeSpec]] = {}
+        for spec in self.bake_specs():
+            by_base.setdefault(spec.base, []).append(spec)
+
+        files = {}
+        plan = []
+        for base, specs in by_base.items():
+            dockerfile = 'Dockerfile.' + re.sub(r'[^A-Za-z0-9_.-]+', '-', base)
+            output = []
+            output.append(f"# Docker Toolbox - pre-baked images on {base} (Generated from tools.yaml)")
+            output.append("# Build with: sh build.sh [tool...]")
+            for spec in specs:
+                output.append('')
+                output.append(f"FROM {base} AS {spec.image}")
+                output.append(f'LABEL dev.docker-toolbox.tool="{spec.tool}"')
+                for step in spec.steps:
+                    output.append(f"RUN {step}")
+                plan.append(f'if want {spec.tool}; then echo "Building {spec.image}..."; '
+                            f'docker build -q -f {dockerfile} --target {spec.image} -t {spec.image} .; fi')
+            files[dockerfile] = _lines(output)
+
+        output = []
+        output.append("#!/bin/sh")
+        output.append("# Docker Toolbox - build plan for pre-baked images (Generated from tools.yaml)")
+        output.append("# Usage: sh build.sh [tool...]   (no arguments builds every image)\n")
+        output.append('set -e')
+        output.append('cd "$(dirname "$0")"\n')
+        output.append('SELECTED="$*"')
+        output.append('want() {')
+        output.append('    [ -z "$SELECTED" ] && return 0')
+        output.append('    case " $SELECTED " in *" $1 "*) return 0 ;; esac')
+        output.append('    return 1')
+        output.append('}\n')
+        output.extend(plan)
+        files['build.sh'] = _lines(output)
+        return files
+
+    def claims(self) -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+        """Index the host ports, container names and named volumes every command uses.
+
+        Returns {kind: {key: {tool name: [command keys]}}} for the kinds
+        'port', 'name' and 'volume', built in one pass over the catalog
+        from the cached run_spec of each command. Ports are keyed by host
+        port and protocol whatever address they bind; ports Docker picks
+        itself and ones set from variables are left out, as are the
+        package cache volumes every tool shares on purpose.
+        """
+        index = {'port': {}, 'name': {}, 'volume': {}}
+        for tool in self.catalog:
+            for key, command in tool.commands.items():
+                run = command.run
+                if run is None:
+                    continue
+                claimed = [('name', name) for name in run.names]
+                claimed += [('volume', volume.source) for volume in run.volumes
+                            if volume.named and volume.source not in PACKAGE_CACHE_VOLUMES]
+                for port in run.ports:
+                    if port.host_port and '$' not in port.host_port:
+                        claimed += [('port', f"{host_port}/{port.protocol}") for host_port in _port_range(port.host_port)]
+                for kind, value in claimed:
+                    keys = index[kind].setdefault(value, {}).setdefault(tool.name, [])
+                    if key not in keys:
+                        keys.append(key)
+        return index
+
+    def conflicts(self) -> List[Conflict]:
+        """Host ports, container names and named volumes claimed by more than one tool.
+
+        Commands of the same tool are alternatives to each other, so only
+        claims by different tools conflict.
+        """
+        return [Conflict(kind, key, list(users.items()))
+                for kind, keys in self.claims().items()
+                for key, users in keys.items() if len(users) > 1]
+
+    def services(self, names: Optional[set] = None) -> Dict[str, ServiceSpec]:
+        """The daemon and server tools the supervisor can run, by tool name (only those in `names` if given)"""
+        tools = self.catalog if names is None else [tool for tool in self.catalog if tool.name in names]
+        return {spec.name: spec for spec in map(service_spec, tools) if spec is not None}
+
+    def service_groups(self) -> Dict[str, List[str]]:
+        """Named groups of services from the `services.groups` section"""
+        section = self.data.get('services')
+        groups = section.get('groups') if isinstance(section, dict) else None
+        return {str(name): list(members) for name, members in groups.items() if isinstance(members, list)} \
+            if isinstance(groups, dict) else {}
+
+    def validate(self, strict: bool = False) -> List[str]:
+        """Validate tools.yaml structure.
+
+        A single pass over the catalog checks each entry and, through hash
+        indexes of names and aliases seen so far, cross-tool problems:
+        duplicate tool names, aliases claimed by two tools and alias
+        mappings to unknown command keys. Errors are prefixed with
+        `<file>:<line>:` (tools.yaml or the included file) when the source
+        line is known. With `strict`, host port, container name and named
+        volume conflicts between tools (see conflicts) are errors too,
+        reported against every tool after the first to claim them.
+        """
         errors = []
+        tool_lines = self.lines.get('tools', [])
+        category_lines = self.lines.get('categories', [])
+
+        def report(where: Dict[str, Any], field: str, message: str):
+            line = where.get(field) or where.get(field.split('.')[0]) or where.get('')
+            errors.append(f"{where.get('file', self.source)}:{line}: {message}" if line else message)
+
+        def place(where: Dict[str, Any], field: str) -> str:
+            # 'line N' within the root file, 'file:N' for an included one. The indexes below
+            # only keep entry positions (no per-entry objects for the garbage collector to
+            # track) and a location is only formatted for an error message.
+            return f"{where['file']}:{where.get(field)}" if 'file' in where else f"line {where.get(field)}"
+
+        def tool_where(name: Any) -> Dict[str, Any]:
+            i = names.get(name)
+            return tool_lines[i] if i is not None and i < len(tool_lines) else {}
+
+        category_ids = {}
+        for i, cat in enumerate(self.data.get('categories', [])):
+            where = category_lines[i] if i < len(category_lines) else {}
+            cat_id = cat.get('id') if isinstance(cat, dict) else None
+            if cat_id is None:
+                report(where, '', f"Category {i}: Missing required field 'id'")
+            elif cat_id in category_ids:
+                first = category_ids[cat_id]
+                first_where = category_lines[first] if first < len(category_lines) else {}
+                report(where, 'id', f"Category {cat_id}: Duplicate category id (first defined on {place(first_where, 'id')})")
+            else:
+                category_ids[cat_id] = i
+
+        # Check the resources section: named profiles and per-type defaults
+        resources = self.data.get('resources')
+        profiles = {}
+        if resources is not None and not isinstance(resources, dict):
+            errors.append("resources: should be a mapping with 'profiles' and/or 'defaults'")
+        elif resources is not None:
+            profiles = resources.get('profiles') or {}
+            if not isinstance(profiles, dict):
+                errors.append("resources.profiles: should be a mapping of profile names to limits")
+                profiles = {}
+            for profile, limits in profiles.items():
+                if not isinstance(limits, dict) or 'profile' in limits:
+                    errors.append(f"resources.profiles.{profile}: should be a mapping of limits")
+                    continue
+                errors.extend(f"resources.profiles.{profile}: {message}" for message in resource_errors(limits, profiles))
+            defaults = resources.get('defaults') or {}
+            if not isinstance(defaults, dict):
+                errors.append("resources.defaults: should be a mapping of tool types to profiles or limits")
+                defaults = {}
+            for tool_type, spec in defaults.items():
+                if tool_type not in TOOL_TYPES:
+                    errors.append(f"resources.defaults: Unknown tool type '{tool_type}' (expected one of: {', '.join(TOOL_TYPES)})")
+                errors.extend(f"resources.defaults.{tool_type}: {message}" for message in resource_errors(spec, profiles))
 
+        required = ('name', 'category', 'description', 'image')
+        names = {}
+        aliases = {}
         for i, tool in enumerate(self.tools):
+            where = tool_lines[i] if i < len(tool_lines) else {}
+            if not isinstance(tool, dict):
+                report(where, '', f"Tool {i}: Expected a mapping, got {type(tool).__name__}")
+                continue
+            name = tool.get('name', i)
+            label = f"Tool {name}"
+
             # Check required fields
-            required = ['name', 'category', 'description', 'image']
             for field in required:
                 if field not in tool:
-                    errors.append(f"Tool {i}: Missing required field '{field}'")
+                    report(where, '', f"Tool {i}: Missing required field '{field}'")
+
+            # Check tool names are unique
+            if name in names:
+                report(where, 'name', f"{label}: Duplicate tool name (first defined on {place(tool_where(name), 'name')})")
+            elif 'name' in tool:
+                names[name] = i
 
             # Check category exists
             if tool.get('category') not in self.categories:
-                errors.append(f"Tool {tool.get('name', i)}: Invalid category '{tool.get('category')}'")
+                report(where, 'category', f"{label}: Invalid category '{tool.get('category')}'")
+
+            commands = tool.get('commands') or {}
+            if not isinstance(commands, dict):
+                report(where, 'commands', f"{label}: 'commands' should be a mapping of command names to commands")
+                commands = {}
+
+            # Check aliases format and ownership
+            tool_aliases = tool.get('aliases') or []
+            if not isinstance(tool_aliases, list):
+                report(where, 'aliases', f"{label}: 'aliases' should be a list")
+                tool_aliases = []
+            for n, alias in enumerate(tool_aliases):
+                field = f'aliases.{n}'
+                if not isinstance(alias, str):
+                    report(where, field, f"{label}: Alias {alias!r} should be a string")
+                    continue
+                if not alias.startswith('dt'):
+                    report(where, field, f"{label}: Alias '{alias}' should start with 'dt'")
+                owner = aliases.get(alias)
+                if owner is None:
+                    aliases[alias] = i
+                elif owner != i:
+                    owner_tool = self.tools[owner]
+                    owner_where = tool_lines[owner] if owner < len(tool_lines) else {}
+                    owner_field = f"aliases.{owner_tool['aliases'].index(alias)}"
+                    report(where, field, f"{label}: Alias '{alias}' is already used by tool "
+                                         f"'{owner_tool.get('name', owner)}' ({place(owner_where, owner_field)})")
+                else:
+                    report(where, field, f"{label}: Alias '{alias}' is listed twice")
+
+            # Check explicit alias mappings point at real aliases and commands
+            alias_commands = tool.get('alias_commands') or {}
+            if not isinstance(alias_commands, dict):
+                report(where, 'alias_commands', f"{label}: 'alias_commands' should be a mapping of alias to command key")
+                alias_commands = {}
+            declared = set(tool_aliases)
+            for alias, cmd_key in alias_commands.items():
+                field = f'alias_commands.{alias}'
+                if alias not in declared:
+                    report(where, field, f"{label}: alias_commands maps unknown alias '{alias}'")
+                if cmd_key not in commands:
+                    report(where, field, f"{label}: Alias '{alias}' maps to unknown command '{cmd_key}'")
+
+            # Check per-tool resource limits
+            if 'resources' in tool:
+                for message in resource_errors(tool['resources'], profiles):
+                    report(where, 'resources', f"{label}: {message}")
+
+            # Check service dependencies and the readiness probe
+            depends_on = tool.get('depends_on')
+            if depends_on is not None and not (isinstance(depends_on, list) and all(isinstance(d, str) for d in depends_on)):
+                report(where, 'depends_on', f"{label}: 'depends_on' should be a list of tool names")
+            ready = tool.get('ready')
+            if ready is not None and not isinstance(ready, dict):
+                report(where, 'ready', f"{label}: 'ready' should be a mapping of {', '.join(READY_FIELDS)}")
+            for field, value in (ready.items() if isinstance(ready, dict) else []):
+                field_name = f'ready.{field}'
+                if field not in READY_FIELDS:
+                    report(where, field_name, f"{label}: Unknown readiness probe '{field}' (expected one of: {', '.join(READY_FIELDS)})")
+                elif field == 'port' and not (isinstance(value, int) and not isinstance(value, bool) and 0 < value < 65536):
+                    report(where, field_name, f"{label}: ready.port should be a port number")
+                elif field == 'http' and not (isinstance(value, str) and value.startswith('/')):
+                    report(where, field_name, f"{label}: ready.http should be a path starting with '/'")
+                elif field == 'log' and not (isinstance(value, str) and value):
+                    report(where, field_name, f"{label}: ready.log should be the text of a log line")
+                elif field == 'timeout' and not (isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0):
+                    report(where, field_name, f"{label}: ready.timeout should be a positive number of seconds")
+
+            # Check the pre-baked image, warm container and package cache opt-outs
+            for field in ('bake', 'warm', 'package_cache'):
+                if field in tool and not isinstance(tool[field], bool):
+                    report(where, field, f"{label}: '{field}' should be true or false")
+
+        # Check the services section and that dependencies name runnable services, without cycles.
+        # Only tools in a group, with dependencies or a probe (and what they depend on) are looked
+        # at, and only their names and raw fields: the supervisor's specs are left to `services`.
+        involved = {member for members in self.service_groups().values() for member in members if isinstance(member, str)}
+        for tool in self.catalog:
+            depends_on = tool.raw.get('depends_on')
+            if depends_on or tool.raw.get('ready'):
+                involved.add(tool.name)
+            if isinstance(depends_on, list):
+                involved.update(d for d in depends_on if isinstance(d, str))
+        services = {tool.name: tool.raw.get('depends_on') for tool in self.catalog
+                    if tool.name in involved and service_command(tool) is not None}
+        section = self.data.get('services')
+        if section is not None and not isinstance(section, dict):
+            errors.append("services: should be a mapping with 'groups' and/or 'idle_minutes'")
+        elif section is not None:
+            groups = section.get('groups') or {}
+            if not isinstance(groups, dict):
+                errors.append("services.groups: should be a mapping of group names to lists of tools")
+                groups = {}
+            for group, members in groups.items():
+                if not isinstance(members, list):
+                    errors.append(f"services.groups.{group}: should be a list of tools")
+                    continue
+                for member in members:
+                    if member not in services:
+                        errors.append(f"services.groups.{group}: '{member}' is not a daemon or server tool with a docker run command")
+            idle = section.get('idle_minutes')
+            if idle is not None and not (isinstance(idle, (int, float)) and not isinstance(idle, bool) and idle > 0):
+                errors.append("services.idle_minutes: should be a positive number of minutes")
+        known = {}
+        for name, depends_on in services.items():
+            depends_on = depends_on if isinstance(depends_on, list) else []
+            for dependency in depends_on:
+                if dependency not in services:
+                    report(tool_where(name), 'depends_on',
+                           f"Tool {name}: depends on '{dependency}', which is not a daemon or server tool")
+            known[name] = [d for d in depends_on if d in services]
+        try:
+            service_order(known, known)
+        except ValueError as e:
+            errors.append(str(e))
 
-            # Check aliases format
-            if 'aliases' in tool:
-                for alias in tool['aliases']:
-                    if not alias.startswith('dt'):
-                        errors.append(f"Tool {tool['name']}: Alias '{alias}' should start with 'dt'")
+        if strict:
+            for conflict in self.conflicts():
+                for name, keys in conflict.users[1:]:
+                    report(tool_where(name), 'commands', f"Tool {name}: {conflict.message}")
 
         return errors
 
+# Per-process generator for --jobs workers, loaded once by _init_worker
+_worker_gen: Optional[ToolboxGenerator] = None
+
+
+def _init_worker(data: Dict[str, Any], cache_dir: Optional[str]):
+    """Set up the parsed catalog once in each worker process"""
+    global _worker_gen
+    cache = FragmentCache(Path(cache_dir)) if cache_dir else None
+    _worker_gen = ToolboxGenerator(None, cache=cache, data=data)
+
+
+def _render_task(fmt: str, part: str, start: int = 0, stop: int = 0) -> Tuple[str, Dict[str, str]]:
+    """Render one piece of a document in a worker; returns (text, fragments used)"""
+    gen = _worker_gen
+    if part == 'body':
+        text = gen.render_body(fmt, gen._category_runs(start, stop))
+    else:
+        text = _lines(getattr(gen, f'_{fmt}_{part}')())
+    used = gen.cache.take_used(fmt) if gen.cache is not None else {}
+    return text, used
+
+
+def render_parallel(gen: ToolboxGenerator, formats: List[str], jobs: int) -> Dict[str, str]:
+    """Render several output formats on a process pool.
+
+    Every format is split into a head, body chunks and a tail; the pieces are
+    rendered on different workers and joined in order, so the result is
+    byte-identical to calling the generate_* methods serially.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    cache_dir = str(gen.cache.path.parent) if gen.cache is not None else None
+    ranges = gen.chunk_ranges(jobs)
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(gen.data, cache_dir)) as pool:
+        pending = {}
+        for fmt in formats:
+            futures = [pool.submit(_render_task, fmt, 'head')]
+            futures += [pool.submit(_render_task, fmt, 'body', start, stop) for start, stop in ranges]
+            futures.append(pool.submit(_render_task, fmt, 'tail'))
+            pending[fmt] = futures
+
+        for fmt, futures in pending.items():
+            parts = []
+            for future in futures:
+                text, used = future.result()
+                parts.append(text)
+                if gen.cache is not None:
+                    gen.cache.merge(fmt, used)
+            results[fmt] = _join_fragments(parts)
+    return results
+
+
+def write_typst(gen: ToolboxGenerator, docgen_dir: Path, log: Callable[..., None] = print) -> bool:
+    """Write the root Typst document and one chapter file per category run.
+
+    Each file is only rewritten when its content changes, and chapter
+    files for categories no longer in the catalog are removed. Returns
+    True if anything on disk changed.
+    """
+    chapter_dir = docgen_dir / 'chapters'
+    chapter_dir.mkdir(parents=True, exist_ok=True)
+    chapters = gen.typst_chapters()
+    names = {name for name, _ in chapters}
+
+    rewritten = [name for name, content in chapters if write_if_changed(chapter_dir / name, content)]
+    removed = [stale for stale in chapter_dir.glob('*.typ') if stale.name not in names]
+    for stale in removed:
+        stale.unlink()
+    log(f"[OK] Chapters: {len(rewritten)} of {len(chapters)} rewritten{f', {len(removed)} removed' if removed else ''} in {chapter_dir}")
+
+    root = docgen_dir / 'docker-toolbox.typ'
+    written = write_if_changed(root, gen.generate_typst_root([name for name, _ in chapters]))
+    report_write(root, written, log)
+    return bool(rewritten or removed or written)
+
+
+def pdf_is_stale(docgen_dir: Path, pdf_file: Path) -> bool:
+    """Whether the PDF is missing or older than any Typst source (e.g. after a failed compile)"""
+    try:
+        built = pdf_file.stat().st_mtime_ns
+    except OSError:
+        return True
+    return any(source.stat().st_mtime_ns > built for source in docgen_dir.rglob('*.typ'))
+
+
+class PdfCompile(NamedTuple):
+    """A typst compile running in the background"""
+    process: Any
+    typ_file: Path
+    pdf_file: Path
+
+
+def start_pdf_compile(typ_file: Path, pdf_file: Path, log: Callable[..., None] = print) -> Optional[PdfCompile]:
+    """Start compiling the Typst source to PDF in the background (None if Typst is missing)"""
+    import subprocess
+    log("Compiling Typst to PDF in the background...")
+    try:
+        process = subprocess.Popen(['typst', 'compile', str(typ_file), str(pdf_file)],
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    except FileNotFoundError:
+        log(f"[INFO] Typst source created at {typ_file}")
+        log("       Install Typst to compile to PDF: https://github.com/typst/typst")
+        log("       Or use Docker: docker run --rm -v ${PWD}:/work ghcr.io/typst/typst compile /work/docgen/docker-toolbox.typ /work/docker-toolbox.pdf")
+        return None
+    return PdfCompile(process, typ_file, pdf_file)
+
+
+def finish_pdf_compile(job: PdfCompile, timeout: float, log: Callable[..., None] = print):
+    """Wait for a background typst compile and report the result"""
+    import subprocess
+    typ_file, pdf_file = job.typ_file, job.pdf_file
+    try:
+        job.process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        job.process.kill()
+        job.process.communicate()
+        log(f"[INFO] Typst source created at {typ_file}")
+        log(f"       Could not compile to PDF: typst compile timed out after {timeout:g}s (see --typst-timeout)")
+        return
+    if job.process.returncode == 0:
+        log(f"[OK] Generated: {pdf_file}")
+        log("    To view: open docker-toolbox.pdf")
+    else:
+        log(f"[INFO] Typst source created at {typ_file}")
+        log("       Run 'typst compile docgen/docker-toolbox.typ docker-toolbox.pdf' to generate PDF")
+
+
+def compile_pdf(typ_file: Path, pdf_file: Path, log: Callable[..., None] = print, timeout: float = 30):
+    """Try to compile the Typst source to PDF if Typst is available"""
+    try:
+        import subprocess
+        log("Compiling Typst to PDF...")
+        result = subprocess.run(
+            ['typst', 'compile', str(typ_file), str(pdf_file)],
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+        if result.returncode == 0:
+            log(f"[OK] Generated: {pdf_file}")
+            log("    To view: open docker-toolbox.pdf")
+        else:
+            log(f"[INFO] Typst source created at {typ_file}")
+            log("       Run 'typst compile docgen/docker-toolbox.typ docker-toolbox.pdf' to generate PDF")
+    except FileNotFoundError:
+        log(f"[INFO] Typst source created at {typ_file}")
+        log("       Install Typst to compile to PDF: https://github.com/typst/typst")
+        log("       Or use Docker: docker run --rm -v ${PWD}:/work ghcr.io/typst/typst compile /work/docgen/docker-toolbox.typ /work/docker-toolbox.pdf")
+    except Exception as e:
+        log(f"[INFO] Typst source created at {typ_file}")
+        log(f"       Could not compile to PDF: {e}")
+
+
+def report_write(path: Path, written: bool, log: Callable[..., None] = print):
+    """Print the outcome of a write_if_changed call"""
+    if written:
+        log(f"[OK] Generated: {path}")
+    else:
+        log(f"[OK] Unchanged: {path}")
+
+def load_generator(no_cache: bool = False, categories: Optional[List[str]] = None) -> Optional[ToolboxGenerator]:
+    """Load tools.yaml next to this script for a subcommand (None if missing).
+
+    With `categories`, included catalog files known to hold none of them
+    are skipped (see load_catalog).
+    """
+    tools_file = Path(__file__).parent / 'tools.yaml'
+    if not tools_file.exists():
+        print(f"Error: {tools_file} not found", file=sys.stderr)
+        return None
+    cache_dir = None if no_cache else tools_file.parent / CACHE_DIR
+    try:
+        data, lines = load_catalog(tools_file, cache_dir, categories)
+    except (OSError, ValueError) as e:
+        print(f"Error: could not load the catalog: {e}", file=sys.stderr)
+        return None
+    return ToolboxGenerator(str(tools_file), data=data, lines=lines)
+
+
+def select_tools(gen: ToolboxGenerator, categories: Optional[List[str]] = None,
+                 types: Optional[List[str]] = None) -> List[Tool]:
+    """Tools matching any of the given categories and types (all when unset)"""
+    return [
+        tool for tool in gen.catalog
+        if (not categories or tool.category in categories)
+        and (not types or tool.type in types)
+    ]
+
+
+class PullResult(NamedTuple):
+    """Outcome of pulling one image"""
+    image: str
+    ok: bool
+    attempts: int
+    seconds: float
+    error: str
+
+
+def pull_image(image: str, retries: int, backoff: float) -> PullResult:
+    """docker pull one image, retrying failures with exponential backoff"""
+    import subprocess
+    start = time.perf_counter()
+    error = ''
+    for attempt in range(1, retries + 2):
+        try:
+            result = subprocess.run(['docker', 'pull', '--quiet', image], capture_output=True, text=True)
+        except FileNotFoundError:
+            return PullResult(image, False, attempt, time.perf_counter() - start, 'docker not found on PATH')
+        if result.returncode == 0:
+            return PullResult(image, True, attempt, time.perf_counter() - start, '')
+        output = (result.stderr or result.stdout).strip().splitlines()
+        error = output[-1] if output else f'exit code {result.returncode}'
+        if attempt <= retries:
+            time.sleep(backoff * 2 ** (attempt - 1))
+    return PullResult(image, False, retries + 1, time.perf_counter() - start, error)
+
+
+def pull_images(images: List[str], concurrency: int, retries: int, backoff: float,
+                log: Callable[..., None] = print) -> List[PullResult]:
+    """Pull images with bounded concurrency, reporting each as it finishes"""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [pool.submit(pull_image, image, retries, backoff) for image in images]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = 'OK' if result.ok else 'FAILED'
+            retried = f", {result.attempts} attempts" if result.attempts > 1 else ''
+            log(f"  [{status}] {result.image} ({result.seconds:.1f}s{retried}){': ' + result.error if result.error else ''}")
+    return results
+
+
+def port_ready(host: str, port: int) -> bool:
+    """Whether something is serving on host:port.
+
+    Docker's port proxy accepts connections before the container listens
+    and then closes them, so a connection only counts when it stays open
+    (or sends data) for a moment after connecting.
+    """
+    import socket
+    try:
+        with socket.create_connection((host, port), timeout=1) as conn:
+            conn.settimeout(0.2)
+            try:
+                return conn.recv(1) != b''
+            except socket.timeout:
+                return True
+    except OSError:
+        return False
+
+
+def http_ready(host: str, port: int, path: str) -> bool:
+    """Whether GET http://host:port/path answers without a server error"""
+    import http.client
+    conn = http.client.HTTPConnection(host, port, timeout=2)
+    try:
+        conn.request('GET', path)
+        return conn.getresponse().status < 500
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        conn.close()
+
+
+class ServiceResult(NamedTuple):
+    """How starting one service went: `action` is started, restarted, running or failed"""
+    name: str
+    ok: bool
+    action: str
+    seconds: float
+    error: str
+
+
+class Supervisor:
+    """Start, probe and stop catalog services through the docker CLI.
+
+    Docker is run as $DOCKER (default: docker) and probes connect to
+    `host`, so a stub docker binary and local sockets can stand in for
+    the real thing. Idle tracking is kept in `state_file`.
+    """
+
+    def __init__(self, services: Dict[str, ServiceSpec], state_file: Path, host: str = '127.0.0.1',
+                 poll: float = 0.25, log: Callable[..., None] = print):
+        self.services = services
+        self.state_file = state_file
+        self.host = host
+        self.poll = poll
+        self.log = log
+        self.docker_bin = os.environ.get('DOCKER', 'docker')
+
+    def docker(self, *args: str) -> 'subprocess.CompletedProcess':
+        """Run a docker CLI command and capture its output"""
+        import subprocess
+        return subprocess.run([self.docker_bin, *args], capture_output=True, text=True)
+
+    def states(self) -> Dict[str, str]:
+        """State (running, exited, ...) of every container, from one `docker ps -a`"""
+        result = self.docker('ps', '-a', '--format', '{{.Names}}\t{{.State}}')
+        return dict(line.split('\t', 1) for line in result.stdout.splitlines() if '\t' in line)
+
+    def ready(self, spec: ServiceSpec) -> bool:
+        """Run the service's readiness probes once"""
+        if spec.http and spec.port:
+            if not http_ready(self.host, spec.port, spec.http):
+                return False
+        elif spec.port and not port_ready(self.host, spec.port):
+            return False
+        if spec.log:
+            result = self.docker('logs', '--tail', '500', spec.container)
+            return spec.log in result.stdout + result.stderr
+        return True
+
+    def start(self, spec: ServiceSpec, state: Optional[str], timeout: Optional[float] = None) -> ServiceResult:
+        """Start one service (unless it is running) and wait until its probes pass"""
+        import subprocess
+        start = time.perf_counter()
+        if state == 'running':
+            action = 'running'
+        else:
+            action = 'restarted' if state else 'started'
+            if state:
+                result = self.docker('start', spec.container)
+            else:
+                command = shlex.quote(self.docker_bin) + spec.command[len('docker'):]
+                result = subprocess.run(['sh', '-c', command], capture_output=True, text=True)
+            if result.returncode != 0:
+                output = (result.stderr or result.stdout).strip().splitlines()
+                return ServiceResult(spec.name, False, 'failed', time.perf_counter() - start,
+                                     output[-1] if output else f'exit code {result.returncode}')
+        deadline = start + (timeout or spec.timeout)
+        while not self.ready(spec):
+            if time.perf_counter() >= deadline:
+                return ServiceResult(spec.name, False, 'failed', time.perf_counter() - start,
+                                     f'not ready after {timeout or spec.timeout:g}s')
+            time.sleep(self.poll)
+        return ServiceResult(spec.name, True, action, time.perf_counter() - start, '')
+
+    def up(self, names: Iterable[str], timeout: Optional[float] = None) -> List[ServiceResult]:
+        """Start services and their dependencies concurrently, each once its dependencies are ready.
+
+        Results are logged as services become ready; a service whose
+        dependency failed is not started.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        order = service_order({name: spec.depends_on for name, spec in self.services.items()}, names)
+        states = self.states()
+        futures = {}
+
+        def task(name: str) -> ServiceResult:
+            spec = self.services[name]
+            failed = next((d for d in spec.depends_on if not futures[d].result().ok), None)
+            if failed is not None:
+                result = ServiceResult(name, False, 'failed', 0.0, f'dependency {failed} is not ready')
+            else:
+                result = self.start(spec, states.get(spec.container), timeout)
+            status = 'OK' if result.ok else 'FAILED'
+            self.log(f"  [{status}] {name} ({result.action}, {result.seconds:.1f}s){': ' + result.error if result.error else ''}")
+            return result
+
+        with ThreadPoolExecutor(max_workers=max(1, len(order))) as pool:
+            for name in order:
+                futures[name] = pool.submit(task, name)
+        return [futures[name].result() for name in order]
+
+    def down(self, names: Iterable[str]) -> List[str]:
+        """Stop the running containers of the named services with one `docker stop`"""
+        states = self.states()
+        containers = [self.services[name].container for name in dict.fromkeys(names)
+                      if states.get(self.services[name].container) == 'running']
+        if containers:
+            self.docker('stop', *containers)
+        return containers
+
+    def stop_idle(self, idle_seconds: float, now: Optional[float] = None) -> List[str]:
+        """Stop running services whose network I/O has not changed for idle_seconds.
+
+        Each call samples every running service with one `docker stats`
+        and records when its counters last moved in state_file, so this
+        is meant to be called periodically (see `services stop-idle --every`).
+        """
+        now = time.time() if now is None else now
+        states = self.states()
+        running = [spec.container for spec in self.services.values() if states.get(spec.container) == 'running']
+        try:
+            seen = json.loads(self.state_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            seen = {}
+        idle = []
+        if running:
+            result = self.docker('stats', '--no-stream', '--format', '{{.Name}}\t{{.NetIO}}', *running)
+            for line in result.stdout.splitlines():
+                container, _, net_io = line.partition('\t')
+                last = seen.get(container)
+                if last is None or last['net_io'] != net_io:
+                    seen[container] = {'net_io': net_io, 'active': now}
+                elif now - last['active'] >= idle_seconds:
+                    idle.append(container)
+        if idle:
+            self.docker('stop', *idle)
+        seen = {container: entry for container, entry in seen.items() if container in running and container not in idle}
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self.state_file.write_text(json.dumps(seen, indent=2) + '\n', encoding='utf-8')
+        return idle
+
+
+def cmd_pull(args: argparse.Namespace) -> int:
+    """generate.py pull: pre-pull the images of the selected tools"""
+    gen = load_generator(categories=args.category)
+    if gen is None:
+        return 1
+    tools = select_tools(gen, args.category, args.type)
+    images = list(dict.fromkeys(tool.image for tool in tools if tool.image))
+    if not images:
+        print("No images match the given filters")
+        return 0
+
+    print(f"Pulling {len(images)} images for {len(tools)} tools ({args.concurrency} at a time)...")
+    if args.dry_run:
+        for image in images:
+            print(f"  {image}")
+        return 0
+
+    start = time.perf_counter()
+    results = pull_images(images, args.concurrency, args.retries, args.backoff)
+    failed = [r for r in results if not r.ok]
+
+    print(f"\n{'Image':<48} {'Status':<8} {'Attempts':>8} {'Seconds':>8}")
+    for result in sorted(results, key=lambda r: r.seconds, reverse=True):
+        print(f"{result.image:<48} {'OK' if result.ok else 'FAILED':<8} {result.attempts:>8} {result.seconds:>8.1f}")
+    print(f"\n[OK] Pulled {len(results) - len(failed)}/{len(results)} images in {time.perf_counter() - start:.1f}s")
+    if failed:
+        print(f"[ERROR] {len(failed)} image(s) failed: {', '.join(r.image for r in failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_bake(args: argparse.Namespace) -> int:
+    """generate.py bake: write Dockerfiles and a build plan for pre-baked images"""
+    gen = load_generator()
+    if gen is None:
+        return 1
+    specs = gen.bake_specs()
+    if not specs:
+        print("No tools install packages at run time; nothing to bake")
+        return 0
+    files = gen.generate_bake()
+
+    bake_dir = Path(args.output_dir)
+    bake_dir.mkdir(parents=True, exist_ok=True)
+    for name, content in files.items():
+        path = bake_dir / name
+        report_write(path, write_if_changed(path, content))
+    # Drop Dockerfiles for bases no tool uses any more
+    for stale in bake_dir.glob('Dockerfile.*'):
+        if stale.name not in files:
+            stale.unlink()
+            print(f"[OK] Removed: {stale}")
+
+    print(f"\n[OK] {len(specs)} images on {len(files) - 1} base image(s): {', '.join(spec.image for spec in specs)}")
+    print(f"Build them with: sh {bake_dir / 'build.sh'} [tool...]  (or: just bake)")
+    return 0
+
+
+def engine_images(refs: List[str]) -> Dict[str, Tuple[str, List[str]]]:
+    """Digest and layer ids of each locally pulled reference, from the Docker Engine API (see dt_manager.py)"""
+    from dt_manager import DockerClient, image_ref
+    found = {}
+    with DockerClient() as client:
+        local = {tag: image for image in client.images() for tag in image.get('RepoTags') or []}
+        for ref in refs:
+            image = local.get(image_ref(ref))
+            if image is None:
+                continue
+            digest = next((d.split('@', 1)[1] for d in image.get('RepoDigests') or [] if '@' in d), '')
+            layers = client.get(f"/images/{image['Id']}/json").get('RootFS', {}).get('Layers') or []
+            found[ref] = (digest, layers)
+    return found
+
+
+def image_report(plan: ImagePlan, layers: Dict[str, List[str]]) -> str:
+    """Markdown report of an image plan: bases and the tools sharing them, proposals, baked images"""
+    lines = ['# Base image plan', '', '| Repository | Reference | Pinning | Tools |', '|---|---|---|---|']
+    for repo, refs in sorted(plan.bases.items(), key=lambda item: (-sum(map(len, item[1].values())), item[0])):
+        for ref, tools in refs.items():
+            target = f" -> `{plan.rewrites[ref]}`" if ref in plan.rewrites else ''
+            lines.append(f"| {repo} | `{ref}`{target} | {parse_image(ref).pinning} | {', '.join(tools)} |")
+    refs = [ref for refs in plan.bases.values() for ref in refs]
+    after = set(plan.rewrites.get(ref, ref) for ref in refs)
+    lines += ['', f"{len(refs)} reference(s) to {len(plan.bases)} repositories; {len(after)} after the proposals below."]
+    if layers:
+        distinct = {layer for ids in layers.values() for layer in ids}
+        total = sum(map(len, layers.values()))
+        lines.append(f"The {len(layers)} pulled image(s) have {total} layers, {len(distinct)} of them distinct "
+                     f"({total - len(distinct)} shared).")
+    lines += ['', '## Proposals', '']
+    lines += [f"- {proposal}" for proposal in plan.proposals] or ['- None: every image is pinned and shared where it can be']
+    if plan.baked:
+        lines += ['', '## Baked images', '']
+        lines += [f"- `{base}`: {', '.join(images)}" for base, images in plan.baked.items()]
+    return '\n'.join(lines) + '\n'
+
+
+def cmd_images(args: argparse.Namespace) -> int:
+    """generate.py images plan: group tool images by base and propose pins that maximise layer sharing"""
+    gen = load_generator()
+    if gen is None:
+        return 1
+    pins = {}
+    for pin in args.pin or []:
+        repo, _, tag = pin.rpartition('=')
+        if not repo or not tag:
+            print(f"[ERROR] --pin expects REPOSITORY=TAG, not '{pin}'", file=sys.stderr)
+            return 2
+        pins[repo] = tag
+
+    found = {}
+    if args.engine:
+        from dt_manager import DockerError
+        try:
+            found = engine_images(list(gen.image_usage()))
+        except DockerError as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            return 1
+    for repo in pins:
+        if all(parse_image(ref).repo != repo for ref in gen.image_usage()):
+            print(f"[WARN] --pin {repo}: no tool uses that repository", file=sys.stderr)
+    plan = gen.image_plan(pins, {ref: digest for ref, (digest, _) in found.items() if digest})
+    report = image_report(plan, {ref: layers for ref, (_, layers) in found.items()})
+    print(report)
+    if args.report:
+        report_write(Path(args.report), write_if_changed(Path(args.report), report))
+
+    if args.rewrite and plan.rewrites:
+        for path in catalog_files(Path(__file__).parent / 'tools.yaml', gen.data):
+            text = path.read_text(encoding='utf-8')
+            report_write(path, write_if_changed(path, rewrite_images(text, plan.rewrites)))
+        gen = load_generator(no_cache=True)
+        if gen is None or gen.validate():
+            print("[ERROR] The rewritten catalog does not validate", file=sys.stderr)
+            return 1
+        print(f"[OK] Rewrote {len(plan.rewrites)} image reference(s)")
+    elif plan.rewrites:
+        print(f"Apply the {len(plan.rewrites)} rewrite(s) to tools.yaml by running this again with --rewrite")
+    return 0
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    """generate.py search: rank tools against a query using only the prebuilt search index"""
+    index_file = Path(args.index_file) if args.index_file else Path(__file__).parent / SEARCH_INDEX
+    tools_file = Path(__file__).parent / 'tools.yaml'
+    if not args.index_file and (not index_file.exists() or
+                           (tools_file.exists() and tools_file.stat().st_mtime_ns > index_file.stat().st_mtime_ns)):
+        # Missing or older than tools.yaml: rebuild it once, then later searches skip the YAML
+        gen = load_generator()
+        if gen is None:
+            return 1
+        if not write_if_changed(index_file, gen.generate_search_index()):
+            index_file.touch()
+        print(f"[OK] Rebuilt search index: {index_file}", file=sys.stderr)
+    if not index_file.exists():
+        print(f"[ERROR] {index_file} not found (generate it with: python generate.py --index)", file=sys.stderr)
+        return 1
+
+    index = SearchIndex.load(index_file)
+    start = time.perf_counter()
+    hits = index.search(' '.join(args.query), args.limit)
+    elapsed = time.perf_counter() - start
+    if not hits:
+        print(f"No tools match '{' '.join(args.query)}'")
+        return 1
+    for hit in hits:
+        print(f"  {hit.name:<20} {hit.aliases.replace(',', ' '):<28} {hit.description}")
+    print(f"\n{len(hits)} result(s) in {elapsed * 1000:.2f} ms")
+    return 0
+
+
+def cmd_conflicts(args: argparse.Namespace) -> int:
+    """generate.py conflicts: report host ports, container names and named volumes shared between tools"""
+    gen = load_generator()
+    if gen is None:
+        return 1
+    claims = gen.claims()
+    conflicts = 0
+    for kind, title in (('port', 'Host ports'), ('name', 'Container names'), ('volume', 'Named volumes')):
+        rows = [(key, users) for key, users in claims[kind].items() if args.all or len(users) > 1]
+        if kind == 'port':
+            rows.sort(key=lambda row: (int(row[0].split('/')[0]) if row[0].split('/')[0].isdigit() else 0, row[0]))
+        if not rows:
+            continue
+        print(f"{title}:")
+        for key, users in rows:
+            marker = '!' if len(users) > 1 else ' '
+            print(f"  {marker} {key:<16} {_describe_users(users.items())}")
+            conflicts += len(users) > 1
+        print()
+    if conflicts:
+        print(f"[WARN] {conflicts} conflict(s); tools marked ! cannot run at the same time")
+        return 1
+    print("[OK] No conflicts between tools")
+    return 0
+
+
+def cmd_services(args: argparse.Namespace) -> int:
+    """generate.py services: run daemon/server tools as background services"""
+    try:
+        return _services(args)
+    except FileNotFoundError as e:
+        print(f"[ERROR] {e.filename} not found (set DOCKER to the docker binary to use)", file=sys.stderr)
+        return 1
+
+
+def _services(args: argparse.Namespace) -> int:
+    """The services subcommand proper (see cmd_services)"""
+    gen = load_generator()
+    if gen is None:
+        return 1
+    services = gen.services()
+    groups = gen.service_groups()
+    state_file = Path(os.environ.get('DT_HOME') or Path.home() / '.docker-toolbox') / 'services.json'
+    supervisor = Supervisor(services, state_file)
+
+    # Expand group names; no names means every service (status) or is an error (up/down)
+    names = []
+    for target in getattr(args, 'names', None) or []:
+        if target in groups:
+            names.extend(groups[target])
+        elif target in services:
+            names.append(target)
+        else:
+            print(f"[ERROR] '{target}' is not a service or group (see: generate.py services list)", file=sys.stderr)
+            return 1
+    names = list(dict.fromkeys(names))
+
+    if args.action == 'list':
+        print("Groups:")
+        for group, members in groups.items():
+            print(f"  {group:<20} {' '.join(members)}")
+        print("\nServices:")
+        for spec in services.values():
+            needs = f"  (needs {', '.join(spec.depends_on)})" if spec.depends_on else ''
+            probes = ', '.join(probe for probe, wanted in (
+                (f'port {spec.port}', spec.port and not spec.http), (f'http {spec.http}', spec.http), (f'log "{spec.log}"', spec.log)) if wanted)
+            print(f"  {spec.name:<20} {probes or 'running'}{needs}")
+        return 0
+
+    if args.action == 'status':
+        states = supervisor.states()
+        for name in names or services:
+            spec = services[name]
+            print(f"  {name:<20} {spec.container:<20} {states.get(spec.container, 'not created')}")
+        return 0
+
+    if args.action == 'stop-idle':
+        section = gen.data.get('services') if isinstance(gen.data.get('services'), dict) else {}
+        minutes = args.idle if args.idle is not None else section.get('idle_minutes', 60)
+        try:
+            while True:
+                for container in supervisor.stop_idle(minutes * 60):
+                    print(f"[OK] Stopped {container} (idle for {minutes:g} min)")
+                if not args.every:
+                    return 0
+                time.sleep(args.every)
+        except KeyboardInterrupt:
+            return 0
+
+    try:
+        order = service_order({name: spec.depends_on for name, spec in services.items()}, names)
+    except ValueError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+
+    if args.action == 'down':
+        stopped = supervisor.down(reversed(order) if args.with_dependencies else names)
+        print(f"[OK] Stopped {len(stopped)} service(s){': ' + ', '.join(stopped) if stopped else ''}")
+        return 0
+
+    # up: refuse to start services that would fight over a host port or container name
+    claimed = {}
+    for name in order:
+        spec = run_spec(services[name].command)
+        for claim in [f"host port {port.host_port}/{port.protocol}" for port in spec.ports if port.host_port] + \
+                     [f"container name {services[name].container}"]:
+            if claimed.setdefault(claim, name) != name:
+                print(f"[ERROR] {claimed[claim]} and {name} both use {claim}; start them separately", file=sys.stderr)
+                return 1
+
+    print(f"Starting {len(order)} service(s): {', '.join(order)}")
+    start = time.perf_counter()
+    results = supervisor.up(order, args.timeout)
+    failed = [r for r in results if not r.ok]
+
+    print(f"\n{'Service':<20} {'Status':<10} {'Ready in':>9}")
+    for result in results:
+        print(f"{result.name:<20} {result.action:<10} {result.seconds:>8.1f}s")
+    print(f"\n[OK] {len(results) - len(failed)}/{len(results)} service(s) ready in {time.perf_counter() - start:.1f}s")
+    if failed:
+        print(f"[ERROR] {len(failed)} service(s) failed: {', '.join(r.name for r in failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate Docker Toolbox documentation and installers')
     parser.add_argument('--validate', action='store_true', help='Validate tools.yaml')
@@ -534,106 +4034,402 @@ def main():
     parser.add_argument('--powershell', action='store_true', help='Generate PowerShell installer')
     parser.add_argument('--bash', action='store_true', help='Generate Bash installer')
     parser.add_argument('--typst', action='store_true', help='Generate Typst documentation')
+    parser.add_argument('--index', action='store_true', help='Generate the machine-readable tool index (TSV and JSON)')
+    parser.add_argument('--warm', action='store_true', help='Generate dt-warm, which runs ephemeral tools in a pool of warm containers')
     parser.add_argument('--all', action='store_true', help='Generate all files (except Typst)')
+    parser.add_argument('--strict', action='store_true', help='Fail --validate on host port, container name and named volume conflicts between tools')
+    parser.add_argument('--conflicts', action='store_true',
+                        help='Warn about host port, container name and named volume conflicts between tools (--validate)')
+    parser.add_argument('--typst-timeout', type=float, default=30, metavar='SECONDS', help='Give up on the Typst PDF compile after this long (default: 30)')
+    parser.add_argument('--dispatcher', action='store_true',
+                        help='Generate installers that install a single `dt` command and lookup table instead of one alias per tool')
+    parser.add_argument('--category', dest='categories', action='append', metavar='ID',
+                        help='Only load, validate and generate tools in this category (repeatable)')
     parser.add_argument('--output-dir', default='.', help='Output directory')
+    parser.add_argument('--output', '-o', metavar='PATH', help="Write the single selected output to PATH ('-' for stdout)")
+    parser.add_argument('--no-cache', action='store_true', help=f'Disable the incremental fragment cache ({CACHE_DIR}/)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N', help='Render outputs in parallel on N worker processes')
+    parser.add_argument('--watch', action='store_true', help='Stay running and rebuild the selected outputs when tools.yaml changes')
+    parser.add_argument('--debounce', type=int, default=300, metavar='MS', help='Quiet period before a --watch rebuild (default: 300)')
+    parser.add_argument('--profile', action='store_true', help='Report per-phase wall/CPU time, memory peak and slowest tools')
+    parser.add_argument('--profile-json', metavar='PATH', help='Also write the profile as JSON (implies --profile)')
+    parser.add_argument('--profile-cprofile', metavar='PATH', help='Also dump cProfile stats for the whole run (implies --profile)')
+
+    subcommands = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+    pull = subcommands.add_parser('pull', help='Pre-pull tool images concurrently')
+    pull.add_argument('--category', action='append', metavar='ID', help='Only tools in this category (repeatable)')
+    pull.add_argument('--type', action='append', choices=['ephemeral', 'daemon', 'server'], help='Only tools of this type (repeatable)')
+    pull.add_argument('--concurrency', '-c', type=int, default=4, metavar='N', help='Images to pull at once (default: 4)')
+    pull.add_argument('--retries', type=int, default=2, metavar='N', help='Retries per failed image (default: 2)')
+    pull.add_argument('--backoff', type=float, default=2.0, metavar='SECONDS', help='Initial retry delay, doubled per retry (default: 2)')
+    pull.add_argument('--dry-run', action='store_true', help='List the images without pulling')
+
+    bake = subcommands.add_parser('bake', help='Write Dockerfiles for tools that install packages on every run')
+    bake.add_argument('--output-dir', default='bake', help='Directory for the Dockerfiles and build.sh (default: bake)')
+
+    search = subcommands.add_parser('search', help='Search tools by name, alias, description, notes and examples')
+    search.add_argument('query', nargs='+', help='Words to search for (typos are tolerated)')
+    search.add_argument('--limit', '-n', type=int, default=10, metavar='N', help='Show at most N results (default: 10)')
+    search.add_argument('--index-file', metavar='PATH', help=f'Search index to read (default: {SEARCH_INDEX}, rebuilt when stale)')
+
+    services = subcommands.add_parser('services', help='Run daemon/server tools as background services with readiness checks')
+    actions = services.add_subparsers(dest='action', metavar='ACTION', required=True)
+    up = actions.add_parser('up', help='Start services or groups (and their dependencies) concurrently, waiting until each is ready')
+    up.add_argument('names', nargs='+', metavar='NAME', help='Service (tool) or group names')
+    up.add_argument('--timeout', type=float, metavar='SECONDS', help="Readiness timeout per service (default: the tool's ready.timeout, or 60)")
+    down = actions.add_parser('down', help='Stop services or groups')
+    down.add_argument('names', nargs='+', metavar='NAME', help='Service (tool) or group names')
+    down.add_argument('--with-dependencies', action='store_true', help='Also stop the services they depend on')
+    status = actions.add_parser('status', help='Show the container state of services')
+    status.add_argument('names', nargs='*', metavar='NAME', help='Service (tool) or group names (default: all)')
+    actions.add_parser('list', help='List groups and services with their readiness probes and dependencies')
+    stop_idle = actions.add_parser('stop-idle', help='Stop services whose network traffic has not changed for a while')
+    stop_idle.add_argument('--idle', type=float, metavar='MINUTES', help='Idle threshold (default: services.idle_minutes, or 60)')
+    stop_idle.add_argument('--every', type=float, metavar='SECONDS', help='Keep running, checking this often')
+
+    conflicts = subcommands.add_parser('conflicts', help='Report host ports, container names and named volumes used by more than one tool')
+    conflicts.add_argument('--all', action='store_true', help='List every port, name and volume in use, not just conflicts')
+
+    images = subcommands.add_parser('images', help='Plan base image consolidation so tools share more layers')
+    image_actions = images.add_subparsers(dest='action', metavar='ACTION', required=True)
+    plan = image_actions.add_parser('plan', help='Group tools by base image, flag unpinned tags and propose shared pins')
+    plan.add_argument('--pin', action='append', metavar='REPO=TAG', help='Move every reference to REPO onto this tag (repeatable)')
+    plan.add_argument('--engine', action='store_true', help='Pin unpinned images to the digests pulled locally and count shared layers')
+    plan.add_argument('--rewrite', action='store_true', help='Apply the proposed references to tools.yaml (and included files)')
+    plan.add_argument('--report', metavar='PATH', help='Also write the report as Markdown to PATH')
 
     args = parser.parse_args()
 
+    if args.command == 'images':
+        return cmd_images(args)
+    if args.command == 'services':
+        return cmd_services(args)
+    if args.command == 'conflicts':
+        return cmd_conflicts(args)
+    if args.command == 'search':
+        return cmd_search(args)
+    if args.command == 'pull':
+        return cmd_pull(args)
+    if args.command == 'bake':
+        return cmd_bake(args)
+
+    formats = [fmt for fmt, wanted in [
+        ('markdown', args.markdown or args.all),
+        ('powershell', args.powershell or args.all),
+        ('bash', args.bash or args.all),
+        ('index', args.index or args.all),
+        ('warm', args.warm),
+        ('typst', args.typst),
+    ] if wanted]
+    if args.dispatcher:
+        formats = [f'{fmt}_dispatcher' if fmt in ('bash', 'powershell') else fmt for fmt in formats]
+    if args.output and len(formats) != 1:
+        parser.error('--output requires exactly one of --markdown, --powershell, --bash, --index, --warm or --typst')
+
+    # Keep stdout clean for the document when streaming to a pipe
+    log = functools.partial(print, file=sys.stderr) if args.output == '-' else print
+
+    profiler = Profiler(enabled=bool(args.profile or args.profile_json or args.profile_cprofile))
+    cprofile = None
+    if args.profile_cprofile:
+        import cProfile
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+    try:
+        return run(args, formats, log, profiler)
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(args.profile_cprofile)
+        if profiler.enabled:
+            profiler.report(log)
+            if args.profile_json:
+                Path(args.profile_json).write_text(json.dumps(profiler.to_json(), indent=2) + '\n', encoding='utf-8')
+                log(f"[OK] Profile written to {args.profile_json}")
+            if cprofile is not None:
+                log(f"[OK] cProfile stats written to {args.profile_cprofile} (view with: python -m pstats {args.profile_cprofile})")
+
+
+def run(args: argparse.Namespace, formats: List[str], log: Callable[..., None], profiler: Profiler) -> int:
+    """Load, validate and generate the outputs selected on the command line"""
     # Find tools.yaml
     tools_file = Path(__file__).parent / 'tools.yaml'
     if not tools_file.exists():
         print(f"Error: {tools_file} not found", file=sys.stderr)
         return 1
 
-    # Load generator
-    gen = ToolboxGenerator(str(tools_file))
+    # Load generator (the fragment cache is only needed when generating)
+    cache_dir = None if args.no_cache else tools_file.parent / CACHE_DIR
+    with profiler.phase('load catalog'):
+        cache = FragmentCache(cache_dir) if cache_dir and formats else None
+        try:
+            data, lines = load_categories(tools_file, cache_dir, args.categories)
+        except (OSError, ValueError) as e:
+            print(f"Error: could not load the catalog: {e}", file=sys.stderr)
+            return 1
+        gen = ToolboxGenerator(str(tools_file), cache=cache, data=data, lines=lines)
+    if profiler.enabled:
+        gen.profiler = profiler
 
     # Validate
     if args.validate or args.all:
-        errors = gen.validate()
+        with profiler.phase('validate'):
+            errors = gen.validate(strict=args.strict)
+            # Indexing conflicts parses every command, so plain --validate leaves it out
+            conflicts = gen.conflicts() if args.conflicts and not args.strict else []
         if errors:
-            print("Validation errors:")
+            log("Validation errors:")
             for error in errors:
-                print(f"  - {error}")
-            if not args.all:
+                log(f"  - {error}")
+            if not args.all and not args.watch:
                 return 1
         else:
-            print("[OK] Validation passed!")
+            log("[OK] Validation passed!")
+        for conflict in conflicts:
+            log(f"[WARN] {conflict.message}")
+
+    build(gen, formats, args, log, profiler)
 
+    if args.watch:
+        return watch(gen, tools_file, cache_dir, formats, args, log)
+    return 0
+
+
+def build(gen: ToolboxGenerator, formats: List[str], args: argparse.Namespace,
+          log: Callable[..., None], profiler: Profiler):
+    """Generate the given output formats and save the fragment cache"""
     output_dir = Path(args.output_dir)
     output_dir.mkdir(exist_ok=True)
 
+    # Typst is written as chapter files unless it is the single --output
+    split_typst = 'typst' in formats and not args.output
+    streamed = [fmt for fmt in formats if not (split_typst and fmt == 'typst')]
+
+    # Render all requested outputs up front on a process pool
+    rendered = {}
+    if args.jobs > 1 and streamed:
+        log(f"Rendering {len(streamed)} outputs on {args.jobs} workers...")
+        with profiler.phase(f'render ({args.jobs} jobs)'):
+            rendered = render_parallel(gen, streamed, args.jobs)
+
+    # Otherwise write every output file in a single traversal of the catalog
+    fused = {}
+    if not rendered and not args.output and len(streamed) > 1:
+        writers = {fmt: StreamWriter(output_dir / OUTPUT_FILES[fmt]) for fmt in streamed}
+        try:
+            with profiler.phase(f'render + write ({len(streamed)} outputs, one pass)'):
+                gen.emit({fmt: writer.write for fmt, writer in writers.items()})
+        except BaseException:
+            for writer in writers.values():
+                writer.discard()
+            raise
+        fused = {fmt: writer.close() for fmt, writer in writers.items()}
+
+    def emit(fmt: str, default_path: Path) -> Optional[Path]:
+        """Stream one output to its file (or stdout); returns the file path"""
+        if fmt in fused:
+            report_write(default_path, fused[fmt], log)
+            return default_path
+        chunks = [rendered[fmt]] if fmt in rendered else profiler.timed(f'render {fmt}', gen.stream(fmt))
+        if args.output == '-':
+            with profiler.phase('write stdout', exclude=f'render {fmt}'):
+                write_stdout(chunks)
+            return None
+        path = Path(args.output) if args.output else default_path
+        with profiler.phase(f'write {path.name}', exclude=f'render {fmt}'):
+            written = write_stream(path, chunks)
+        report_write(path, written, log)
+        return path
+
+    # Generate Typst first (only if explicitly requested), so the PDF
+    # compiles in the background while the other outputs are written
+    pdf_job = None
+    if split_typst:
+        log("Generating Typst documentation...")
+        docgen_dir = Path('docgen')
+        with profiler.phase('write typst chapters'):
+            changed = write_typst(gen, docgen_dir, log)
+        pdf_file = Path('docker-toolbox.pdf')
+        if changed or pdf_is_stale(docgen_dir, pdf_file):
+            pdf_job = start_pdf_compile(docgen_dir / 'docker-toolbox.typ', pdf_file, log)
+        else:
+            log(f"[OK] Unchanged: {pdf_file} (no chapter changed, compile skipped)")
+
     # Generate markdown
-    if args.markdown or args.all:
-        print("Generating markdown documentation...")
-        markdown = gen.generate_markdown()
-        output_file = output_dir / 'docker-dev-tools.md'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(markdown)
-        print(f"[OK] Generated: {output_file}")
+    if 'markdown' in formats:
+        log("Generating markdown documentation...")
+        emit('markdown', output_dir / OUTPUT_FILES['markdown'])
 
     # Generate PowerShell
-    if args.powershell or args.all:
-        print("Generating PowerShell installer...")
-        powershell = gen.generate_powershell_installer()
-        output_file = output_dir / 'install-interactive.ps1'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(powershell)
-        print(f"[OK] Generated: {output_file}")
+    if 'powershell' in formats:
+        log("Generating PowerShell installer...")
+        emit('powershell', output_dir / OUTPUT_FILES['powershell'])
 
     # Generate Bash
-    if args.bash or args.all:
-        print("Generating Bash installer...")
-        bash = gen.generate_bash_installer()
-        output_file = output_dir / 'install.sh'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(bash)
-        print(f"[OK] Generated: {output_file}")
-
-    # Generate Typst (only if explicitly requested)
-    if args.typst:
-        print("Generating Typst documentation...")
-        typst = gen.generate_typst()
-
-        # Create docgen directory for source files
-        docgen_dir = Path('docgen')
-        docgen_dir.mkdir(exist_ok=True)
+    if 'bash' in formats:
+        log("Generating Bash installer...")
+        emit('bash', output_dir / OUTPUT_FILES['bash'])
+
+    # Generate dispatcher-mode installers
+    if 'powershell_dispatcher' in formats:
+        log("Generating PowerShell dispatcher installer...")
+        emit('powershell_dispatcher', output_dir / OUTPUT_FILES['powershell_dispatcher'])
+
+    if 'bash_dispatcher' in formats:
+        log("Generating Bash dispatcher installer...")
+        emit('bash_dispatcher', output_dir / OUTPUT_FILES['bash_dispatcher'])
+
+    # Generate the tool index (TSV, plus the same records as JSON and the search index)
+    if 'index' in formats:
+        log("Generating tool index...")
+        tsv_file = emit('index', output_dir / OUTPUT_FILES['index'])
+        if tsv_file is not None:
+            json_file = tsv_file.with_suffix('.json')
+            with profiler.phase(f'write {json_file.name}'):
+                written = write_if_changed(json_file, gen.generate_index_json())
+            report_write(json_file, written, log)
+            search_file = output_dir / SEARCH_INDEX
+            with profiler.phase(f'write {search_file.name}'):
+                written = write_if_changed(search_file, gen.generate_search_index())
+            report_write(search_file, written, log)
 
-        # Save .typ source to docgen/
-        typ_file = docgen_dir / 'docker-toolbox.typ'
-        with open(typ_file, 'w', encoding='utf-8') as f:
-            f.write(typst)
-        print(f"[OK] Generated: {typ_file}")
+    # Generate the warm container pool script (only if explicitly requested)
+    if 'warm' in formats:
+        log("Generating warm container pool...")
+        warm_file = emit('warm', output_dir / OUTPUT_FILES['warm'])
+        if warm_file is not None:
+            warm_file.chmod(0o755)
+
+    # Generate Typst as a single document to --output
+    if 'typst' in formats and not split_typst:
+        log("Generating Typst documentation...")
+        typ_file = emit('typst', Path('docgen') / 'docker-toolbox.typ')
 
         # PDF goes to root directory
-        pdf_file = Path('docker-toolbox.pdf')
+        if typ_file is not None:
+            with profiler.phase('typst compile'):
+                compile_pdf(typ_file, Path('docker-toolbox.pdf'), log, args.typst_timeout)
+
+    if pdf_job is not None:
+        with profiler.phase('typst compile (wait)'):
+            finish_pdf_compile(pdf_job, args.typst_timeout, log)
+
+    if gen.cache is not None:
+        with profiler.phase('save cache'):
+            gen.cache.save()
+
+    log("\n[OK] Generation complete!")
+
+
+def changed_formats(old: Dict[str, Any], new: Dict[str, Any], formats: List[str]) -> Tuple[List[str], int]:
+    """Work out which outputs a catalog edit affects.
+
+    Returns (affected formats, number of changed tools). Edits to fields a
+    format never reads leave it out; structural edits (tools added,
+    removed or reordered, categories or top-level settings changed) and
+    edits to fields not listed in FORMAT_FIELDS affect every format.
+    """
+    old_tools, new_tools = old.get('tools') or [], new.get('tools') or []
+    old_rest = {k: v for k, v in old.items() if k != 'tools'}
+    new_rest = {k: v for k, v in new.items() if k != 'tools'}
+    if old_rest != new_rest or len(old_tools) != len(new_tools):
+        return list(formats), abs(len(new_tools) - len(old_tools))
+
+    fields = set()
+    changed = 0
+    for before, after in zip(old_tools, new_tools):
+        if before == after:
+            continue
+        changed += 1
+        if not isinstance(before, dict) or not isinstance(after, dict) or before.get('name') != after.get('name'):
+            return list(formats), changed
+        fields.update(key for key in before.keys() | after.keys() if before.get(key) != after.get(key))
+
+    if fields - set().union(*FORMAT_FIELDS.values()):
+        return list(formats), changed
+    return [fmt for fmt in formats if fields & FORMAT_FIELDS[fmt]], changed
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    """Cheap change detector for a watched file: (size, mtime_ns)"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None  # mid atomic save
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _catalog_key(tools_file: Path, data: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """_stat_key of the catalog root and every file it includes (None while any is missing)"""
+    keys = tuple((path, _stat_key(path)) for path in catalog_files(tools_file, data))
+    return None if any(key is None for _, key in keys) else keys
+
+
+def watch(gen: ToolboxGenerator, tools_file: Path, cache_dir: Optional[Path], formats: List[str],
+          args: argparse.Namespace, log: Callable[..., None]) -> int:
+    """Keep the catalog resident and rebuild affected outputs when tools.yaml changes.
+
+    The file and any it includes are polled with stat() (no extra
+    dependencies), re-expanding include globs so new files are noticed;
+    a burst of saves is debounced until the files have been quiet for
+    --debounce ms. Each
+    rebuild re-renders only the formats the edit affects, and the fragment
+    cache limits that to the changed tools.
+    """
+    poll = min(0.1, args.debounce / 1000)
+    log(f"\nWatching {tools_file.name} for changes (Ctrl+C to stop)...")
+    last = _catalog_key(tools_file, gen.data)
+    try:
+        while True:
+            time.sleep(poll)
+            current = _catalog_key(tools_file, gen.data)
+            if current == last:
+                continue
+
+            # Debounce: wait until the file stops changing
+            detected = quiet_since = time.perf_counter()
+            while True:
+                time.sleep(poll)
+                latest = _catalog_key(tools_file, gen.data)
+                now = time.perf_counter()
+                if latest != current:
+                    current, quiet_since = latest, now
+                elif current is not None and now - quiet_since >= args.debounce / 1000:
+                    break
+            last = current
+
+            start = time.perf_counter()
+            run_spec.cache_clear()
+            try:
+                data, lines = load_categories(tools_file, cache_dir, args.categories)
+            except Exception as e:
+                log(f"[ERROR] Could not load {tools_file.name}: {e}")
+                continue
+            new_gen = ToolboxGenerator(str(tools_file), cache=gen.cache, data=data, lines=lines)
+            errors = new_gen.validate(strict=args.strict)
+            if errors:
+                log("Validation errors (outputs not rebuilt):")
+                for error in errors:
+                    log(f"  - {error}")
+                continue
+            # Same conflict warnings as the first run (--strict already made them errors)
+            if args.conflicts and not args.strict:
+                for conflict in new_gen.conflicts():
+                    log(f"[WARN] {conflict.message}")
+
+            affected, changed = changed_formats(gen.data, data, formats)
+            gen = new_gen
+            if affected:
+                build(gen, affected, args, log, Profiler())
+            elapsed = (time.perf_counter() - start) * 1000
+            since_save = (time.perf_counter() - detected) * 1000
+            rebuilt = ', '.join(affected) if affected else 'nothing to rebuild'
+            log(f"[OK] {changed} tool(s) changed; {rebuilt} in {elapsed:.1f} ms ({since_save:.0f} ms after the first save)")
+    except KeyboardInterrupt:
+        log("\nStopped watching.")
+        return 0
 
-        # Try to compile to PDF if Typst is available
-        try:
-            import subprocess
-            print("Compiling Typst to PDF...")
-            result = subprocess.run(
-                ['typst', 'compile', str(typ_file), str(pdf_file)],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode == 0:
-                print(f"[OK] Generated: {pdf_file}")
-                print("    To view: open docker-toolbox.pdf")
-            else:
-                print(f"[INFO] Typst source created at {typ_file}")
-                print("       Run 'typst compile docgen/docker-toolbox.typ docker-toolbox.pdf' to generate PDF")
-        except FileNotFoundError:
-            print(f"[INFO] Typst source created at {typ_file}")
-            print("       Install Typst to compile to PDF: https://github.com/typst/typst")
-            print("       Or use Docker: docker run --rm -v ${PWD}:/work ghcr.io/typst/typst compile /work/docgen/docker-toolbox.typ /work/docker-toolbox.pdf")
-        except Exception as e:
-            print(f"[INFO] Typst source created at {typ_file}")
-            print(f"       Could not compile to PDF: {e}")
-
-    print("\n[OK] Generation complete!")
-    return 0
 
 if __name__ == '__main__':
     sys.exit(main())
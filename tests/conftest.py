@@ -0,0 +1,60 @@
+"""Shared fixtures: the repository on sys.path and a stub docker binary"""
+
+import os
+import stat
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+STUB = """#!/bin/sh
+# Stub docker: logs its arguments, prints <subcommand>.out if there is one
+# and fails when the arguments match $DOCKER_STUB_FAIL
+echo "$*" >> "$DOCKER_STUB_LOG"
+out="$(dirname "$0")/$1.out"
+[ -f "$out" ] && cat "$out"
+case "$*" in
+    $DOCKER_STUB_FAIL) echo "stub: cannot $1" >&2; exit 1 ;;
+esac
+exit 0
+"""
+
+
+class DockerStub:
+    """A docker script on PATH (and in $DOCKER / $DT_DOCKER) that records every call"""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.path = directory / 'docker'
+        self.log = directory / 'calls.log'
+        self.path.write_text(STUB)
+        self.path.chmod(self.path.stat().st_mode | stat.S_IXUSR)
+
+    def calls(self) -> List[str]:
+        """Every call so far, as its space-joined arguments"""
+        return self.log.read_text().splitlines() if self.log.exists() else []
+
+    def output(self, subcommand: str, text: str):
+        """Print `text` whenever the stub runs `subcommand`"""
+        (self.directory / f'{subcommand}.out').write_text(text)
+
+    def fail(self, pattern: str):
+        """Fail calls whose arguments match the shell pattern"""
+        os.environ['DOCKER_STUB_FAIL'] = pattern
+
+
+@pytest.fixture
+def docker(tmp_path, monkeypatch) -> DockerStub:
+    directory = tmp_path / 'bin'
+    directory.mkdir()
+    stub = DockerStub(directory)
+    monkeypatch.setenv('PATH', f"{directory}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv('DOCKER', str(stub.path))
+    monkeypatch.setenv('DT_DOCKER', str(stub.path))
+    monkeypatch.setenv('DOCKER_STUB_LOG', str(stub.log))
+    monkeypatch.setenv('DOCKER_STUB_FAIL', '__never__')
+    return stub
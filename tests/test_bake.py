@@ -0,0 +1,61 @@
+"""generate.py bake and the build.sh it writes, against a stub docker"""
+
+import subprocess
+import sys
+
+import generate
+from conftest import ROOT
+
+
+def bake(output_dir) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, str(ROOT / 'generate.py'), 'bake', '--output-dir', str(output_dir)],
+                          capture_output=True, text=True)
+
+
+def test_bake_writes_a_dockerfile_per_base(tmp_path):
+    specs = generate.load_generator().bake_specs()
+    result = bake(tmp_path)
+
+    assert result.returncode == 0, result.stderr
+    dockerfiles = sorted(path.name for path in tmp_path.glob('Dockerfile.*'))
+    assert len(dockerfiles) == len({spec.base for spec in specs})
+    text = ''.join((tmp_path / name).read_text() for name in dockerfiles)
+    for spec in specs:
+        assert f"FROM {spec.base} AS {spec.image}\n" in text
+
+
+def test_bake_removes_stale_dockerfiles(tmp_path):
+    (tmp_path / 'Dockerfile.gone').write_text('FROM scratch\n')
+    bake(tmp_path)
+
+    assert not (tmp_path / 'Dockerfile.gone').exists()
+
+
+def test_build_script_builds_every_image(tmp_path, docker):
+    specs = generate.load_generator().bake_specs()
+    bake(tmp_path)
+    result = subprocess.run(['sh', str(tmp_path / 'build.sh')], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    calls = docker.calls()
+    assert all(call.startswith('build -q -f Dockerfile.') for call in calls)
+    assert sorted(call.split()[-2] for call in calls) == sorted(spec.image for spec in specs)
+
+
+def test_build_script_builds_the_named_tools(tmp_path, docker):
+    spec = generate.load_generator().bake_specs()[-1]
+    bake(tmp_path)
+    result = subprocess.run(['sh', str(tmp_path / 'build.sh'), spec.tool], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert [call.split()[-2] for call in docker.calls()] == [spec.image]
+
+
+def test_build_script_stops_at_the_first_failure(tmp_path, docker):
+    first = generate.load_generator().bake_specs()[0]
+    docker.fail(f"build * -t {first.image} .")
+    bake(tmp_path)
+    result = subprocess.run(['sh', str(tmp_path / 'build.sh')], capture_output=True, text=True)
+
+    assert result.returncode != 0
+    assert len(docker.calls()) == 1
@@ -0,0 +1,148 @@
+"""DockerClient and the dt_manager commands, against a fake Engine API on a unix socket"""
+
+import argparse
+import json
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+import generate
+from dt_manager import DockerClient, DockerError, cmd_images, cmd_status, image_ref
+
+
+class FakeEngine(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Answers each path from `routes` ({path: (status, body)}), keeping connections alive"""
+    daemon_threads = True
+
+    def __init__(self, path: str):
+        self.routes = {}
+        self.requests = []
+        self.connections = 0
+        super().__init__(path, Handler)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def address_string(self) -> str:
+        return 'unix'
+
+    def log_message(self, *args):
+        pass
+
+    def answer(self):
+        self.server.requests.append(f"{self.command} {self.path}")
+        status, body = self.server.routes.get(self.path.split('?')[0], (404, {'message': 'page not found'}))
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = answer
+
+
+@pytest.fixture
+def engine(tmp_path):
+    server = FakeEngine(str(tmp_path / 'docker.sock'))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(engine):
+    with DockerClient(engine.server_address, timeout=5) as client:
+        yield client
+
+
+def test_image_ref():
+    assert image_ref('alpine') == 'alpine:latest'
+    assert image_ref('localhost:5000/tool') == 'localhost:5000/tool:latest'
+    assert image_ref('python:3.12') == 'python:3.12'
+    assert image_ref('alpine@sha256:abc') == 'alpine@sha256:abc'
+
+
+def test_requests_share_one_connection(engine, client):
+    engine.routes['/images/json'] = (200, [{'Id': 'sha256:1', 'RepoTags': ['alpine:latest']}])
+    engine.routes['/info'] = (200, {'ServerVersion': '27.0.1'})
+    engine.routes['/containers/json'] = (200, [])
+
+    assert client.images() == [{'Id': 'sha256:1', 'RepoTags': ['alpine:latest']}]
+    assert client.info() == {'ServerVersion': '27.0.1'}
+    assert client.containers() == []
+    assert engine.requests == ['GET /images/json', 'GET /info', 'GET /containers/json?all=1']
+    assert engine.connections == 1
+    assert client.requests == 3
+
+
+def test_error_status_raises_the_daemon_message(engine, client):
+    engine.routes['/info'] = (500, {'message': 'daemon is shutting down'})
+
+    with pytest.raises(DockerError, match='^daemon is shutting down$'):
+        client.info()
+
+
+def test_invalid_json_names_the_socket(engine, client):
+    engine.routes['/info'] = (502, b'<html>Bad Gateway</html>')
+
+    with pytest.raises(DockerError, match=f"Docker at {engine.server_address} sent an invalid response to /info"):
+        client.info()
+
+
+def test_missing_socket_names_the_socket(tmp_path):
+    path = str(tmp_path / 'missing.sock')
+
+    with pytest.raises(DockerError, match=f"Cannot reach Docker at {path}"):
+        DockerClient(path).info()
+
+
+def test_pull_reports_the_last_status_or_error(engine, client):
+    progress = [{'status': 'Pulling from library/alpine'}, {'status': 'Status: Image is up to date for alpine:latest'}]
+    engine.routes['/images/create'] = (200, b'\n'.join(json.dumps(line).encode() for line in progress))
+
+    assert client.pull('alpine') == 'Status: Image is up to date for alpine:latest'
+    assert engine.requests == ['POST /images/create?fromImage=alpine&tag=latest']
+
+    engine.routes['/images/create'] = (200, json.dumps({'error': 'manifest unknown'}).encode())
+    with pytest.raises(DockerError, match='^manifest unknown$'):
+        client.pull('alpine:nope')
+
+
+def test_images_command_marks_pulled_catalog_images(engine, client, capsys):
+    gen = generate.load_generator()
+    tool = gen.catalog[0]
+    engine.routes['/images/json'] = (200, [{'Id': 'sha256:1', 'RepoTags': [image_ref(tool.image)], 'Size': 5_000_000}])
+
+    assert cmd_images(client, gen, argparse.Namespace(pulled=True)) == 0
+    output = capsys.readouterr().out
+    assert f"{image_ref(tool.image):<48} {'Pulled':<11} {'5.0MB':>8}  {tool.name}" in output
+    assert '1 image(s) pulled, 5.0MB on disk' in output
+    assert 'Not pulled' not in output
+
+
+def test_status_command_lists_running_tool_containers(engine, client, capsys):
+    gen = generate.load_generator()
+    tool = gen.catalog[0]
+    engine.routes['/containers/json'] = (200, [
+        {'Names': ['/dt-run'], 'Image': tool.image, 'State': 'running', 'Status': 'Up 2 minutes'},
+        {'Names': ['/dt-old'], 'Image': tool.image, 'State': 'exited', 'Status': 'Exited (0)'},
+        {'Names': ['/other'], 'Image': 'not-in-the-catalog', 'State': 'running', 'Status': 'Up 1 hour'},
+    ])
+
+    assert cmd_status(client, gen, argparse.Namespace(all=False)) == 0
+    output = capsys.readouterr().out
+    assert 'dt-run' in output and tool.name in output
+    assert 'dt-old' not in output and 'other' not in output
+
+    assert cmd_status(client, gen, argparse.Namespace(all=True)) == 0
+    assert 'dt-old' in capsys.readouterr().out
@@ -0,0 +1,62 @@
+"""generate.py pull against a stub docker"""
+
+import subprocess
+import sys
+
+import generate
+from conftest import ROOT
+
+
+def test_pull_images_pulls_each_image_once(docker):
+    logged = []
+    results = generate.pull_images(['alpine:3.19', 'busybox'], 2, 0, 0, log=logged.append)
+
+    assert sorted(r.image for r in results) == ['alpine:3.19', 'busybox']
+    assert all(r.ok and r.attempts == 1 for r in results)
+    assert sorted(docker.calls()) == ['pull --quiet alpine:3.19', 'pull --quiet busybox']
+    assert len(logged) == 2 and all(line.startswith('  [OK] ') for line in logged)
+
+
+def test_pull_image_retries_then_reports_the_error(docker):
+    docker.fail('pull --quiet broken*')
+    result = generate.pull_image('broken:1', retries=2, backoff=0)
+
+    assert not result.ok
+    assert result.attempts == 3
+    assert result.error == 'stub: cannot pull'
+    assert docker.calls() == ['pull --quiet broken:1'] * 3
+
+
+def test_pull_image_without_docker(tmp_path, monkeypatch):
+    monkeypatch.setenv('PATH', str(tmp_path))
+    result = generate.pull_image('alpine', retries=2, backoff=0)
+
+    assert not result.ok
+    assert result.attempts == 1
+    assert result.error == 'docker not found on PATH'
+
+
+def test_pull_command_pulls_the_selected_category(docker):
+    gen = generate.load_generator()
+    category = gen.catalog[0].category
+    images = {tool.image for tool in gen.catalog if tool.category == category and tool.image}
+
+    result = subprocess.run([sys.executable, str(ROOT / 'generate.py'), 'pull', '--category', category, '--retries', '0'],
+                            capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert {call.split()[-1] for call in docker.calls()} == images
+    assert len(docker.calls()) == len(images)
+    assert f"[OK] Pulled {len(images)}/{len(images)} images" in result.stdout
+
+
+def test_pull_command_fails_when_an_image_fails(docker):
+    docker.fail('pull *')
+    gen = generate.load_generator()
+    category = gen.catalog[0].category
+
+    result = subprocess.run([sys.executable, str(ROOT / 'generate.py'), 'pull', '--category', category, '--retries', '0'],
+                            capture_output=True, text=True)
+
+    assert result.returncode == 1
+    assert 'failed:' in result.stderr
@@ -0,0 +1,126 @@
+"""Service ordering and the Supervisor, against a stub docker and local sockets"""
+
+import socket
+
+import pytest
+
+import generate
+from generate import ServiceSpec, Supervisor, service_order
+
+
+def spec(name: str, depends_on=(), port=None, log=None, timeout=5.0) -> ServiceSpec:
+    return ServiceSpec(name, f'dt-{name}', f'docker run -d --name dt-{name} alpine', tuple(depends_on),
+                       port, None, log, timeout)
+
+
+@pytest.fixture
+def listener():
+    """A local port that accepts connections and keeps them open"""
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen()
+    yield server.getsockname()[1]
+    server.close()
+
+
+@pytest.fixture
+def closed_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def supervisor(tmp_path, *specs: ServiceSpec) -> Supervisor:
+    return Supervisor({s.name: s for s in specs}, tmp_path / 'idle.json', poll=0.05, log=lambda *a: None)
+
+
+def test_service_order_puts_dependencies_first():
+    depends_on = {'app': ['db', 'cache'], 'cache': ['db'], 'db': [], 'other': []}
+
+    assert service_order(depends_on, ['app']) == ['db', 'cache', 'app']
+    assert service_order(depends_on, ['cache', 'app', 'db']) == ['db', 'cache', 'app']
+    assert service_order(depends_on, ['other', 'db']) == ['other', 'db']
+
+
+def test_service_order_rejects_unknown_services():
+    with pytest.raises(ValueError, match=r"Unknown service 'db' \(a dependency of app\)"):
+        service_order({'app': ['db']}, ['app'])
+    with pytest.raises(ValueError, match=r"Unknown service 'nope'$"):
+        service_order({'app': []}, ['nope'])
+
+
+def test_service_order_reports_the_cycle():
+    depends_on = {'web': ['a'], 'a': ['b'], 'b': ['c'], 'c': ['a']}
+
+    with pytest.raises(ValueError, match=r"Circular service dependency: a -> b -> c -> a$"):
+        service_order(depends_on, ['web'])
+
+
+def test_catalog_services_are_ordered():
+    services = generate.load_generator().services()
+    order = service_order({name: s.depends_on for name, s in services.items()}, services)
+
+    assert sorted(order) == sorted(services)
+    for name in order:
+        assert all(order.index(dependency) < order.index(name) for dependency in services[name].depends_on)
+
+
+def test_up_starts_dependencies_first_and_waits_for_the_port(tmp_path, docker, listener):
+    results = supervisor(tmp_path, spec('db', port=listener), spec('app', ['db'], port=listener)).up(['app'])
+
+    assert [(r.name, r.ok, r.action) for r in results] == [('db', True, 'started'), ('app', True, 'started')]
+    runs = [call for call in docker.calls() if call.startswith('run -d')]
+    assert runs == ['run -d --name dt-db alpine', 'run -d --name dt-app alpine']
+
+
+def test_up_restarts_stopped_and_skips_running_containers(tmp_path, docker):
+    docker.output('ps', 'dt-db\texited\ndt-app\trunning\n')
+    results = supervisor(tmp_path, spec('db'), spec('app', ['db'])).up(['app'])
+
+    assert [r.action for r in results] == ['restarted', 'running']
+    assert docker.calls() == ['ps -a --format {{.Names}}\t{{.State}}', 'start dt-db']
+
+
+def test_up_does_not_start_services_whose_dependency_failed(tmp_path, docker):
+    docker.fail('run -d --name dt-db *')
+    results = supervisor(tmp_path, spec('db'), spec('app', ['db'])).up(['app'])
+
+    assert [(r.name, r.ok) for r in results] == [('db', False), ('app', False)]
+    assert results[0].error == 'stub: cannot run'
+    assert results[1].error == 'dependency db is not ready'
+    assert not any('dt-app' in call for call in docker.calls())
+
+
+def test_up_times_out_when_the_port_stays_closed(tmp_path, docker, closed_port):
+    [result] = supervisor(tmp_path, spec('db', port=closed_port, timeout=0.2)).up(['db'])
+
+    assert not result.ok
+    assert result.error == 'not ready after 0.2s'
+
+
+def test_up_waits_for_the_log_line(tmp_path, docker):
+    docker.output('logs', 'booting\nready to accept connections\n')
+    [result] = supervisor(tmp_path, spec('db', log='ready to accept connections', timeout=1)).up(['db'])
+
+    assert result.ok
+    assert 'logs --tail 500 dt-db' in docker.calls()
+
+
+def test_down_stops_only_running_containers(tmp_path, docker):
+    docker.output('ps', 'dt-db\trunning\ndt-app\texited\n')
+    stopped = supervisor(tmp_path, spec('db'), spec('app', ['db'])).down(['app', 'db'])
+
+    assert stopped == ['dt-db']
+    assert docker.calls()[-1] == 'stop dt-db'
+
+
+def test_stop_idle_stops_services_whose_traffic_did_not_change(tmp_path, docker):
+    docker.output('ps', 'dt-db\trunning\ndt-app\trunning\n')
+    docker.output('stats', 'dt-db\t1kB / 2kB\ndt-app\t5kB / 1kB\n')
+    services = supervisor(tmp_path, spec('db'), spec('app'))
+
+    assert services.stop_idle(60, now=1000) == []
+    docker.output('stats', 'dt-db\t1kB / 2kB\ndt-app\t9kB / 3kB\n')
+    assert services.stop_idle(60, now=1030) == []
+    assert services.stop_idle(60, now=1061) == ['dt-db']
+    assert docker.calls()[-1] == 'stop dt-db'
@@ -0,0 +1,85 @@
+"""The generated dt-warm container pool, against a stub docker"""
+
+import os
+import subprocess
+
+import pytest
+
+import generate
+
+
+@pytest.fixture
+def warm(tmp_path, docker, monkeypatch):
+    """Run the catalog's dt-warm script with its state in tmp_path"""
+    script = tmp_path / 'dt-warm'
+    script.write_text(generate.load_generator().generate_warm())
+    monkeypatch.setenv('DT_WARM_STATE', str(tmp_path / 'state'))
+    docker.output('image', 'lazygit\n\n')
+
+    def run(*args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(['bash', str(script), *args], capture_output=True, text=True, stdin=subprocess.DEVNULL)
+    return run
+
+
+def test_first_call_starts_a_container_and_execs(warm, docker):
+    result = warm('dtlazygit', 'log', '--oneline')
+
+    assert result.returncode == 0, result.stderr
+    calls = docker.calls()
+    run = next(call for call in calls if call.startswith('run -d '))
+    assert '--label dev.docker-toolbox.warm=dtlazygit' in run
+    assert run.endswith('--entrypoint tail lazyteam/lazygit -f /dev/null')
+    assert calls[-1].startswith('exec -i dt-warm-dtlazygit-')
+    assert calls[-1].endswith(' lazygit log --oneline')
+
+
+def test_later_calls_reuse_the_container(warm, docker):
+    warm('dtlazygit')
+    first = len(docker.calls())
+    result = warm('dtlazygit', 'status')
+
+    assert result.returncode == 0, result.stderr
+    later = docker.calls()[first:]
+    assert len(later) == 1
+    assert later[0].endswith(' lazygit status')
+
+
+def test_setup_runs_once_in_the_warm_container(warm, docker):
+    warm('dthtop')
+    warm('dthtop')
+
+    setups = [call for call in docker.calls() if call.endswith(' sh -c apk add -U htop')]
+    assert len(setups) == 1
+
+
+def test_failed_start_falls_back_to_the_original_command(warm, docker):
+    docker.fail('run -d *')
+    result = warm('dtlazygit', 'status')
+
+    assert result.returncode == 0, result.stderr
+    assert docker.calls()[-1] == f"run --rm -it -v {os.getcwd()}:/repo -w /repo lazyteam/lazygit status"
+
+
+def test_baked_fallback_runs_the_baked_image(warm, docker):
+    docker.fail('run -d *')
+    result = warm('dttmux')
+
+    assert result.returncode == 0, result.stderr
+    assert docker.calls()[-2].startswith('image inspect dt-tmux')
+    assert docker.calls()[-1].endswith(' dt-tmux tmux')
+
+
+def test_unknown_alias(warm):
+    result = warm('dtnothing')
+
+    assert result.returncode == 127
+    assert "no warm mode for 'dtnothing'" in result.stderr
+
+
+def test_stop_removes_every_warm_container(warm, docker):
+    warm('dtlazygit')
+    docker.output('ps', 'dt-warm-dtlazygit-1\n')
+    result = warm('--stop')
+
+    assert result.returncode == 0, result.stderr
+    assert docker.calls()[-1] == 'rm -f dt-warm-dtlazygit-1'